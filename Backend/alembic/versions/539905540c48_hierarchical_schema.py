@@ -0,0 +1,212 @@
+"""Hierarchical schema
+
+Revision ID: 539905540c48
+Revises: 1e46836342ad
+Create Date: 2026-10-17 22:17:42.757975
+
+Replaces the pre-hierarchy tables of 1e46836342ad (sectors -> specializations,
+user_quiz_attempts, answer_options, user_answers) with the Sector -> Branch ->
+Specialization schema in app/models_hierarchical.py, as Base.metadata.create_all
+built it before the app moved to migrations. Databases that were built that way
+are stamped at this revision by app.migrate instead of being upgraded, so any
+table or index added to the models since belongs in a later revision.
+
+A fresh database passes through the legacy tables empty and they are dropped.
+If they hold rows (users included), the upgrade stops unless
+ALLOW_LEGACY_SCHEMA_DROP=true is set, after a backup.
+"""
+import importlib.util
+import os
+from pathlib import Path
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '539905540c48'
+down_revision: Union[str, Sequence[str], None] = '1e46836342ad'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _legacy_revision():
+    """The 1e46836342ad module, whose upgrade/downgrade create/drop the legacy tables"""
+    path = Path(__file__).with_name("1e46836342ad_add_all_tables.py")
+    spec = importlib.util.spec_from_file_location("legacy_1e46836342ad", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+LEGACY_TABLES = ('users', 'sectors', 'specializations', 'quizzes', 'questions',
+                 'user_quiz_attempts', 'answer_options', 'user_answers')
+
+
+def _legacy_rows(bind):
+    """Row count of each non-empty legacy table"""
+    counts = {table: bind.execute(sa.text(f'SELECT COUNT(*) FROM {table}')).scalar() for table in LEGACY_TABLES}
+    return {table: count for table, count in counts.items() if count}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if "user_answers" in sa.inspect(bind).get_table_names():
+        legacy_rows = _legacy_rows(bind)
+        if legacy_rows:
+            if os.getenv("ALLOW_LEGACY_SCHEMA_DROP", "false").lower() not in ("1", "true", "yes"):
+                raise RuntimeError(
+                    f"The pre-hierarchy tables of 1e46836342ad still hold data ({legacy_rows}). "
+                    "Upgrading drops them and all their rows. Back the database up, then rerun "
+                    "with ALLOW_LEGACY_SCHEMA_DROP=true to proceed."
+                )
+            print(f"⚠️  ALLOW_LEGACY_SCHEMA_DROP is set - dropping the pre-hierarchy tables {legacy_rows}")
+        _legacy_revision().downgrade()
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('sectors',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sectors_id'), 'sectors', ['id'], unique=False)
+    op.create_index(op.f('ix_sectors_name'), 'sectors', ['name'], unique=True)
+    op.create_table('branches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=150), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('sector_id', sa.Integer(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['sector_id'], ['sectors.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_branches_id'), 'branches', ['id'], unique=False)
+    op.create_index(op.f('ix_branches_name'), 'branches', ['name'], unique=False)
+    op.create_table('specializations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=150), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('branch_id', sa.Integer(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['branch_id'], ['branches.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_specializations_id'), 'specializations', ['id'], unique=False)
+    op.create_index(op.f('ix_specializations_name'), 'specializations', ['name'], unique=False)
+    op.create_table('quizzes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('specialization_id', sa.Integer(), nullable=False),
+    sa.Column('difficulty_level', sa.Integer(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('time_limit_minutes', sa.Integer(), nullable=True),
+    sa.Column('passing_score', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['specialization_id'], ['specializations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_quizzes_id'), 'quizzes', ['id'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(length=100), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('preferred_specialization_id', sa.Integer(), nullable=True),
+    sa.Column('readiness_score', sa.Float(), nullable=True),
+    sa.Column('technical_score', sa.Float(), nullable=True),
+    sa.Column('soft_skills_score', sa.Float(), nullable=True),
+    sa.Column('leadership_score', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_login', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['preferred_specialization_id'], ['specializations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_table('questions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('quiz_id', sa.Integer(), nullable=False),
+    sa.Column('question_text', sa.Text(), nullable=False),
+    sa.Column('question_type', sa.String(length=50), nullable=False),
+    sa.Column('points', sa.Integer(), nullable=True),
+    sa.Column('order_index', sa.Integer(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('explanation', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['quiz_id'], ['quizzes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_questions_id'), 'questions', ['id'], unique=False)
+    op.create_table('quiz_attempts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('quiz_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('max_score', sa.Float(), nullable=False),
+    sa.Column('percentage', sa.Float(), nullable=False),
+    sa.Column('time_taken_minutes', sa.Integer(), nullable=True),
+    sa.Column('is_passed', sa.Boolean(), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.ForeignKeyConstraint(['quiz_id'], ['quizzes.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_quiz_attempts_id'), 'quiz_attempts', ['id'], unique=False)
+    op.create_table('question_options',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('option_text', sa.Text(), nullable=False),
+    sa.Column('is_correct', sa.Boolean(), nullable=True),
+    sa.Column('order_index', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_question_options_id'), 'question_options', ['id'], unique=False)
+    # ### end Alembic commands ###
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_index(op.f('ix_question_options_id'), table_name='question_options')
+    op.drop_table('question_options')
+    op.drop_index(op.f('ix_quiz_attempts_id'), table_name='quiz_attempts')
+    op.drop_table('quiz_attempts')
+    op.drop_index(op.f('ix_questions_id'), table_name='questions')
+    op.drop_table('questions')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_quizzes_id'), table_name='quizzes')
+    op.drop_table('quizzes')
+    op.drop_index(op.f('ix_specializations_name'), table_name='specializations')
+    op.drop_index(op.f('ix_specializations_id'), table_name='specializations')
+    op.drop_table('specializations')
+    op.drop_index(op.f('ix_branches_name'), table_name='branches')
+    op.drop_index(op.f('ix_branches_id'), table_name='branches')
+    op.drop_table('branches')
+    op.drop_index(op.f('ix_sectors_name'), table_name='sectors')
+    op.drop_index(op.f('ix_sectors_id'), table_name='sectors')
+    op.drop_table('sectors')
+    # ### end Alembic commands ###
+
+    _legacy_revision().upgrade()
@@ -0,0 +1,32 @@
+"""User session version
+
+Revision ID: 7b2f4c9e1a30
+Revises: 539905540c48
+Create Date: 2026-10-17 23:05:12.418306
+
+Adds users.session_version, which is embedded in session tokens and bumped to
+revoke them (app/sessions.py).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2f4c9e1a30'
+down_revision: Union[str, Sequence[str], None] = '539905540c48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('session_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('session_version')
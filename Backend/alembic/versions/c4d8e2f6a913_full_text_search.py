@@ -0,0 +1,83 @@
+"""Full-text search
+
+Revision ID: c4d8e2f6a913
+Revises: 7b2f4c9e1a30
+Create Date: 2026-10-18 00:12:40.530118
+
+Search structures for app/search.py. Postgres gets GIN indexes on weighted
+tsvector expressions (kept identical to the expressions in app/search.py).
+SQLite gets external-content FTS5 tables with triggers that mirror every
+insert, update and delete, then a rebuild from the existing rows.
+Neither is part of Base.metadata; alembic/env.py leaves them out of autogenerate.
+On SQLite, a later batch migration that recreates one of these tables drops
+its triggers and must create them again.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8e2f6a913'
+down_revision: Union[str, Sequence[str], None] = '7b2f4c9e1a30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+POSTGRES_INDEXES = {
+    'ix_quizzes_search': ('quizzes', "setweight(to_tsvector('english', title), 'A') || "
+                                     "setweight(to_tsvector('english', coalesce(description, '')), 'B')"),
+    'ix_questions_search': ('questions', "to_tsvector('english', question_text)"),
+    'ix_specializations_search': ('specializations', "setweight(to_tsvector('english', name), 'A') || "
+                                                     "setweight(to_tsvector('english', coalesce(description, '')), 'B')"),
+}
+
+# table -> indexed columns
+SQLITE_FTS_TABLES = {
+    'quizzes': ('title', 'description'),
+    'questions': ('question_text',),
+    'specializations': ('name', 'description'),
+}
+
+
+def _sqlite_fts_statements(table, columns):
+    fts = f'{table}_fts'
+    names = ', '.join(columns)
+    new_values = ', '.join(f'new.{name}' for name in columns)
+    old_values = ', '.join(f'old.{name}' for name in columns)
+    delete_old = (f"INSERT INTO {fts}({fts}, rowid, {names}) "
+                  f"VALUES ('delete', old.id, {old_values});")
+    insert_new = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values});"
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, content='{table}', content_rowid='id', "
+        f"tokenize='porter unicode61')",
+        f"CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN {delete_old} END",
+        f"CREATE TRIGGER {fts}_update AFTER UPDATE OF {names} ON {table} BEGIN {delete_old} {insert_new} END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        for name, (table, expression) in POSTGRES_INDEXES.items():
+            op.execute(f'CREATE INDEX {name} ON {table} USING gin (({expression}))')
+    elif dialect == 'sqlite':
+        for table, columns in SQLITE_FTS_TABLES.items():
+            for statement in _sqlite_fts_statements(table, columns):
+                op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        for name in POSTGRES_INDEXES:
+            op.execute(f'DROP INDEX IF EXISTS {name}')
+    elif dialect == 'sqlite':
+        for table in SQLITE_FTS_TABLES:
+            for trigger in ('insert', 'delete', 'update'):
+                op.execute(f'DROP TRIGGER IF EXISTS {table}_fts_{trigger}')
+            op.execute(f'DROP TABLE IF EXISTS {table}_fts')
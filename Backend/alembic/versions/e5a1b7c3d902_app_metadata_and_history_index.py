@@ -0,0 +1,41 @@
+"""App metadata and history index
+
+Revision ID: e5a1b7c3d902
+Revises: c4d8e2f6a913
+Create Date: 2026-10-18 09:41:12.208316
+
+Adds the app_metadata table and the ix_quiz_attempts_user_completed index.
+Each is created only if missing, so databases that app.migrate stamped at
+539905540c48 get them too.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a1b7c3d902'
+down_revision: Union[str, Sequence[str], None] = 'c4d8e2f6a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if 'app_metadata' not in inspector.get_table_names():
+        op.create_table('app_metadata',
+        sa.Column('key', sa.String(length=100), nullable=False),
+        sa.Column('value', sa.Text(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('key')
+        )
+    if 'ix_quiz_attempts_user_completed' not in {index['name'] for index in inspector.get_indexes('quiz_attempts')}:
+        op.create_index('ix_quiz_attempts_user_completed', 'quiz_attempts', ['user_id', 'completed_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_quiz_attempts_user_completed', table_name='quiz_attempts')
+    op.drop_table('app_metadata')
@@ -1,15 +1,32 @@
 """
 Admin API endpoints for database management via browser
 """
+import os
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import case, func, select, true
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
+from ..cache import catalog_cache, VersionedCache
 from ..database import get_db
+from ..pagination import PageParams, paginate, set_next_cursor
+from ..read_routing import hold_primary
+from ..responses import FastJSONResponse
+from ..sessions import forget_principal
 from .. import models_hierarchical as models
 
 router = APIRouter()
 
+# Dashboard statistics tolerate a few seconds of staleness
+ADMIN_STATS_TTL = float(os.getenv("ADMIN_STATS_TTL", "10"))
+stats_cache = VersionedCache(ttl=ADMIN_STATS_TTL)
+
+def _catalog_changed():
+    """Drop cached data derived from sectors, branches and specializations"""
+    catalog_cache.invalidate()
+    stats_cache.invalidate()
+    hold_primary()   # refill from the primary until replicas have the write
+
 # Request/Response Models
 class SectorCreate(BaseModel):
     name: str
@@ -49,6 +66,7 @@ class UserUpdate(BaseModel):
     technical_score: Optional[float] = None
     soft_skills_score: Optional[float] = None
     preferred_specialization_id: Optional[int] = None
+    is_active: Optional[bool] = None
 
 # ============================================================
 # SECTORS
@@ -57,10 +75,20 @@ class UserUpdate(BaseModel):
 @router.get("/admin/sectors")
 def get_all_sectors(db: Session = Depends(get_db)):
     """Get all sectors with branch counts"""
-    sectors = db.query(models.Sector).all()
+    branch_counts = db.query(
+        models.Branch.sector_id,
+        func.count(models.Branch.id).label("branch_count")
+    ).group_by(models.Branch.sector_id).subquery()
+    
+    rows = db.query(
+        models.Sector,
+        func.coalesce(branch_counts.c.branch_count, 0)
+    ).outerjoin(
+        branch_counts, branch_counts.c.sector_id == models.Sector.id
+    ).order_by(models.Sector.id).all()
+    
     result = []
-    for sector in sectors:
-        branch_count = db.query(models.Branch).filter(models.Branch.sector_id == sector.id).count()
+    for sector, branch_count in rows:
         result.append({
             "id": sector.id,
             "name": sector.name,
@@ -69,7 +97,7 @@ def get_all_sectors(db: Session = Depends(get_db)):
             "branch_count": branch_count,
             "created_at": sector.created_at.isoformat() if sector.created_at else None
         })
-    return result
+    return FastJSONResponse(result)
 
 @router.post("/admin/sectors")
 def create_sector(sector: SectorCreate, db: Session = Depends(get_db)):
@@ -81,6 +109,7 @@ def create_sector(sector: SectorCreate, db: Session = Depends(get_db)):
     new_sector = models.Sector(name=sector.name, description=sector.description)
     db.add(new_sector)
     db.commit()
+    _catalog_changed()
     db.refresh(new_sector)
     return {"success": True, "id": new_sector.id, "message": "Sector created"}
 
@@ -99,6 +128,7 @@ def update_sector(sector_id: int, sector: SectorUpdate, db: Session = Depends(ge
         db_sector.is_active = sector.is_active
     
     db.commit()
+    _catalog_changed()
     db.refresh(db_sector)
     return {"success": True, "message": "Sector updated"}
 
@@ -111,6 +141,7 @@ def delete_sector(sector_id: int, db: Session = Depends(get_db)):
     
     sector.is_active = False
     db.commit()
+    _catalog_changed()
     return {"success": True, "message": "Sector deactivated"}
 
 # ============================================================
@@ -118,27 +149,43 @@ def delete_sector(sector_id: int, db: Session = Depends(get_db)):
 # ============================================================
 
 @router.get("/admin/branches")
-def get_all_branches(sector_id: Optional[int] = None, db: Session = Depends(get_db)):
-    """Get all branches, optionally filtered by sector"""
-    query = db.query(models.Branch)
+def get_all_branches(sector_id: Optional[int] = None,
+                     page: PageParams = Depends(), db: Session = Depends(get_db)):
+    """Get a page of branches, optionally filtered by sector"""
+    spec_counts = db.query(
+        models.Specialization.branch_id,
+        func.count(models.Specialization.id).label("specialization_count")
+    ).group_by(models.Specialization.branch_id).subquery()
+    
+    query = db.query(
+        models.Branch,
+        models.Sector.name,
+        func.coalesce(spec_counts.c.specialization_count, 0)
+    ).outerjoin(
+        models.Sector, models.Sector.id == models.Branch.sector_id
+    ).outerjoin(
+        spec_counts, spec_counts.c.branch_id == models.Branch.id
+    )
     if sector_id:
         query = query.filter(models.Branch.sector_id == sector_id)
     
-    branches = query.all()
+    rows, next_cursor = paginate(query, [models.Branch.id], key=lambda row: (row[0].id,),
+                                 cursor=page.cursor, limit=page.limit)
+    
     result = []
-    for branch in branches:
-        sector = db.query(models.Sector).filter(models.Sector.id == branch.sector_id).first()
-        spec_count = db.query(models.Specialization).filter(models.Specialization.branch_id == branch.id).count()
+    for branch, sector_name, spec_count in rows:
         result.append({
             "id": branch.id,
             "name": branch.name,
             "description": branch.description,
             "sector_id": branch.sector_id,
-            "sector_name": sector.name if sector else None,
+            "sector_name": sector_name,
             "is_active": branch.is_active,
             "specialization_count": spec_count
         })
-    return result
+    response = FastJSONResponse(result)
+    set_next_cursor(response, next_cursor)
+    return response
 
 @router.post("/admin/branches")
 def create_branch(branch: BranchCreate, db: Session = Depends(get_db)):
@@ -155,6 +202,7 @@ def create_branch(branch: BranchCreate, db: Session = Depends(get_db)):
     )
     db.add(new_branch)
     db.commit()
+    _catalog_changed()
     db.refresh(new_branch)
     return {"success": True, "id": new_branch.id, "message": "Branch created"}
 
@@ -175,6 +223,7 @@ def update_branch(branch_id: int, branch: BranchUpdate, db: Session = Depends(ge
         db_branch.is_active = branch.is_active
     
     db.commit()
+    _catalog_changed()
     return {"success": True, "message": "Branch updated"}
 
 @router.delete("/admin/branches/{branch_id}")
@@ -186,6 +235,7 @@ def delete_branch(branch_id: int, db: Session = Depends(get_db)):
     
     branch.is_active = False
     db.commit()
+    _catalog_changed()
     return {"success": True, "message": "Branch deactivated"}
 
 # ============================================================
@@ -193,29 +243,47 @@ def delete_branch(branch_id: int, db: Session = Depends(get_db)):
 # ============================================================
 
 @router.get("/admin/specializations")
-def get_all_specializations(branch_id: Optional[int] = None, db: Session = Depends(get_db)):
-    """Get all specializations, optionally filtered by branch"""
-    query = db.query(models.Specialization)
+def get_all_specializations(branch_id: Optional[int] = None,
+                            page: PageParams = Depends(), db: Session = Depends(get_db)):
+    """Get a page of specializations, optionally filtered by branch"""
+    quiz_counts = db.query(
+        models.Quiz.specialization_id,
+        func.count(models.Quiz.id).label("quiz_count")
+    ).group_by(models.Quiz.specialization_id).subquery()
+    
+    query = db.query(
+        models.Specialization,
+        models.Branch.name,
+        models.Sector.name,
+        func.coalesce(quiz_counts.c.quiz_count, 0)
+    ).outerjoin(
+        models.Branch, models.Branch.id == models.Specialization.branch_id
+    ).outerjoin(
+        models.Sector, models.Sector.id == models.Branch.sector_id
+    ).outerjoin(
+        quiz_counts, quiz_counts.c.specialization_id == models.Specialization.id
+    )
     if branch_id:
         query = query.filter(models.Specialization.branch_id == branch_id)
     
-    specializations = query.all()
+    rows, next_cursor = paginate(query, [models.Specialization.id], key=lambda row: (row[0].id,),
+                                 cursor=page.cursor, limit=page.limit)
+    
     result = []
-    for spec in specializations:
-        branch = db.query(models.Branch).filter(models.Branch.id == spec.branch_id).first()
-        sector = db.query(models.Sector).filter(models.Sector.id == branch.sector_id).first() if branch else None
-        quiz_count = db.query(models.Quiz).filter(models.Quiz.specialization_id == spec.id).count()
+    for spec, branch_name, sector_name, quiz_count in rows:
         result.append({
             "id": spec.id,
             "name": spec.name,
             "description": spec.description,
             "branch_id": spec.branch_id,
-            "branch_name": branch.name if branch else None,
-            "sector_name": sector.name if sector else None,
+            "branch_name": branch_name,
+            "sector_name": sector_name,
             "is_active": spec.is_active,
             "quiz_count": quiz_count
         })
-    return result
+    response = FastJSONResponse(result)
+    set_next_cursor(response, next_cursor)
+    return response
 
 @router.post("/admin/specializations")
 def create_specialization(spec: SpecializationCreate, db: Session = Depends(get_db)):
@@ -231,6 +299,7 @@ def create_specialization(spec: SpecializationCreate, db: Session = Depends(get_
     )
     db.add(new_spec)
     db.commit()
+    _catalog_changed()
     db.refresh(new_spec)
     return {"success": True, "id": new_spec.id, "message": "Specialization created"}
 
@@ -251,6 +320,7 @@ def update_specialization(spec_id: int, spec: SpecializationUpdate, db: Session
         db_spec.is_active = spec.is_active
     
     db.commit()
+    _catalog_changed()
     return {"success": True, "message": "Specialization updated"}
 
 @router.delete("/admin/specializations/{spec_id}")
@@ -262,6 +332,7 @@ def delete_specialization(spec_id: int, db: Session = Depends(get_db)):
     
     spec.is_active = False
     db.commit()
+    _catalog_changed()
     return {"success": True, "message": "Specialization deactivated"}
 
 # ============================================================
@@ -269,17 +340,19 @@ def delete_specialization(spec_id: int, db: Session = Depends(get_db)):
 # ============================================================
 
 @router.get("/admin/users")
-def get_all_users(db: Session = Depends(get_db)):
-    """Get all users"""
-    users = db.query(models.User).all()
+def get_all_users(page: PageParams = Depends(), db: Session = Depends(get_db)):
+    """Get a page of users"""
+    query = db.query(
+        models.User,
+        models.Specialization.name
+    ).outerjoin(
+        models.Specialization, models.Specialization.id == models.User.preferred_specialization_id
+    )
+    rows, next_cursor = paginate(query, [models.User.id], key=lambda row: (row[0].id,),
+                                 cursor=page.cursor, limit=page.limit)
+    
     result = []
-    for user in users:
-        spec = None
-        if user.preferred_specialization_id:
-            spec = db.query(models.Specialization).filter(
-                models.Specialization.id == user.preferred_specialization_id
-            ).first()
-        
+    for user, specialization_name in rows:
         result.append({
             "id": user.id,
             "name": user.name,
@@ -289,10 +362,12 @@ def get_all_users(db: Session = Depends(get_db)):
             "technical_score": user.technical_score,
             "soft_skills_score": user.soft_skills_score,
             "preferred_specialization_id": user.preferred_specialization_id,
-            "specialization_name": spec.name if spec else None,
+            "specialization_name": specialization_name,
             "created_at": user.created_at.isoformat() if user.created_at else None
         })
-    return result
+    response = FastJSONResponse(result)
+    set_next_cursor(response, next_cursor)
+    return response
 
 @router.put("/admin/users/{user_id}")
 def update_user(user_id: int, user: UserUpdate, db: Session = Depends(get_db)):
@@ -313,8 +388,16 @@ def update_user(user_id: int, user: UserUpdate, db: Session = Depends(get_db)):
         db_user.soft_skills_score = user.soft_skills_score
     if user.preferred_specialization_id is not None:
         db_user.preferred_specialization_id = user.preferred_specialization_id
+    if user.is_active is not None:
+        if db_user.is_active is not False and not user.is_active:
+            # Deactivation revokes the user's sessions
+            db_user.session_version += 1
+        db_user.is_active = user.is_active
     
     db.commit()
+    stats_cache.invalidate()
+    forget_principal(user_id)
+    hold_primary()
     db.refresh(db_user)
     return {"success": True, "message": "User updated"}
 
@@ -322,22 +405,57 @@ def update_user(user_id: int, user: UserUpdate, db: Session = Depends(get_db)):
 # STATISTICS
 # ============================================================
 
-@router.get("/admin/stats")
-def get_statistics(db: Session = Depends(get_db)):
-    """Get database statistics"""
-    from sqlalchemy import func
+def _count_active(model):
+    """One-row subquery with total and active row counts for a table"""
+    return select(
+        func.count(model.id).label("total"),
+        func.coalesce(func.sum(case((model.is_active == True, 1), else_=0)), 0).label("active")
+    ).subquery()
+
+def _load_statistics(db: Session):
+    """Compute every dashboard statistic in a single aggregate statement"""
+    sectors = _count_active(models.Sector)
+    branches = _count_active(models.Branch)
+    specializations = _count_active(models.Specialization)
+    users = select(
+        func.count(models.User.id).label("total"),
+        func.coalesce(func.sum(case((models.User.is_active == True, 1), else_=0)), 0).label("active"),
+        func.avg(models.User.readiness_score).label("avg_readiness")
+    ).subquery()
+    quizzes = select(func.count(models.Quiz.id).label("total")).subquery()
+    attempts = select(func.count(models.QuizAttempt.id).label("total")).subquery()
+    
+    # Every subquery returns exactly one row, so cross joining them yields one row
+    row = db.execute(select(
+        sectors.c.total, sectors.c.active,
+        branches.c.total, branches.c.active,
+        specializations.c.total, specializations.c.active,
+        quizzes.c.total,
+        users.c.total, users.c.active, users.c.avg_readiness,
+        attempts.c.total
+    ).select_from(
+        sectors.join(branches, true())
+        .join(specializations, true())
+        .join(quizzes, true())
+        .join(users, true())
+        .join(attempts, true())
+    )).one()
     
     return {
-        "sectors": db.query(models.Sector).count(),
-        "active_sectors": db.query(models.Sector).filter(models.Sector.is_active == True).count(),
-        "branches": db.query(models.Branch).count(),
-        "active_branches": db.query(models.Branch).filter(models.Branch.is_active == True).count(),
-        "specializations": db.query(models.Specialization).count(),
-        "active_specializations": db.query(models.Specialization).filter(models.Specialization.is_active == True).count(),
-        "quizzes": db.query(models.Quiz).count(),
-        "users": db.query(models.User).count(),
-        "active_users": db.query(models.User).filter(models.User.is_active == True).count(),
-        "quiz_attempts": db.query(models.QuizAttempt).count(),
-        "avg_readiness_score": db.query(func.avg(models.User.readiness_score)).scalar() or 0.0
+        "sectors": row[0],
+        "active_sectors": row[1],
+        "branches": row[2],
+        "active_branches": row[3],
+        "specializations": row[4],
+        "active_specializations": row[5],
+        "quizzes": row[6],
+        "users": row[7],
+        "active_users": row[8],
+        "quiz_attempts": row[10],
+        "avg_readiness_score": row[9] or 0.0
     }
 
+@router.get("/admin/stats")
+def get_statistics(db: Session = Depends(get_db)):
+    """Get database statistics (recomputed at most every ADMIN_STATS_TTL seconds)"""
+    return stats_cache.get_or_load("stats", lambda: _load_statistics(db))
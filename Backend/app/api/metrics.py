@@ -0,0 +1,49 @@
+"""
+Operational metrics endpoints
+"""
+from fastapi import APIRouter
+from ..database import engine, async_engine, pool_status, replicas
+from ..query_stats import route_metrics
+from ..passwords import hasher
+from ..read_routing import recent_writers
+from ..throttling import login_throttle
+from ..write_behind import attempt_writer
+
+router = APIRouter()
+
+@router.get("/metrics/pool")
+def get_pool_metrics():
+    """Connection pool usage for the sync and async engines, and each replica's"""
+    return {
+        "sync": pool_status(engine),
+        "async": pool_status(async_engine.sync_engine),
+        "replicas": {
+            replica.name: {"sync": pool_status(replica.engine), "async": pool_status(replica.async_engine.sync_engine)}
+            for replica in replicas.replicas
+        }
+    }
+
+@router.get("/metrics/queries")
+def get_query_metrics():
+    """Per-route SQL statement counts, DB time and N+1 flags since startup"""
+    return route_metrics.snapshot()
+
+@router.get("/metrics/passwords")
+def get_password_metrics():
+    """Password hashing pool: running and queued hashes, rejections, average cost"""
+    return hasher.snapshot()
+
+@router.get("/metrics/throttling")
+def get_throttling_metrics():
+    """Login throttle: attempts checked, rejections per IP and per email, tracked keys"""
+    return login_throttle.snapshot()
+
+@router.get("/metrics/attempt_writes")
+def get_attempt_write_metrics():
+    """Quiz start write-behind: queued and flushed rows, batch sizes, fallbacks and failures"""
+    return attempt_writer.snapshot()
+
+@router.get("/metrics/replicas")
+def get_replica_metrics():
+    """Read replicas: health, lag, reads served, primary fallbacks and read-your-writes stickiness"""
+    return {**replicas.status(), "routing": recent_writers.snapshot()}
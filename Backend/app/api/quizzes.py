@@ -1,44 +1,35 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from .. import crud, schemas
-from .. import models_hierarchical as models
-from ..database import get_db
+from fastapi import APIRouter, HTTPException, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import crud_async, schemas
+from ..database import get_async_db
+from ..http_cache import revalidated_response, byte_cached_response, quiz_responses
+from ..pagination import PageParams, NEXT_CURSOR_HEADER
+from ..responses import FastJSONResponse
+from ..sessions import Principal, current_user
 
 router = APIRouter()
 
 # We now use schemas from schemas.py instead of defining models here
+# Quiz endpoints are the hot path, so they run on the async engine.
+# Handlers build their exact output shape and return encoded responses, so
+# response_model only documents the shape and never re-validates it
 
-# ENDPOINTS
-@router.get("/quizzes", response_model=schemas.QuizzesResponse)
-def get_all_quizzes(db: Session = Depends(get_db)):
-    quizzes = crud.get_all_quizzes(db)
-    
-    quiz_list = []
-    for quiz in quizzes:
-        quiz_list.append({
+def quiz_summaries(rows):
+    """QuizSummary dicts for (quiz, specialization_name, question_count) rows"""
+    return [
+        {
             "id": quiz.id,
             "title": quiz.title,
             "description": quiz.description,
-            "specialization_id": quiz.specialization_id,
-            "specialization_name": quiz.specialization.name if quiz.specialization else None,
             "duration": quiz.time_limit_minutes,
-            "question_count": len(quiz.questions) if quiz.questions else 0,
-            "difficulty": quiz.difficulty_level
-        })
-    
-    return {"quizzes": quiz_list}
+            "difficulty": quiz.difficulty_level,
+            "question_count": question_count,
+            "specialization_name": specialization_name
+        } for quiz, specialization_name, question_count in rows
+    ]
 
-@router.get("/quizzes/{quiz_id}")
-def get_quiz(quiz_id: int, db: Session = Depends(get_db)):
-    """Get a quiz with all questions and options - returns custom format"""
-    quiz = crud.get_quiz_by_id(db, quiz_id)
-    
-    if not quiz:
-        raise HTTPException(status_code=404, detail="Quiz not found")
-    
-    questions = crud.get_quiz_questions(db, quiz_id)
-    
-    # Build response matching frontend expectations
+def quiz_detail(quiz, questions):
+    """Quiz detail payload matching frontend expectations"""
     quiz_data = {
         "id": quiz.id,
         "title": quiz.title,
@@ -50,11 +41,11 @@ def get_quiz(quiz_id: int, db: Session = Depends(get_db)):
         "questions": []
     }
     
-    for question in questions:
+    for question, question_options in questions:
         # Get all options with their correct status
         options = []
         correct_index = None
-        for idx, option in enumerate(question.options):
+        for idx, option in enumerate(question_options):
             options.append({
                 "text": option.option_text,
                 "is_correct": option.is_correct
@@ -72,56 +63,75 @@ def get_quiz(quiz_id: int, db: Session = Depends(get_db)):
     
     return quiz_data
 
+# ENDPOINTS
+@router.get("/quizzes", response_model=schemas.QuizzesResponse)
+async def get_all_quizzes(request: Request, page: PageParams = Depends(), db: AsyncSession = Depends(get_async_db)):
+    async def build():
+        rows, next_cursor = await crud_async.get_all_quizzes(db, page.cursor, page.limit)
+        return {"quizzes": quiz_summaries(rows), "next_cursor": next_cursor}
+    
+    return await revalidated_response(
+        request, ("quizzes", page.cursor, page.limit), build,
+        headers=lambda payload: {NEXT_CURSOR_HEADER: payload["next_cursor"]} if payload["next_cursor"] else {}
+    )
+
+@router.get("/quizzes/{quiz_id}")
+async def get_quiz(quiz_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Get a quiz with all questions and options - returns custom format"""
+    async def build():
+        # Quiz, ordered questions and ordered options in a single statement
+        quiz, questions = await crud_async.get_quiz_with_questions(db, quiz_id)
+        
+        if not quiz:
+            raise HTTPException(status_code=404, detail="Quiz not found")
+        
+        return quiz_detail(quiz, questions)
+    
+    # Hottest endpoint: serve the encoded body straight from the byte cache
+    return await byte_cached_response(request, quiz_responses, quiz_id, build)
+
 @router.post("/quizzes/{quiz_id}/start", response_model=schemas.QuizStartResponse)
-def start_quiz(quiz_id: int, user_id: int, db: Session = Depends(get_db)):
-    quiz = crud.get_quiz_by_id(db, quiz_id)
+async def start_quiz(quiz_id: int, principal: Principal = Depends(current_user),
+                     db: AsyncSession = Depends(get_async_db)):
+    # The user comes from the session token; a cached principal skips the users table
+    quiz = await crud_async.get_quiz_by_id(db, quiz_id)
     if not quiz:
         raise HTTPException(status_code=404, detail="Quiz not found")
     
-    user = crud.get_user_by_id(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    attempt = crud.create_quiz_attempt(db, user_id, quiz_id)
+    attempt = await crud_async.create_quiz_attempt(db, principal.id, quiz_id)
     
-    return {
+    return FastJSONResponse({
         "attempt_id": attempt.id,
         "quiz_id": quiz_id,
         "message": "Quiz started successfully"
-    }
+    })
 
 @router.post("/attempts/{attempt_id}/submit", response_model=schemas.QuizResult)
-def submit_quiz(attempt_id: int, data: schemas.QuizSubmission, db: Session = Depends(get_db)):
-    answers = [{"question_id": a.question_id, "selected_answer": a.selected_answer} 
+async def submit_quiz(attempt_id: int, data: schemas.QuizSubmission, principal: Principal = Depends(current_user),
+                      db: AsyncSession = Depends(get_async_db)):
+    answers = [{"question_id": a.question_id, "selected_answer": a.selected_answer}
                for a in data.answers]
     
-    result = crud.submit_quiz_attempt(db, attempt_id, answers)
+    # Another user's attempt is reported as missing, so attempt ids cannot be probed
+    result = await crud_async.submit_quiz_attempt(db, attempt_id, principal.id, answers)
     
     if not result:
         raise HTTPException(status_code=404, detail="Attempt not found")
     
-    return {
+    return FastJSONResponse({
         "success": True,
         "score": result["score"],
         "correct": result["correct"],
         "total": result["total"],
         "passed": result["passed"],
         "message": "Great job!" if result["passed"] else "Keep practicing!"
-    }
+    })
 
 @router.get("/specializations/{specialization_id}/quizzes", response_model=schemas.QuizzesResponse)
-def get_quizzes_by_specialization(specialization_id: int, db: Session = Depends(get_db)):
-    quizzes = crud.get_quizzes_by_specialization(db, specialization_id)
+async def get_quizzes_by_specialization(specialization_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    async def build():
+        rows = await crud_async.get_quizzes_by_specialization(db, specialization_id)
+        
+        return {"quizzes": quiz_summaries(rows), "next_cursor": None}
     
-    return {
-        "quizzes": [
-            {
-                "id": quiz.id,
-                "title": quiz.title,
-                "description": quiz.description,
-                "duration": quiz.time_limit_minutes,
-                "difficulty": quiz.difficulty_level,
-                "question_count": len(quiz.questions) if quiz.questions else 0
-            } for quiz in quizzes
-        ]
-    }
\ No newline at end of file
+    return await revalidated_response(request, ("specialization_quizzes", specialization_id), build)
@@ -0,0 +1,39 @@
+"""
+Full-text search endpoint over quizzes, questions and specializations
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import search as search_index
+from ..database import get_async_db
+from ..pagination import PageParams, set_next_cursor
+from ..responses import FastJSONResponse
+
+router = APIRouter()
+
+@router.get("/search")
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text"),
+    type: Optional[str] = Query(None, pattern="^(quiz|question|specialization)$",
+                                description="Only return results of this type"),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Ranked matches, best first; the next page's cursor is in X-Next-Cursor"""
+    types = (type,) if type else search_index.SEARCH_TYPES
+    rows, next_cursor = await search_index.search(db, q, types, cursor=page.cursor, limit=page.limit)
+    
+    response = FastJSONResponse([
+        {
+            "type": row.type,
+            "id": row.id,
+            "title": row.title,
+            "description": row.description,
+            "quiz_id": row.quiz_id,
+            "specialization_id": row.specialization_id,
+            "rank": -row.score
+        }
+        for row in rows
+    ])
+    set_next_cursor(response, next_cursor)
+    return response
@@ -1,37 +1,45 @@
 """
 Hierarchical API endpoints for 3-level sector structure: Sector -> Branch -> Specialization
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import and_
 from sqlalchemy.orm import Session
-from typing import List
+from ..cache import catalog_cache
 from ..database import get_db
+from ..http_cache import cached_response
 from ..models_hierarchical import Sector, Branch, Specialization
+from ..typeahead import SpecializationIndex
 
 router = APIRouter()
 
-@router.get("/sectors", response_model=List[dict])
-def get_sectors(db: Session = Depends(get_db)):
+def _load_sectors(db: Session):
+    """Active sectors as response dicts"""
+    sectors = db.query(Sector).filter(Sector.is_active == True).all()
+    result = []
+    
+    for sector in sectors:
+        sector_data = {
+            "id": sector.id,
+            "name": sector.name,
+            "description": sector.description,
+            "created_at": sector.created_at.isoformat() if sector.created_at else None
+        }
+        result.append(sector_data)
+    
+    return result
+
+
+@router.get("/sectors")
+def get_sectors(request: Request, db: Session = Depends(get_db)):
     """Get all sectors"""
     try:
-        sectors = db.query(Sector).filter(Sector.is_active == True).all()
-        result = []
-        
-        for sector in sectors:
-            sector_data = {
-                "id": sector.id,
-                "name": sector.name,
-                "description": sector.description,
-                "created_at": sector.created_at.isoformat() if sector.created_at else None
-            }
-            result.append(sector_data)
-        
-        return result
+        return cached_response(request, "sectors", lambda: _load_sectors(db))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching sectors: {str(e)}")
 
 
-@router.get("/sectors/{sector_id}", response_model=dict)
+@router.get("/sectors/{sector_id}")
 def get_sector_by_id(sector_id: int, db: Session = Depends(get_db)):
     """Get a specific sector by ID"""
     try:
@@ -52,7 +60,7 @@ def get_sector_by_id(sector_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error fetching sector: {str(e)}")
 
 
-@router.get("/sectors/{sector_id}/branches", response_model=List[dict])
+@router.get("/sectors/{sector_id}/branches")
 def get_branches_by_sector(sector_id: int, db: Session = Depends(get_db)):
     """Get all branches for a specific sector"""
     try:
@@ -85,7 +93,7 @@ def get_branches_by_sector(sector_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error fetching branches: {str(e)}")
 
 
-@router.get("/branches/{branch_id}", response_model=dict)
+@router.get("/branches/{branch_id}")
 def get_branch_by_id(branch_id: int, db: Session = Depends(get_db)):
     """Get a specific branch by ID"""
     try:
@@ -107,7 +115,7 @@ def get_branch_by_id(branch_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error fetching branch: {str(e)}")
 
 
-@router.get("/branches/{branch_id}/specializations", response_model=List[dict])
+@router.get("/branches/{branch_id}/specializations")
 def get_specializations_by_branch(branch_id: int, db: Session = Depends(get_db)):
     """Get all specializations for a specific branch"""
     try:
@@ -140,7 +148,18 @@ def get_specializations_by_branch(branch_id: int, db: Session = Depends(get_db))
         raise HTTPException(status_code=500, detail=f"Error fetching specializations: {str(e)}")
 
 
-@router.get("/specializations/{specialization_id}", response_model=dict)
+# Declared before /specializations/{specialization_id} so "suggest" is not read as an id
+@router.get("/specializations/suggest")
+def suggest_specializations(
+    q: str = Query(..., min_length=1, max_length=100, description="What the user has typed so far"),
+    limit: int = Query(8, ge=1, le=50, description="Maximum number of suggestions"),
+    db: Session = Depends(get_db)
+):
+    """Typeahead for the specialization picker: best matches with their sector/branch path"""
+    return get_specialization_index(db).suggest(q, limit)
+
+
+@router.get("/specializations/{specialization_id}")
 def get_specialization_by_id(specialization_id: int, db: Session = Depends(get_db)):
     """Get a specific specialization by ID"""
     try:
@@ -165,50 +184,83 @@ def get_specialization_by_id(specialization_id: int, db: Session = Depends(get_d
         raise HTTPException(status_code=500, detail=f"Error fetching specialization: {str(e)}")
 
 
-@router.get("/sectors/{sector_id}/hierarchy", response_model=dict)
-def get_sector_full_hierarchy(sector_id: int, db: Session = Depends(get_db)):
-    """Get the complete hierarchy for a sector (sector -> branches -> specializations)"""
-    try:
-        # First check if sector exists
-        sector = db.query(Sector).filter(Sector.id == sector_id, Sector.is_active == True).first()
-        if not sector:
-            raise HTTPException(status_code=404, detail="Sector not found")
+def _load_hierarchy(db: Session):
+    """Load the active Sector -> Branch -> Specialization tree in one query"""
+    rows = db.query(
+        Sector.id, Sector.name, Sector.description,
+        Branch.id, Branch.name, Branch.description,
+        Specialization.id, Specialization.name, Specialization.description
+    ).outerjoin(
+        Branch, and_(Branch.sector_id == Sector.id, Branch.is_active == True)
+    ).outerjoin(
+        Specialization, and_(Specialization.branch_id == Branch.id, Specialization.is_active == True)
+    ).filter(
+        Sector.is_active == True
+    ).order_by(Sector.id, Branch.id, Specialization.id).all()
+    
+    result = []
+    sectors = {}
+    branches = {}
+    for (sector_id, sector_name, sector_description,
+         branch_id, branch_name, branch_description,
+         spec_id, spec_name, spec_description) in rows:
+        sector_data = sectors.get(sector_id)
+        if sector_data is None:
+            sector_data = {
+                "id": sector_id,
+                "name": sector_name,
+                "description": sector_description,
+                "branches": []
+            }
+            sectors[sector_id] = sector_data
+            result.append(sector_data)
         
-        # Get all branches for this sector
-        branches = db.query(Branch).filter(
-            Branch.sector_id == sector_id,
-            Branch.is_active == True
-        ).all()
+        if branch_id is None:
+            continue
+        branch_data = branches.get(branch_id)
+        if branch_data is None:
+            branch_data = {
+                "id": branch_id,
+                "name": branch_name,
+                "description": branch_description,
+                "specializations": []
+            }
+            branches[branch_id] = branch_data
+            sector_data["branches"].append(branch_data)
         
-        branches_data = []
-        for branch in branches:
-            # Get all specializations for this branch
-            specializations = db.query(Specialization).filter(
-                Specialization.branch_id == branch.id,
-                Specialization.is_active == True
-            ).all()
-            
-            specializations_data = []
-            for spec in specializations:
-                specializations_data.append({
-                    "id": spec.id,
-                    "name": spec.name,
-                    "description": spec.description
-                })
-            
-            branches_data.append({
-                "id": branch.id,
-                "name": branch.name,
-                "description": branch.description,
-                "specializations": specializations_data
+        if spec_id is not None:
+            branch_data["specializations"].append({
+                "id": spec_id,
+                "name": spec_name,
+                "description": spec_description
             })
+    
+    return result
+
+
+def get_cached_hierarchy(db: Session):
+    """Complete hierarchy from the catalog cache, loading it on a miss"""
+    return catalog_cache.get_or_load("hierarchy", lambda: _load_hierarchy(db))
+
+
+def get_specialization_index(db: Session):
+    """Typeahead index from the catalog cache, built from the cached hierarchy on a miss"""
+    return catalog_cache.get_or_load(
+        "specialization_index", lambda: SpecializationIndex(get_cached_hierarchy(db))
+    )
+
+
+@router.get("/sectors/{sector_id}/hierarchy")
+def get_sector_full_hierarchy(sector_id: int, request: Request, db: Session = Depends(get_db)):
+    """Get the complete hierarchy for a sector (sector -> branches -> specializations)"""
+    try:
+        def load():
+            for sector in get_cached_hierarchy(db):
+                if sector["id"] == sector_id:
+                    return sector
+            raise HTTPException(status_code=404, detail="Sector not found")
         
-        return {
-            "id": sector.id,
-            "name": sector.name,
-            "description": sector.description,
-            "branches": branches_data
-        }
+        return cached_response(request, ("sector_hierarchy", sector_id), load)
         
     except HTTPException:
         raise
@@ -216,51 +268,11 @@ def get_sector_full_hierarchy(sector_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error fetching sector hierarchy: {str(e)}")
 
 
-@router.get("/hierarchy", response_model=List[dict])
-def get_complete_hierarchy(db: Session = Depends(get_db)):
+@router.get("/hierarchy")
+def get_complete_hierarchy(request: Request, db: Session = Depends(get_db)):
     """Get the complete hierarchy for all sectors"""
     try:
-        sectors = db.query(Sector).filter(Sector.is_active == True).all()
-        result = []
-        
-        for sector in sectors:
-            # Get all branches for this sector
-            branches = db.query(Branch).filter(
-                Branch.sector_id == sector.id,
-                Branch.is_active == True
-            ).all()
-            
-            branches_data = []
-            for branch in branches:
-                # Get all specializations for this branch
-                specializations = db.query(Specialization).filter(
-                    Specialization.branch_id == branch.id,
-                    Specialization.is_active == True
-                ).all()
-                
-                specializations_data = []
-                for spec in specializations:
-                    specializations_data.append({
-                        "id": spec.id,
-                        "name": spec.name,
-                        "description": spec.description
-                    })
-                
-                branches_data.append({
-                    "id": branch.id,
-                    "name": branch.name,
-                    "description": branch.description,
-                    "specializations": specializations_data
-                })
-            
-            result.append({
-                "id": sector.id,
-                "name": sector.name,
-                "description": sector.description,
-                "branches": branches_data
-            })
-        
-        return result
+        return cached_response(request, "hierarchy", lambda: get_cached_hierarchy(db))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching complete hierarchy: {str(e)}")
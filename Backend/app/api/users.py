@@ -1,9 +1,15 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
-from .. import crud, schemas
+from .. import crud, crud_async, schemas
 from .. import models_hierarchical as models
-from ..database import get_db
+from ..database import get_db, get_async_db
+from ..passwords import verify_password
+from ..read_routing import note_writer
+from ..sessions import Principal, current_user, issue_token, revoke_sessions
+from ..throttling import login_throttle
+from ..responses import FastJSONResponse
 
 router = APIRouter()
 
@@ -21,21 +27,27 @@ class UserUpdateRequest(BaseModel):
     specialization_id: int
 
 # ENDPOINTS
+# register and login are async: password hashing runs on the bounded pool in
+# app.passwords, so a burst of logins never occupies the request threadpool
 @router.post("/register")
-def register(data: UserRegisterRequest, db: Session = Depends(get_db)):
-    existing_user = crud.get_user_by_email(db, data.email)
+async def register(data: UserRegisterRequest, db: AsyncSession = Depends(get_async_db)):
+    existing_user = await crud_async.get_user_by_email(db, data.email)
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    new_user = crud.create_user(
+    new_user = await crud_async.create_user(
         db=db,
         email=data.email,
         password=data.password,
         name=data.name
     )
+    # The client reads with the token issued below; keep those reads on the primary
+    note_writer(new_user.id)
     
     return {
         "success": True,
+        "access_token": issue_token(new_user.id, new_user.session_version),
+        "token_type": "bearer",
         "user": {
             "id": new_user.id,
             "email": new_user.email,
@@ -48,14 +60,29 @@ def register(data: UserRegisterRequest, db: Session = Depends(get_db)):
     }
 
 @router.post("/login")
-def login(data: UserLoginRequest, db: Session = Depends(get_db)):
-    user = crud.get_user_by_email(db, data.email)
+async def login(data: UserLoginRequest, request: Request, db: AsyncSession = Depends(get_async_db)):
+    # Throttle before any database or hashing work (the session connects lazily).
+    # client.host is the caller's address when the proxy is listed in FORWARDED_ALLOW_IPS
+    retry_after = await login_throttle.check(request.client.host if request.client else "unknown", data.email)
+    if retry_after is not None:
+        raise HTTPException(status_code=429, detail="Too many login attempts, try again later",
+                            headers={"Retry-After": str(max(1, round(retry_after)))})
     
-    if not user or user.password_hash != data.password:
+    user = await crud_async.get_user_by_email(db, data.email)
+    
+    # An unknown email still costs one hash, so timing does not reveal accounts
+    matches, new_hash = await verify_password(data.password, user.password_hash if user else None)
+    if not matches:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
+    if new_hash:
+        # Plaintext or outdated parameters: upgrade now that we know the password
+        await crud_async.update_password_hash(db, user, new_hash)
+    
     return {
         "success": True,
+        "access_token": issue_token(user.id, user.session_version),
+        "token_type": "bearer",
         "user": {
             "id": user.id,
             "email": user.email,
@@ -67,8 +94,21 @@ def login(data: UserLoginRequest, db: Session = Depends(get_db)):
         }
     }
 
+@router.post("/logout")
+async def logout(principal: Principal = Depends(current_user), db: AsyncSession = Depends(get_async_db)):
+    # Revokes every session of the user, not just this token
+    await revoke_sessions(db, principal.id)
+    return {"success": True}
+
+def require_self(principal: Principal, user_id: int):
+    """403 unless the token belongs to user_id"""
+    if principal.id != user_id:
+        raise HTTPException(status_code=403, detail="Not allowed to access another user")
+
 @router.patch("/users/{user_id}/specialization")
-def update_specialization(user_id: int, data: UserUpdateRequest, db: Session = Depends(get_db)):
+def update_specialization(user_id: int, data: UserUpdateRequest, principal: Principal = Depends(current_user),
+                          db: Session = Depends(get_db)):
+    require_self(principal, user_id)
     if data.specialization_id is None:
         raise HTTPException(status_code=400, detail="Specialization ID is required")
     
@@ -88,21 +128,22 @@ def update_specialization(user_id: int, data: UserUpdateRequest, db: Session = D
     }
 
 @router.get("/users/{user_id}", response_model=schemas.User)
-def get_user(user_id: int, db: Session = Depends(get_db)):
+def get_user(user_id: int, principal: Principal = Depends(current_user), db: Session = Depends(get_db)):
+    require_self(principal, user_id)
     user = crud.get_user_by_id(db, user_id)
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    return {
-        "id": user.id,
+    # Already in schemas.User shape, so skip response_model validation
+    return FastJSONResponse({
         "email": user.email,
         "name": user.name,
+        "id": user.id,
         "specialization_id": user.preferred_specialization_id,
         "readiness_score": user.readiness_score,
         "technical_score": user.technical_score,
         "soft_skills_score": user.soft_skills_score,
-        "leadership_score": user.leadership_score,
         "created_at": user.created_at
-    }
+    })
 
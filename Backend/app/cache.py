@@ -0,0 +1,157 @@
+"""
+In-process caches for read-mostly catalog data
+Entries are stamped with the catalog version; admin writes bump the version
+so the next read rebuilds from the database
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Upper bound on how long a worker may serve an entry without reloading it.
+# Admin writes only invalidate the worker that handled them, so other workers
+# converge within this many seconds (0 disables the bound).
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", "60"))
+
+# Bound on catalog cache entries (paginated and per-id responses add keys)
+CATALOG_CACHE_MAX_ENTRIES = int(os.getenv("CATALOG_CACHE_MAX_ENTRIES", "10000"))
+
+
+class VersionedCache:
+    """Key/value cache where every entry belongs to one catalog version"""
+
+    def __init__(self, ttl: float = CATALOG_CACHE_TTL, maxsize: int = None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._version = 0
+        self._entries = {}
+
+    @property
+    def version(self):
+        return self._version
+
+    def peek(self, key):
+        """Cached value for key, or None if missing or stale"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry_version, loaded_at, value = entry
+        if entry_version != self._version:
+            return None
+        if self.ttl and time.monotonic() - loaded_at >= self.ttl:
+            return None
+        return value
+
+    def put(self, key, value, version):
+        """Store a value loaded while the cache was at `version`"""
+        with self._lock:
+            # Drop the result if an admin write landed while it was being loaded
+            if self._version != version:
+                return
+            self._entries.pop(key, None)
+            self._entries[key] = (version, time.monotonic(), value)
+            if self.maxsize and len(self._entries) > self.maxsize:
+                # Dicts keep insertion order, so this evicts the oldest entry
+                self._entries.pop(next(iter(self._entries)))
+
+    def get_or_load(self, key, loader):
+        """Return the cached value for key, calling loader() on a miss"""
+        value = self.peek(key)
+        if value is not None:
+            return value
+
+        version = self._version
+        value = loader()
+        self.put(key, value, version)
+        return value
+
+    def invalidate(self):
+        """Bump the version and drop every entry"""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache bounded by entry count and,
+    optionally, by the total size of its values as measured by sizeof
+    """
+
+    def __init__(self, maxsize: int, maxbytes: int = None, sizeof=len):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        # Bumped on every invalidation so loads that raced one can be discarded
+        self.generation = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return default
+            return self._entries[key]
+
+    def put(self, key, value, generation: int = None):
+        """Store value; skipped if generation is given and an invalidation happened since"""
+        size = self.sizeof(value) if self.maxbytes else 0
+        if self.maxbytes and size > self.maxbytes:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._remove(key)
+            self._entries[key] = value
+            self._bytes += size
+            while len(self._entries) > self.maxsize or (self.maxbytes and self._bytes > self.maxbytes):
+                self._remove(next(iter(self._entries)))
+
+    def pop(self, key):
+        with self._lock:
+            self.generation += 1
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        if key in self._entries:
+            value = self._entries.pop(key)
+            if self.maxbytes:
+                self._bytes -= self.sizeof(value)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Callbacks run as callback(quiz_id) when a quiz's questions or options change;
+# quiz_id is None when the affected quiz is unknown
+_quiz_content_listeners = []
+
+
+def on_quiz_content_changed(callback):
+    """Register a callback for quiz content changes (usable as a decorator)"""
+    _quiz_content_listeners.append(callback)
+    return callback
+
+
+def quiz_content_changed(quiz_id=None):
+    """Notify every registered cache that a quiz (or all quizzes) changed"""
+    for callback in _quiz_content_listeners:
+        callback(quiz_id)
+
+
+# Sector -> Branch -> Specialization tree and anything derived from it
+catalog_cache = VersionedCache(maxsize=CATALOG_CACHE_MAX_ENTRIES)
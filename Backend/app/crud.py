@@ -2,17 +2,18 @@
 CRUD operations for database
 """
 
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from . import models_hierarchical as models
-from typing import List
-from datetime import datetime, timezone
+from . import passwords
+from .pagination import keyset_window, split_page, DEFAULT_PAGE_SIZE
 
 # USER OPERATIONS
 def create_user(db: Session, email: str, password: str, name: str):
     """Create a new user"""
     db_user = models.User(
         email=email,
-        password_hash=password,  # In production, this should be hashed
+        password_hash=passwords.hash_password_sync(password),
         name=name
     )
     db.add(db_user)
@@ -72,9 +73,30 @@ def get_specialization_by_name(db: Session, name: str):
     ).first()
 
 # QUIZ OPERATIONS
-def get_all_quizzes(db: Session):
-    """Get all quizzes with their specializations"""
-    return db.query(models.Quiz).join(models.Specialization).all()
+def quiz_summary_statement():
+    """Quizzes with specialization name and question count, without touching relationships"""
+    question_counts = select(
+        models.Question.quiz_id,
+        func.count(models.Question.id).label("question_count")
+    ).group_by(models.Question.quiz_id).subquery()
+
+    return select(
+        models.Quiz,
+        models.Specialization.name,
+        func.coalesce(question_counts.c.question_count, 0)
+    ).join(
+        models.Specialization, models.Specialization.id == models.Quiz.specialization_id
+    ).outerjoin(
+        question_counts, question_counts.c.quiz_id == models.Quiz.id
+    )
+
+def get_all_quizzes(db: Session, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    """
+    Get a page of quizzes as (rows, next_cursor)
+    Each row is (quiz, specialization_name, question_count)
+    """
+    statement = keyset_window(quiz_summary_statement(), [models.Quiz.id], cursor, limit)
+    return split_page(db.execute(statement).all(), key=lambda row: (row[0].id,), limit=limit)
 
 def get_quiz_by_id(db: Session, quiz_id: int):
     """Get quiz by ID with questions and answer options"""
@@ -93,96 +115,12 @@ def get_quiz_questions(db: Session, quiz_id: int):
     ).order_by(models.Question.order_index).all()
 
 # QUIZ ATTEMPT OPERATIONS
-def create_quiz_attempt(db: Session, user_id: int, quiz_id: int):
-    """Create a new quiz attempt"""
-    db_attempt = models.QuizAttempt(
-        user_id=user_id,
-        quiz_id=quiz_id,
-        started_at=datetime.now(timezone.utc),
-        completed_at=datetime.now(timezone.utc),  # Will be updated on submission
-        score=0.0,
-        max_score=0.0,
-        percentage=0.0,
-        is_passed=False
-    )
-    db.add(db_attempt)
-    db.commit()
-    db.refresh(db_attempt)
-    return db_attempt
-
 def get_quiz_attempt(db: Session, attempt_id: int):
     """Get quiz attempt by ID"""
     return db.query(models.QuizAttempt).filter(
         models.QuizAttempt.id == attempt_id
     ).first()
 
-def submit_quiz_attempt(db: Session, attempt_id: int, answers: List[dict]):
-    """Submit quiz attempt with answers"""
-    attempt = db.query(models.QuizAttempt).filter(
-        models.QuizAttempt.id == attempt_id
-    ).first()
-    
-    if not attempt:
-        return None
-    
-    # Calculate score by checking answers
-    correct_count = 0
-    total_questions = 0
-    total_points = 0
-    earned_points = 0
-    
-    for answer_data in answers:
-        question_id = answer_data["question_id"]
-        selected_answer = answer_data["selected_answer"]
-        
-        # Get the question with its options
-        question = db.query(models.Question).filter(
-            models.Question.id == question_id
-        ).first()
-        
-        if question:
-            total_questions += 1
-            total_points += question.points
-            
-            # Check if selected answer matches any correct option
-            for option in question.options:
-                if option.is_correct and option.option_text == selected_answer:
-                    correct_count += 1
-                    earned_points += question.points
-                    break
-    
-    # Calculate scores
-    max_score = float(total_points) if total_points > 0 else 1.0
-    score = float(earned_points)
-    percentage = (score / max_score * 100) if max_score > 0 else 0.0
-    
-    # Get quiz passing score
-    quiz = get_quiz_by_id(db, attempt.quiz_id)
-    passing_score = quiz.passing_score if quiz and quiz.passing_score else 70.0
-    is_passed = percentage >= passing_score
-    
-    # Update attempt with results
-    attempt.score = score
-    attempt.max_score = max_score
-    attempt.percentage = percentage
-    attempt.is_passed = is_passed
-    attempt.completed_at = datetime.now(timezone.utc)
-    
-    db.commit()
-    
-    return {
-        "score": percentage,
-        "correct": correct_count,
-        "total": total_questions,
-        "passed": is_passed
-    }
-
-def get_user_quiz_history(db: Session, user_id: int):
-    """Get user's quiz attempt history"""
-    return db.query(models.QuizAttempt).filter(
-        models.QuizAttempt.user_id == user_id
-    ).order_by(models.QuizAttempt.completed_at.desc()).all()
-
 def get_user_specialization_scores(db: Session, user_id: int):
     """Get user's average scores by specialization"""
     # This would require a more complex query to join attempts with quizzes and specializations
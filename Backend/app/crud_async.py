@@ -0,0 +1,241 @@
+"""
+Async CRUD operations for database
+Mirrors crud.py for endpoints that use an AsyncSession; relationships are
+loaded eagerly because lazy loading is not available under asyncio. Quiz
+attempts (start, submit, history) are only implemented here
+"""
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from . import models_hierarchical as models
+from . import grading, passwords
+from .write_behind import attempt_writer, attempt_row
+from .crud import quiz_summary_statement
+from .pagination import keyset_window, split_page, DEFAULT_PAGE_SIZE
+from typing import List
+from datetime import datetime, timezone
+
+# USER OPERATIONS
+async def create_user(db: AsyncSession, email: str, password: str, name: str):
+    """Create a new user"""
+    db_user = models.User(
+        email=email,
+        password_hash=await passwords.hash_password(password),
+        name=name
+    )
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+async def get_user_by_email(db: AsyncSession, email: str):
+    """Get user by email"""
+    result = await db.execute(select(models.User).where(models.User.email == email))
+    return result.scalars().first()
+
+async def get_user_by_id(db: AsyncSession, user_id: int):
+    """Get user by ID"""
+    return await db.get(models.User, user_id)
+
+async def update_password_hash(db: AsyncSession, user: models.User, password_hash: str):
+    """Replace a stored password hash (plaintext or outdated parameters)"""
+    user.password_hash = password_hash
+    await db.commit()
+
+async def update_user_specialization(db: AsyncSession, user_id: int, specialization_id: int):
+    """Update user's specialization"""
+    user = await db.get(models.User, user_id)
+    if user:
+        user.preferred_specialization_id = specialization_id
+        await db.commit()
+        await db.refresh(user)
+    return user
+
+# SECTOR AND SPECIALIZATION OPERATIONS
+async def get_all_sectors(db: AsyncSession):
+    """Get all sectors"""
+    result = await db.execute(select(models.Sector))
+    return result.scalars().all()
+
+async def get_specializations_by_sector(db: AsyncSession, sector_id: int):
+    """Get all specializations for a sector (through branches)"""
+    result = await db.execute(
+        select(models.Specialization).join(models.Branch).where(
+            models.Branch.sector_id == sector_id
+        )
+    )
+    return result.scalars().all()
+
+async def get_branches_by_sector(db: AsyncSession, sector_id: int):
+    """Get all branches for a sector"""
+    result = await db.execute(
+        select(models.Branch).where(models.Branch.sector_id == sector_id)
+    )
+    return result.scalars().all()
+
+async def get_specializations_by_branch(db: AsyncSession, branch_id: int):
+    """Get all specializations for a branch"""
+    result = await db.execute(
+        select(models.Specialization).where(models.Specialization.branch_id == branch_id)
+    )
+    return result.scalars().all()
+
+async def get_specialization_by_name(db: AsyncSession, name: str):
+    """Get specialization by name"""
+    result = await db.execute(
+        select(models.Specialization).where(models.Specialization.name == name)
+    )
+    return result.scalars().first()
+
+# QUIZ OPERATIONS
+async def get_all_quizzes(db: AsyncSession, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    """
+    Get a page of quizzes as (rows, next_cursor)
+    Each row is (quiz, specialization_name, question_count)
+    """
+    statement = keyset_window(quiz_summary_statement(), [models.Quiz.id], cursor, limit)
+    result = await db.execute(statement)
+    return split_page(result.all(), key=lambda row: (row[0].id,), limit=limit)
+
+async def get_quiz_by_id(db: AsyncSession, quiz_id: int):
+    """Get quiz by ID"""
+    return await db.get(models.Quiz, quiz_id)
+
+async def get_quizzes_by_specialization(db: AsyncSession, specialization_id: int):
+    """
+    Get all quizzes for a specialization
+    Each row is (quiz, specialization_name, question_count)
+    """
+    result = await db.execute(
+        quiz_summary_statement().where(
+            models.Quiz.specialization_id == specialization_id
+        ).order_by(models.Quiz.id)
+    )
+    return result.all()
+
+async def get_quiz_questions(db: AsyncSession, quiz_id: int):
+    """Get all questions for a quiz with their answer options"""
+    result = await db.execute(
+        select(models.Question).options(
+            selectinload(models.Question.options)
+        ).where(
+            models.Question.quiz_id == quiz_id
+        ).order_by(models.Question.order_index)
+    )
+    return result.scalars().all()
+
+async def get_quiz_with_questions(db: AsyncSession, quiz_id: int):
+    """
+    Get a quiz with its questions and their options in one statement
+    Returns (quiz, [(question, [options])]) ordered by order_index, or (None, [])
+    """
+    result = await db.execute(
+        select(models.Quiz, models.Question, models.QuestionOption).outerjoin(
+            models.Question, models.Question.quiz_id == models.Quiz.id
+        ).outerjoin(
+            models.QuestionOption, models.QuestionOption.question_id == models.Question.id
+        ).where(
+            models.Quiz.id == quiz_id
+        ).order_by(
+            models.Question.order_index, models.Question.id,
+            models.QuestionOption.order_index, models.QuestionOption.id
+        )
+    )
+    rows = result.all()
+    if not rows:
+        return None, []
+
+    questions = []
+    options_by_question = {}
+    for _, question, option in rows:
+        if question is None:
+            continue
+        options = options_by_question.get(question.id)
+        if options is None:
+            options = []
+            options_by_question[question.id] = options
+            questions.append((question, options))
+        if option is not None:
+            options.append(option)
+
+    return rows[0][0], questions
+
+# QUIZ ATTEMPT OPERATIONS
+async def create_quiz_attempt(db: AsyncSession, user_id: int, quiz_id: int):
+    """Create a new quiz attempt; queued for a batched insert when write-behind is on"""
+    row = attempt_row(user_id, quiz_id)
+    if attempt_writer.active:
+        row["id"] = await attempt_writer.reserve_id()
+        if attempt_writer.buffer(row):
+            # Not attached to the session: the writer inserts it
+            return models.QuizAttempt(**row)
+
+    # Synchronous path: write-behind off, its last flush failed or its queue full
+    db_attempt = models.QuizAttempt(**row)
+    db.add(db_attempt)
+    await db.commit()
+    return db_attempt
+
+async def get_quiz_attempt(db: AsyncSession, attempt_id: int):
+    """Get quiz attempt by ID"""
+    return await db.get(models.QuizAttempt, attempt_id)
+
+async def submit_quiz_attempt(db: AsyncSession, attempt_id: int, user_id: int, answers: List[dict]):
+    """Submit quiz attempt with answers; None if the attempt does not exist or belongs to someone else"""
+    # Written first if it is queued on this worker; a miss is final, not retried after a flush
+    await attempt_writer.wait_written(attempt_id)
+    quiz_id = await db.scalar(
+        select(models.QuizAttempt.quiz_id).where(
+            models.QuizAttempt.id == attempt_id, models.QuizAttempt.user_id == user_id
+        )
+    )
+
+    if quiz_id is None:
+        return None
+
+    answer_key = await grading.get_answer_key_async(db, quiz_id)
+    result = grading.grade_answers(answer_key, answers)
+
+    await db.execute(
+        update(models.QuizAttempt).where(
+            models.QuizAttempt.id == attempt_id
+        ).values(
+            score=result["score"],
+            max_score=result["max_score"],
+            percentage=result["percentage"],
+            is_passed=result["passed"],
+            completed_at=datetime.now(timezone.utc)
+        ).execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+    return {
+        "score": result["percentage"],
+        "correct": result["correct"],
+        "total": result["total"],
+        "passed": result["passed"]
+    }
+
+async def get_user_quiz_history(db: AsyncSession, user_id: int, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    """Get a page of user's quiz attempt history, newest first, as (attempts, next_cursor)"""
+    statement = keyset_window(
+        select(models.QuizAttempt).where(models.QuizAttempt.user_id == user_id),
+        [models.QuizAttempt.completed_at, models.QuizAttempt.id],
+        cursor, limit, descending=True
+    )
+    result = await db.execute(statement)
+    return split_page(result.scalars().all(),
+                      key=lambda attempt: (attempt.completed_at, attempt.id), limit=limit)
+
+async def get_user_specialization_scores(db: AsyncSession, user_id: int):
+    """Get user's average scores by specialization"""
+    user = await get_user_by_id(db, user_id)
+    if user:
+        return {
+            "readiness_score": user.readiness_score,
+            "technical_score": user.technical_score,
+            "soft_skills_score": user.soft_skills_score,
+            "leadership_score": user.leadership_score
+        }
+    return None
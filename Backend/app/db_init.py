@@ -5,16 +5,21 @@ Loads data from JSON files in the data/ directory
 """
 import sys
 import os
+import hashlib
 import json
+import time
 from pathlib import Path
 
 # Get the path to the data directory
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
+CONTENT_FILES = [DATA_DIR / "sectors.json", DATA_DIR / "quizzes.json"]
+CONTENT_HASH_KEY = "content_hash"
 
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 from .database import SessionLocal
-from .models_hierarchical import Sector, Branch, Specialization, Quiz, Question, QuestionOption
+from .models_hierarchical import Sector, Branch, Specialization, Quiz, Question, QuestionOption, AppMetadata
 
 def load_sectors_from_json():
     """Load sectors data from JSON file"""
@@ -38,19 +43,246 @@ def load_quizzes_from_json():
         data = json.load(f)
         return data.get("quizzes", [])
 
+def _insert_returning_ids(db: Session, model, rows):
+    """Multi-row INSERT ... RETURNING id, with ids in the same order as rows"""
+    if not rows:
+        return []
+    result = db.execute(
+        insert(model).returning(model.id, sort_by_parameter_order=True),
+        rows
+    )
+    return [row.id for row in result]
+
+def _insert_quiz_questions(db: Session, quiz_ids, quizzes_data):
+    """Insert questions and options for freshly inserted quizzes; returns (questions, options) counts"""
+    questions_data = []
+    question_rows = []
+    for quiz_id, quiz_data in zip(quiz_ids, quizzes_data):
+        for idx, q_data in enumerate(quiz_data.get("questions", [])):
+            questions_data.append(q_data)
+            question_rows.append({
+                "quiz_id": quiz_id,
+                "question_text": q_data["question_text"],
+                "question_type": q_data["question_type"],
+                "points": q_data.get("points", 1),
+                "order_index": idx + 1,
+                "explanation": q_data.get("explanation")
+            })
+    question_ids = _insert_returning_ids(db, Question, question_rows)
+    
+    option_rows = []
+    for question_id, q_data in zip(question_ids, questions_data):
+        for opt_idx, option_data in enumerate(q_data.get("options", [])):
+            option_rows.append({
+                "question_id": question_id,
+                "option_text": option_data["text"],
+                "is_correct": option_data["is_correct"],
+                "order_index": opt_idx + 1
+            })
+    if option_rows:
+        db.execute(insert(QuestionOption), option_rows)
+    
+    return len(question_ids), len(option_rows)
+
+def bulk_populate(db: Session, sectors_data, quizzes_data):
+    """
+    Insert the whole sectors/quizzes tree with one multi-row INSERT per table
+    Runs inside the caller's transaction; returns the number of rows per table
+    """
+    # Sectors -> branches -> specializations, one statement per level
+    sector_ids = _insert_returning_ids(db, Sector, [
+        {"name": sector_data["name"], "description": sector_data["description"]}
+        for sector_data in sectors_data
+    ])
+    
+    branches_data = []
+    branch_rows = []
+    for sector_id, sector_data in zip(sector_ids, sectors_data):
+        for branch_data in sector_data.get("branches", []):
+            branches_data.append(branch_data)
+            branch_rows.append({
+                "name": branch_data["name"],
+                "description": branch_data["description"],
+                "sector_id": sector_id
+            })
+    branch_ids = _insert_returning_ids(db, Branch, branch_rows)
+    
+    spec_rows = []
+    for branch_id, branch_data in zip(branch_ids, branches_data):
+        for spec_data in branch_data.get("specializations", []):
+            spec_rows.append({
+                "name": spec_data["name"],
+                "description": spec_data["description"],
+                "branch_id": branch_id
+            })
+    spec_ids = _insert_returning_ids(db, Specialization, spec_rows)
+    
+    # Quizzes reference specializations by name; the first one with that name wins
+    spec_ids_by_name = {}
+    for spec_id, spec_row in zip(spec_ids, spec_rows):
+        spec_ids_by_name.setdefault(spec_row["name"], spec_id)
+    
+    loaded_quizzes = []
+    quiz_rows = []
+    for quiz_data in quizzes_data:
+        specialization_id = spec_ids_by_name.get(quiz_data["specialization"])
+        if not specialization_id:
+            print(f"⚠️  Specialization '{quiz_data['specialization']}' not found. Skipping quiz: {quiz_data['title']}")
+            continue
+        loaded_quizzes.append(quiz_data)
+        quiz_rows.append({
+            "title": quiz_data["title"],
+            "description": quiz_data["description"],
+            "specialization_id": specialization_id,
+            "difficulty_level": quiz_data["difficulty_level"],
+            "time_limit_minutes": quiz_data["time_limit_minutes"],
+            "passing_score": quiz_data["passing_score"]
+        })
+    quiz_ids = _insert_returning_ids(db, Quiz, quiz_rows)
+    
+    question_count, option_count = _insert_quiz_questions(db, quiz_ids, loaded_quizzes)
+    
+    return {
+        "sectors": len(sector_ids),
+        "branches": len(branch_ids),
+        "specializations": len(spec_ids),
+        "quizzes": len(quiz_ids),
+        "questions": question_count,
+        "question_options": option_count
+    }
+
+def compute_content_hash():
+    """SHA-256 over the JSON files that define the catalog"""
+    digest = hashlib.sha256()
+    for path in CONTENT_FILES:
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes() if path.exists() else b"<missing>")
+    return digest.hexdigest()
+
+def get_stored_content_hash(db: Session):
+    """Content hash recorded by the last successful sync, if any"""
+    row = db.get(AppMetadata, CONTENT_HASH_KEY)
+    return row.value if row else None
+
+def store_content_hash(db: Session, content_hash: str):
+    """Record the content hash in the caller's transaction"""
+    row = db.get(AppMetadata, CONTENT_HASH_KEY)
+    if row:
+        row.value = content_hash
+    else:
+        db.add(AppMetadata(key=CONTENT_HASH_KEY, value=content_hash))
+
+def sync_content(db: Session, sectors_data, quizzes_data):
+    """
+    Upsert the JSON catalog into a populated database, keyed on natural keys:
+    sector name, branch name + sector, specialization name + branch,
+    quiz title + specialization. Existing keys are read with one query per table;
+    only new or changed rows are written. Questions of existing quizzes are left alone.
+    Returns counts of inserted and updated rows per table
+    """
+    counts = {}
+    
+    def apply(model, table, new_rows, changed_rows):
+        ids = _insert_returning_ids(db, model, new_rows)
+        if changed_rows:
+            db.execute(update(model), changed_rows)
+        counts[table] = (len(new_rows), len(changed_rows))
+        return ids
+    
+    # Sectors
+    existing = {name: (sector_id, description) for sector_id, name, description in
+                db.query(Sector.id, Sector.name, Sector.description)}
+    new_rows, changed_rows = [], []
+    for sector_data in sectors_data:
+        found = existing.get(sector_data["name"])
+        if not found:
+            new_rows.append({"name": sector_data["name"], "description": sector_data["description"]})
+        elif found[1] != sector_data["description"]:
+            changed_rows.append({"id": found[0], "description": sector_data["description"]})
+    new_ids = apply(Sector, "sectors", new_rows, changed_rows)
+    sector_ids = {name: found[0] for name, found in existing.items()}
+    sector_ids.update((row["name"], new_id) for row, new_id in zip(new_rows, new_ids))
+    
+    # Branches
+    existing = {(sector_id, name): (branch_id, description) for branch_id, sector_id, name, description in
+                db.query(Branch.id, Branch.sector_id, Branch.name, Branch.description)}
+    new_rows, changed_rows = [], []
+    for sector_data in sectors_data:
+        sector_id = sector_ids[sector_data["name"]]
+        for branch_data in sector_data.get("branches", []):
+            found = existing.get((sector_id, branch_data["name"]))
+            if not found:
+                new_rows.append({"name": branch_data["name"], "description": branch_data["description"],
+                                 "sector_id": sector_id})
+            elif found[1] != branch_data["description"]:
+                changed_rows.append({"id": found[0], "description": branch_data["description"]})
+    new_ids = apply(Branch, "branches", new_rows, changed_rows)
+    branch_ids = {key: found[0] for key, found in existing.items()}
+    branch_ids.update(((row["sector_id"], row["name"]), new_id) for row, new_id in zip(new_rows, new_ids))
+    
+    # Specializations
+    existing = {(branch_id, name): (spec_id, description) for spec_id, branch_id, name, description in
+                db.query(Specialization.id, Specialization.branch_id, Specialization.name, Specialization.description)}
+    new_rows, changed_rows = [], []
+    for sector_data in sectors_data:
+        sector_id = sector_ids[sector_data["name"]]
+        for branch_data in sector_data.get("branches", []):
+            branch_id = branch_ids[(sector_id, branch_data["name"])]
+            for spec_data in branch_data.get("specializations", []):
+                found = existing.get((branch_id, spec_data["name"]))
+                if not found:
+                    new_rows.append({"name": spec_data["name"], "description": spec_data["description"],
+                                     "branch_id": branch_id})
+                elif found[1] != spec_data["description"]:
+                    changed_rows.append({"id": found[0], "description": spec_data["description"]})
+    apply(Specialization, "specializations", new_rows, changed_rows)
+    
+    # Quizzes reference specializations by name; the lowest id with that name wins
+    spec_ids_by_name = {}
+    for spec_id, name in db.query(Specialization.id, Specialization.name).order_by(Specialization.id):
+        spec_ids_by_name.setdefault(name, spec_id)
+    
+    quiz_fields = ("description", "difficulty_level", "time_limit_minutes", "passing_score")
+    existing = {(row.specialization_id, row.title): row for row in
+                db.query(Quiz.id, Quiz.specialization_id, Quiz.title, *[getattr(Quiz, f) for f in quiz_fields])}
+    new_quizzes, new_rows, changed_rows = [], [], []
+    for quiz_data in quizzes_data:
+        specialization_id = spec_ids_by_name.get(quiz_data["specialization"])
+        if not specialization_id:
+            continue
+        found = existing.get((specialization_id, quiz_data["title"]))
+        values = {field: quiz_data[field] for field in quiz_fields}
+        if not found:
+            new_quizzes.append(quiz_data)
+            new_rows.append({"title": quiz_data["title"], "specialization_id": specialization_id, **values})
+        elif any(getattr(found, field) != value for field, value in values.items()):
+            changed_rows.append({"id": found.id, **values})
+    new_ids = apply(Quiz, "quizzes", new_rows, changed_rows)
+    question_count, option_count = _insert_quiz_questions(db, new_ids, new_quizzes)
+    counts["questions"] = (question_count, 0)
+    counts["question_options"] = (option_count, 0)
+    
+    return counts
+
 def auto_populate_if_empty():
     """
     Automatically populate database with required data if tables are empty
     Loads data from JSON files in the data/ directory
     This ensures the app always has basic data to work with
+    Skips all work when the JSON content hash matches the last successful sync
     """
     db = SessionLocal()
     try:
+        content_hash = compute_content_hash()
+        if get_stored_content_hash(db) == content_hash:
+            print(f"✅ Content unchanged (hash {content_hash[:12]}) - skipping sync")
+            return
+        
         # Check if any sectors exist
         sector_count = db.query(Sector).count()
         
         if sector_count == 0:
-            print("📊 Database is empty. Auto-populating from JSON files...")
+            print("📊 Database is empty. Bulk-loading from JSON files...")
             
             # Load sectors from JSON
             sectors_data = load_sectors_from_json()
@@ -58,224 +290,40 @@ def auto_populate_if_empty():
                 print("❌ Could not load sectors from JSON. Using fallback data.")
                 return
             
-            print(f"📂 Loading {len(sectors_data)} sector(s) from JSON...")
-            
-            # Process each sector from JSON
-            for sector_data in sectors_data:
-                # Create sector
-                sector = Sector(
-                    name=sector_data["name"],
-                    description=sector_data["description"]
-                )
-                db.add(sector)
-                db.commit()
-                db.refresh(sector)
-                print(f"✅ Created sector: {sector.name}")
-                
-                # Process branches for this sector
-                for branch_data in sector_data.get("branches", []):
-                    branch = Branch(
-                        name=branch_data["name"],
-                        description=branch_data["description"],
-                        sector_id=sector.id
-                    )
-                    db.add(branch)
-                    db.commit()
-                    db.refresh(branch)
-                    print(f"  ✅ Created branch: {branch.name}")
-                    
-                    # Process specializations for this branch
-                    for spec_data in branch_data.get("specializations", []):
-                        specialization = Specialization(
-                            name=spec_data["name"],
-                            description=spec_data["description"],
-                            branch_id=branch.id
-                        )
-                        db.add(specialization)
-                    db.commit()
-                    print(f"    ✅ Added {len(branch_data.get('specializations', []))} specializations")
-            
-            print("✅ Created all sectors, branches, and specializations from JSON")
+            quizzes_data = load_quizzes_from_json()
+            if not quizzes_data:
+                print("⚠️  Could not load quizzes from JSON")
             
-            # Now load quizzes from JSON
-            quiz_count = db.query(Quiz).count()
-            if quiz_count == 0:
-                print("📝 Loading quizzes from JSON...")
-                
-                quizzes_data = load_quizzes_from_json()
-                if quizzes_data:
-                    for quiz_data in quizzes_data:
-                        # Find specialization by name
-                        specialization = db.query(Specialization).filter(
-                            Specialization.name == quiz_data["specialization"]
-                        ).first()
-                        
-                        if not specialization:
-                            print(f"⚠️  Specialization '{quiz_data['specialization']}' not found. Skipping quiz: {quiz_data['title']}")
-                            continue
-                        
-                        # Check if quiz already exists
-                        existing_quiz = db.query(Quiz).filter(
-                            Quiz.title == quiz_data["title"],
-                            Quiz.specialization_id == specialization.id
-                        ).first()
-                        
-                        if existing_quiz:
-                            continue
-                        
-                        # Create quiz
-                        quiz = Quiz(
-                            title=quiz_data["title"],
-                            description=quiz_data["description"],
-                            specialization_id=specialization.id,
-                            difficulty_level=quiz_data["difficulty_level"],
-                            time_limit_minutes=quiz_data["time_limit_minutes"],
-                            passing_score=quiz_data["passing_score"]
-                        )
-                        db.add(quiz)
-                        db.commit()
-                        db.refresh(quiz)
-                        print(f"  ✅ Created quiz: {quiz.title}")
-                        
-                        # Create questions and options
-                        for idx, q_data in enumerate(quiz_data.get("questions", [])):
-                            question = Question(
-                                quiz_id=quiz.id,
-                                question_text=q_data["question_text"],
-                                question_type=q_data["question_type"],
-                                points=q_data.get("points", 1),
-                                order_index=idx + 1,
-                                explanation=q_data.get("explanation")
-                            )
-                            db.add(question)
-                            db.flush()
-                            
-                            for opt_idx, option_data in enumerate(q_data.get("options", [])):
-                                option = QuestionOption(
-                                    question_id=question.id,
-                                    option_text=option_data["text"],
-                                    is_correct=option_data["is_correct"],
-                                    order_index=opt_idx + 1
-                                )
-                                db.add(option)
-                        
-                        db.commit()
-                        print(f"    ✅ Added {len(quiz_data.get('questions', []))} questions")
-                    
-                    print("✅ Created all quizzes from JSON")
-                else:
-                    print("⚠️  Could not load quizzes from JSON")
+            start = time.perf_counter()
+            counts = bulk_populate(db, sectors_data, quizzes_data or [])
+            store_content_hash(db, content_hash)
+            db.commit()
+            elapsed = time.perf_counter() - start
             
+            total_rows = sum(counts.values())
+            print(f"✅ Loaded {total_rows} rows in {elapsed:.2f}s "
+                  f"({total_rows / elapsed if elapsed else total_rows:.0f} rows/s): "
+                  + ", ".join(f"{count} {table}" for table, count in counts.items()))
             print("✅ Auto-population complete from JSON files!")
             
         else:
-            # Database has sectors, check if we need to add more sectors or quizzes
-            # Load sectors from JSON and add any missing ones
+            # Database has sectors - upsert whatever changed in the JSON files
+            print("📊 Content changed since last sync. Applying changes from JSON files...")
             sectors_data = load_sectors_from_json()
-            if sectors_data:
-                added_sectors = 0
-                for sector_data in sectors_data:
-                    existing_sector = db.query(Sector).filter(Sector.name == sector_data["name"]).first()
-                    
-                    if not existing_sector:
-                        # Create missing sector
-                        sector = Sector(
-                            name=sector_data["name"],
-                            description=sector_data["description"]
-                        )
-                        db.add(sector)
-                        db.commit()
-                        db.refresh(sector)
-                        print(f"✅ Added missing sector: {sector.name}")
-                        added_sectors += 1
-                        
-                        # Add branches and specializations for new sector
-                        for branch_data in sector_data.get("branches", []):
-                            branch = Branch(
-                                name=branch_data["name"],
-                                description=branch_data["description"],
-                                sector_id=sector.id
-                            )
-                            db.add(branch)
-                            db.commit()
-                            db.refresh(branch)
-                            
-                            for spec_data in branch_data.get("specializations", []):
-                                specialization = Specialization(
-                                    name=spec_data["name"],
-                                    description=spec_data["description"],
-                                    branch_id=branch.id
-                                )
-                                db.add(specialization)
-                            db.commit()
-                
-                if added_sectors > 0:
-                    print(f"📊 Added {added_sectors} new sector(s) from JSON")
+            quizzes_data = load_quizzes_from_json()
+            if sectors_data is None or quizzes_data is None:
+                print("⚠️  Could not load JSON content - skipping sync")
+                return
             
-            quiz_count = db.query(Quiz).count()
+            start = time.perf_counter()
+            counts = sync_content(db, sectors_data, quizzes_data)
+            store_content_hash(db, content_hash)
+            db.commit()
+            elapsed = time.perf_counter() - start
             
-            # Try to load additional quizzes from JSON that might not exist
-            quizzes_data = load_quizzes_from_json()
-            if quizzes_data:
-                added_count = 0
-                for quiz_data in quizzes_data:
-                    specialization = db.query(Specialization).filter(
-                        Specialization.name == quiz_data["specialization"]
-                    ).first()
-                    
-                    if not specialization:
-                        continue
-                    
-                    existing_quiz = db.query(Quiz).filter(
-                        Quiz.title == quiz_data["title"],
-                        Quiz.specialization_id == specialization.id
-                    ).first()
-                    
-                    if not existing_quiz:
-                        # Create missing quiz
-                        quiz = Quiz(
-                            title=quiz_data["title"],
-                            description=quiz_data["description"],
-                            specialization_id=specialization.id,
-                            difficulty_level=quiz_data["difficulty_level"],
-                            time_limit_minutes=quiz_data["time_limit_minutes"],
-                            passing_score=quiz_data["passing_score"]
-                        )
-                        db.add(quiz)
-                        db.commit()
-                        db.refresh(quiz)
-                        
-                        # Add questions
-                        for idx, q_data in enumerate(quiz_data.get("questions", [])):
-                            question = Question(
-                                quiz_id=quiz.id,
-                                question_text=q_data["question_text"],
-                                question_type=q_data["question_type"],
-                                points=q_data.get("points", 1),
-                                order_index=idx + 1,
-                                explanation=q_data.get("explanation")
-                            )
-                            db.add(question)
-                            db.flush()
-                            
-                            for opt_idx, option_data in enumerate(q_data.get("options", [])):
-                                option = QuestionOption(
-                                    question_id=question.id,
-                                    option_text=option_data["text"],
-                                    is_correct=option_data["is_correct"],
-                                    order_index=opt_idx + 1
-                                )
-                                db.add(option)
-                        
-                        db.commit()
-                        added_count += 1
-                
-                if added_count > 0:
-                    print(f"📝 Added {added_count} new quiz(zes) from JSON")
-                else:
-                    print(f"✅ Database already populated: {sector_count} sectors, {quiz_count} quizzes")
-            else:
-                print(f"✅ Database already populated: {sector_count} sectors, {quiz_count} quizzes")
+            print(f"✅ Content synced in {elapsed:.2f}s: "
+                  + ", ".join(f"{table} +{inserted}/~{updated}"
+                              for table, (inserted, updated) in counts.items()))
                     
     except Exception as e:
         print(f"⚠️  Auto-population error: {e}")
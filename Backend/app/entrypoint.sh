@@ -13,11 +13,22 @@ done
 
 echo "✅ Database is ready!"
 
+# Bring the schema up to date (alembic migrations)
+echo "📊 Migrating database schema..."
+python3 -m app.migrate
+
 # Run database population
 echo "📊 Running database population..."
 python3 -c "from app.db_init import auto_populate_if_empty; auto_populate_if_empty()"
 
 # Start FastAPI server
-echo "🚀 Starting FastAPI server..."
-exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
+# APP_ENV=production: gunicorn with one uvicorn worker per CPU (see app/gunicorn_conf.py)
+# anything else: single uvicorn process with auto-reload for development
+if [ "${APP_ENV:-development}" = "production" ]; then
+  echo "🚀 Starting FastAPI server (production)..."
+  exec gunicorn app.main:app -c python:app.gunicorn_conf
+else
+  echo "🚀 Starting FastAPI server (development, auto-reload)..."
+  exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
+fi
 
@@ -0,0 +1,208 @@
+"""
+Grading engine for quiz attempts
+Each quiz's answer key is compiled once into an immutable, compact layout and
+kept in an LRU cache, so grading a hot quiz never touches the ORM. Keys are
+recompiled after CATALOG_CACHE_TTL seconds, so edits made on another worker
+are picked up within the same bound as the catalog caches
+"""
+import os
+import time
+from array import array
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from . import models_hierarchical as models
+from .cache import CATALOG_CACHE_TTL, LRUCache, on_quiz_content_changed, quiz_content_changed
+from typing import List
+
+DEFAULT_PASSING_SCORE = 70.0
+
+# Maximum number of compiled answer keys kept in memory
+ANSWER_KEY_CACHE_SIZE = int(os.getenv("ANSWER_KEY_CACHE_SIZE", "512"))
+
+
+class CompiledAnswerKey:
+    """
+    Immutable answer key for one quiz
+    Questions are numbered into slots; options are numbered across the whole quiz
+    so the correct answers form a single integer bitset
+    """
+    __slots__ = ("quiz_id", "passing_score", "slots", "points", "option_bits", "correct_bits")
+
+    def __init__(self, quiz_id, passing_score, slots, points, option_bits, correct_bits):
+        self.quiz_id = quiz_id
+        self.passing_score = passing_score
+        self.slots = slots              # question_id -> slot
+        self.points = points            # array of points per slot
+        self.option_bits = option_bits  # per slot: option_text -> bit number
+        self.correct_bits = correct_bits
+
+
+def answer_key_statement(quiz_id: int):
+    """SELECT for a quiz's passing score, questions and options in grading order"""
+    return select(
+        models.Quiz.passing_score,
+        models.Question.id,
+        models.Question.points,
+        models.QuestionOption.option_text,
+        models.QuestionOption.is_correct
+    ).outerjoin(
+        models.Question, models.Question.quiz_id == models.Quiz.id
+    ).outerjoin(
+        models.QuestionOption, models.QuestionOption.question_id == models.Question.id
+    ).where(
+        models.Quiz.id == quiz_id
+    ).order_by(
+        models.Question.order_index, models.Question.id,
+        models.QuestionOption.order_index, models.QuestionOption.id
+    )
+
+
+def build_answer_key(quiz_id: int, rows):
+    """Compile the rows of answer_key_statement into a CompiledAnswerKey"""
+    passing_score = (rows[0][0] if rows else None) or DEFAULT_PASSING_SCORE
+    slots = {}
+    points = array("l")
+    option_bits = []
+    correct_bits = 0
+    bit = 0
+
+    for _, question_id, question_points, option_text, is_correct in rows:
+        if question_id is None:
+            continue
+        slot = slots.get(question_id)
+        if slot is None:
+            slot = len(points)
+            slots[question_id] = slot
+            points.append(question_points or 0)
+            option_bits.append({})
+        if option_text is None:
+            continue
+
+        texts = option_bits[slot]
+        # Duplicate texts grade as correct if any of them is correct
+        if option_text not in texts or is_correct:
+            texts[option_text] = bit
+        if is_correct:
+            correct_bits |= 1 << bit
+        bit += 1
+
+    return CompiledAnswerKey(
+        quiz_id, passing_score, slots, points, tuple(option_bits), correct_bits
+    )
+
+
+# quiz_id -> (compiled_at, CompiledAnswerKey)
+_answer_keys = LRUCache(ANSWER_KEY_CACHE_SIZE)
+
+
+def _cached_answer_key(quiz_id: int):
+    entry = _answer_keys.get(quiz_id)
+    if entry is None or (CATALOG_CACHE_TTL and time.monotonic() - entry[0] >= CATALOG_CACHE_TTL):
+        return None
+    return entry[1]
+
+
+def get_answer_key(db: Session, quiz_id: int):
+    """Compiled answer key for a quiz, compiling it on a cache miss"""
+    key = _cached_answer_key(quiz_id)
+    if key is None:
+        generation = _answer_keys.generation
+        key = build_answer_key(quiz_id, db.execute(answer_key_statement(quiz_id)).all())
+        # Skipped if the quiz changed while it was compiling; the next call recompiles
+        _answer_keys.put(quiz_id, (time.monotonic(), key), generation)
+    return key
+
+
+async def get_answer_key_async(db: AsyncSession, quiz_id: int):
+    """AsyncSession variant of get_answer_key"""
+    key = _cached_answer_key(quiz_id)
+    if key is None:
+        generation = _answer_keys.generation
+        result = await db.execute(answer_key_statement(quiz_id))
+        key = build_answer_key(quiz_id, result.all())
+        _answer_keys.put(quiz_id, (time.monotonic(), key), generation)
+    return key
+
+
+@on_quiz_content_changed
+def invalidate_answer_key(quiz_id: int = None):
+    """Drop one quiz's compiled key, or all of them"""
+    if quiz_id is None:
+        _answer_keys.clear()
+    else:
+        _answer_keys.pop(quiz_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_changed_quizzes(session, flush_context):
+    """Note quizzes whose content this transaction changes; caches are told once it commits"""
+    changed = session.info.setdefault("changed_quizzes", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, models.Quiz):
+            changed.add(obj.id)
+        elif isinstance(obj, models.Question):
+            changed.add(obj.quiz_id)
+        elif isinstance(obj, models.QuestionOption):
+            # Resolving the owning quiz would need a query; option edits are rare
+            changed.add(None)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_quizzes(session):
+    """
+    Keep quiz caches in step with committed ORM writes to quizzes, questions and options
+    Invalidating at flush time would let a concurrent load read the old rows under
+    the new cache generation and keep them until the TTL
+    """
+    changed = session.info.pop("changed_quizzes", None)
+    if not changed:
+        return
+    if None in changed:
+        quiz_content_changed()
+        return
+    for quiz_id in changed:
+        quiz_content_changed(quiz_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_quizzes(session):
+    session.info.pop("changed_quizzes", None)
+
+
+def grade_answers(answer_key: CompiledAnswerKey, answers: List[dict]):
+    """Grade a list of {question_id, selected_answer} answers against a compiled key"""
+    slots = answer_key.slots
+    points = answer_key.points
+    option_bits = answer_key.option_bits
+    correct_bits = answer_key.correct_bits
+
+    correct_count = 0
+    total_questions = 0
+    total_points = 0
+    earned_points = 0
+
+    for answer_data in answers:
+        slot = slots.get(answer_data["question_id"])
+        if slot is None:
+            continue
+
+        total_questions += 1
+        total_points += points[slot]
+        bit = option_bits[slot].get(answer_data["selected_answer"])
+        if bit is not None and correct_bits >> bit & 1:
+            correct_count += 1
+            earned_points += points[slot]
+
+    max_score = float(total_points) if total_points > 0 else 1.0
+    score = float(earned_points)
+    percentage = (score / max_score * 100) if max_score > 0 else 0.0
+
+    return {
+        "score": score,
+        "max_score": max_score,
+        "percentage": percentage,
+        "correct": correct_count,
+        "total": total_questions,
+        "passed": percentage >= answer_key.passing_score
+    }
@@ -0,0 +1,46 @@
+"""
+Gunicorn settings for production
+Run with: gunicorn app.main:app -c python:app.gunicorn_conf
+Every value can be overridden through the environment
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+
+# One uvicorn worker per CPU: each runs an event loop plus a threadpool for sync
+# endpoints. Every worker has its own connection pools; exported so app.database
+# can split DB_CONNECTION_BUDGET between them (and refuse pool sizes that exceed it)
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count())))
+os.environ["WEB_CONCURRENCY"] = str(workers)
+worker_class = "app.workers.ProductionUvicornWorker"
+
+# Pending connections the kernel queues while all workers are busy
+backlog = int(os.getenv("BACKLOG", "2048"))
+
+# Seconds an idle keep-alive connection stays open; behind a load balancer, set
+# it above the balancer's idle timeout so the balancer closes connections first
+keepalive = int(os.getenv("KEEPALIVE", "5"))
+
+# Peers whose X-Forwarded-For / X-Forwarded-Proto are trusted (comma-separated IPs).
+# Behind a reverse proxy or load balancer, list its addresses so request.client
+# is the real caller (login throttling is per client IP); otherwise every request
+# appears to come from the proxy. "*" trusts anyone to claim any address: only
+# use it when the app port is reachable solely through a proxy that overwrites the header
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+# Graceful recycling: a worker exits after max_requests (+ jitter, so workers do
+# not restart together), finishing in-flight requests within graceful_timeout
+max_requests = int(os.getenv("MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "1000"))
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+
+# A worker silent for this long is killed and replaced
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+
+# Each worker imports the app itself: engines and pools must not cross a fork
+preload_app = False
+
+accesslog = os.getenv("ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info")
@@ -0,0 +1,122 @@
+"""
+HTTP caching for catalog endpoints
+Responses carry a strong ETag (hash of the encoded body) and a Cache-Control
+policy; ETags live in the catalog cache, so an If-None-Match hit is answered
+with 304 without touching the database. Quiz detail bodies are kept fully
+encoded in a byte-bounded LRU and served as raw responses
+"""
+import hashlib
+import os
+import time
+from fastapi import Request, Response
+from .cache import catalog_cache, CATALOG_CACHE_TTL, LRUCache, on_quiz_content_changed
+from .responses import dumps
+
+# Cache-Control policies - browsers and shared caches may reuse a response for
+# max-age seconds, then revalidate with If-None-Match
+CATALOG_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+QUIZ_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=600"
+
+# Encoded quiz detail bodies, bounded by entry count and total bytes
+QUIZ_RESPONSE_CACHE_SIZE = int(os.getenv("QUIZ_RESPONSE_CACHE_SIZE", "1024"))
+QUIZ_RESPONSE_CACHE_BYTES = int(os.getenv("QUIZ_RESPONSE_CACHE_BYTES", str(32 * 1024 * 1024)))
+quiz_responses = LRUCache(QUIZ_RESPONSE_CACHE_SIZE, maxbytes=QUIZ_RESPONSE_CACHE_BYTES,
+                          sizeof=lambda entry: len(entry[0]))
+
+
+@on_quiz_content_changed
+def invalidate_quiz_response(quiz_id=None):
+    """Drop encoded quiz bodies, and catalog ETags that embed question counts"""
+    if quiz_id is None:
+        quiz_responses.clear()
+    else:
+        quiz_responses.pop(quiz_id)
+    catalog_cache.invalidate()
+
+
+def render(payload):
+    """Encode a payload with the app's JSON encoder; returns (body, etag)"""
+    body = dumps(payload)
+    return body, '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match uses the weak comparison, so W/ prefixes are ignored"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return etag in [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+
+
+def _respond(request: Request, body: bytes, etag: str, cache_control: str, headers=None):
+    headers = {**(headers or {}), "ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def prime_response(key, load):
+    """(body, etag) for a cached_response key, encoding load() on a miss"""
+    return catalog_cache.get_or_load(("response", key), lambda: render(load()))
+
+
+def cached_response(request: Request, key, load, cache_control: str = CATALOG_CACHE_CONTROL):
+    """
+    Serve a small, fixed-key payload whose encoded body is kept in the catalog cache
+    Warm requests never touch the database, whether or not they revalidate
+    """
+    body, etag = prime_response(key, load)
+    return _respond(request, body, etag, cache_control)
+
+
+def _cached_etag(request: Request, key, cache_control: str):
+    """304 response if the client already holds the current version of key"""
+    cached = catalog_cache.peek(("etag", key))
+    if cached and etag_matches(request, cached[0]):
+        return Response(status_code=304, headers={
+            **cached[1], "ETag": cached[0], "Cache-Control": cache_control
+        })
+    return None
+
+
+async def revalidated_response(request: Request, key, build, cache_control: str = CATALOG_CACHE_CONTROL,
+                               headers=None):
+    """
+    Serve a payload built by `await build()`, caching only its ETag
+    If-None-Match hits return 304 before build() runs; misses rebuild the payload.
+    headers(payload) may add response headers, which are replayed on 304s
+    """
+    not_modified = _cached_etag(request, key, cache_control)
+    if not_modified:
+        return not_modified
+
+    version = catalog_cache.version
+    payload = await build()
+    extra = headers(payload) if headers else {}
+    body, etag = render(payload)
+    catalog_cache.put(("etag", key), (etag, extra), version)
+    return _respond(request, body, etag, cache_control, extra)
+
+
+def store_encoded(cache: LRUCache, key, payload, generation=None):
+    """Encode payload into a byte cache entry; returns the entry"""
+    body, etag = render(payload)
+    entry = (body, etag, time.monotonic())
+    cache.put(key, entry, generation)
+    return entry
+
+
+async def byte_cached_response(request: Request, cache: LRUCache, key, build,
+                               cache_control: str = QUIZ_CACHE_CONTROL):
+    """
+    Serve pre-encoded response bytes from an LRU cache; build() only runs on a miss
+    Entries older than CATALOG_CACHE_TTL are rebuilt so out-of-process edits show up
+    """
+    entry = cache.get(key)
+    if entry is None or (CATALOG_CACHE_TTL and time.monotonic() - entry[2] >= CATALOG_CACHE_TTL):
+        generation = cache.generation
+        entry = store_encoded(cache, key, await build(), generation)
+    return _respond(request, entry[0], entry[1], cache_control)
@@ -0,0 +1,107 @@
+"""
+Application lifecycle: waiting for the database, readiness and cold-start timing
+Importing the app never touches the database; the lifespan hook waits for it
+with exponential backoff, warms up, and only then reports ready
+"""
+import asyncio
+import os
+import random
+import time
+from sqlalchemy import text
+from .database import engine, async_engine
+
+DB_CONNECT_ATTEMPTS = int(os.getenv("DB_CONNECT_ATTEMPTS", "10"))
+DB_CONNECT_BASE_DELAY = float(os.getenv("DB_CONNECT_BASE_DELAY", "0.5"))   # seconds
+DB_CONNECT_MAX_DELAY = float(os.getenv("DB_CONNECT_MAX_DELAY", "10"))      # seconds
+READINESS_TIMEOUT = float(os.getenv("READINESS_TIMEOUT", "2"))             # seconds per DB ping
+
+
+def backoff_delays(attempts: int = DB_CONNECT_ATTEMPTS, base: float = DB_CONNECT_BASE_DELAY,
+                   cap: float = DB_CONNECT_MAX_DELAY):
+    """Delays between attempts: exponential with full jitter, capped"""
+    for attempt in range(attempts - 1):
+        yield random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def _report_retry(error, delay):
+    print(f"  Database is unavailable ({type(error).__name__}) - retrying in {delay:.1f}s...")
+
+
+def wait_for_database_sync():
+    """Block until the sync engine can run SELECT 1; re-raises after the last attempt"""
+    delays = backoff_delays()
+    while True:
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            return
+        except Exception as e:
+            delay = next(delays, None)
+            if delay is None:
+                raise
+            _report_retry(e, delay)
+            time.sleep(delay)
+
+
+async def wait_for_database():
+    """AsyncEngine variant of wait_for_database_sync"""
+    delays = backoff_delays()
+    while True:
+        try:
+            async with async_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            return
+        except Exception as e:
+            delay = next(delays, None)
+            if delay is None:
+                raise
+            _report_retry(e, delay)
+            await asyncio.sleep(delay)
+
+
+class AppState:
+    """Readiness flag and startup timings reported by /ready"""
+
+    def __init__(self):
+        self.ready = False
+        self.import_started = time.perf_counter()
+        self.import_ms = None
+        self.startup_ms = None
+        self.cold_start_ms = None
+
+    def mark_imported(self, import_started: float):
+        """Record how long importing the app took; cold start is measured from import_started"""
+        self.import_started = import_started
+        self.import_ms = (time.perf_counter() - import_started) * 1000
+
+    def mark_ready(self, startup_began: float):
+        now = time.perf_counter()
+        self.startup_ms = (now - startup_began) * 1000
+        self.cold_start_ms = (now - self.import_started) * 1000
+        self.ready = True
+
+    def mark_stopping(self):
+        self.ready = False
+
+    def timings(self):
+        return {
+            "import_ms": round(self.import_ms, 1) if self.import_ms is not None else None,
+            "startup_ms": round(self.startup_ms, 1) if self.startup_ms is not None else None,
+            "cold_start_ms": round(self.cold_start_ms, 1) if self.cold_start_ms is not None else None,
+        }
+
+
+app_state = AppState()
+
+
+async def database_reachable(timeout: float = READINESS_TIMEOUT) -> bool:
+    """One SELECT 1 on the async engine, bounded by timeout"""
+    async def ping():
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.wait_for(ping(), timeout)
+        return True
+    except Exception:
+        return False
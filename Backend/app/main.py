@@ -1,24 +1,71 @@
-from fastapi import FastAPI
+import time
+IMPORT_STARTED = time.perf_counter()  # cold start is measured from here
+
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from .api import users, quizzes, sectors, admin
-from .models_hierarchical import Base
-from .database import engine
+from .api import users, quizzes, sectors, admin, metrics, search
+from .database import engine, async_engine, replicas
 from .db_init import auto_populate_if_empty
+from .pagination import InvalidCursor, NEXT_CURSOR_HEADER
+from .passwords import HashingOverloaded
+from .responses import FastJSONResponse
+from .query_stats import QueryStatsMiddleware, QUERY_STATS_HEADERS, instrument
+from .read_routing import ReadRoutingMiddleware, track_commits
+from .warmup import warm_up, WARMUP_ON_STARTUP
+from .write_behind import attempt_writer
+from .lifecycle import app_state, wait_for_database, database_reachable
 
-# Create all tables using hierarchical models
-Base.metadata.create_all(bind=engine)
-
+# Schema is managed by migrations (python -m app.migrate), not at import time,
+# so importing the app never opens a database connection
 # Note: Auto-population now runs in entrypoint.sh after DB is ready
 # This allows proper sequencing: DB ready → populate → start server
 # If running locally without Docker, uncomment the line below:
 # auto_populate_if_empty()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs before uvicorn accepts connections on this worker
+    startup_began = time.perf_counter()
+    await wait_for_database()
+    if replicas:
+        # Replicas join the rotation once checked; until then reads use the primary
+        await asyncio.to_thread(replicas.check_all)
+        replicas.start_monitor()
+    if WARMUP_ON_STARTUP:
+        await warm_up()
+    await attempt_writer.start()
+    app_state.mark_ready(startup_began)
+    timings = app_state.timings()
+    print(f"✅ Ready in {timings['cold_start_ms']:.0f} ms "
+          f"(import {timings['import_ms']:.0f} ms, startup {timings['startup_ms']:.0f} ms)")
+    yield
+    app_state.mark_stopping()
+    await attempt_writer.stop()   # queued quiz starts are written before the engines close
+    replicas.stop_monitor()
+    await replicas.dispose()
+    await async_engine.dispose()
+    engine.dispose()
+
 app = FastAPI(
     title="Future Work Readiness API",
     description="API for the Future of Work Readiness Platform",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
+# Per-request SQL statement counts, DB time and N+1 detection
+instrument(engine, async_engine.sync_engine)
+instrument(*(bound for replica in replicas.replicas for bound in (replica.engine, replica.async_engine.sync_engine)))
+app.add_middleware(QueryStatsMiddleware)
+
+# Read replicas for GET/HEAD, with read-your-writes after a write
+if replicas:
+    track_commits(engine, async_engine.sync_engine)
+    app.add_middleware(ReadRoutingMiddleware)
+
 # CORS - Allow frontend to talk to backend
 app.add_middleware(
     CORSMiddleware,
@@ -26,13 +73,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", *QUERY_STATS_HEADERS],
 )
 
+@app.exception_handler(InvalidCursor)
+def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    return FastJSONResponse(status_code=400, content={"detail": str(exc)})
+
+@app.exception_handler(HashingOverloaded)
+def hashing_overloaded_handler(request: Request, exc: HashingOverloaded):
+    # Shed password work rather than queue it behind the bounded hashing pool
+    return FastJSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
 # Include routers
 app.include_router(users.router, prefix="/api/users", tags=["Users"])
 app.include_router(quizzes.router, prefix="/api", tags=["Quizzes"])
 app.include_router(sectors.router, prefix="/api", tags=["Sectors"])
 app.include_router(admin.router, prefix="/api", tags=["Admin"])
+app.include_router(search.router, prefix="/api", tags=["Search"])
+app.include_router(metrics.router, tags=["Metrics"])
 
 @app.get("/")
 def root():
@@ -43,4 +102,17 @@ def root():
 
 @app.get("/health")
 def health_check():
+    """Liveness: the process is up; does not touch the database"""
     return {"status": "healthy", "version": "1.0.0"}
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: startup finished and the database answers; 503 otherwise"""
+    if app_state.ready and await database_reachable():
+        return {"status": "ready", **app_state.timings()}
+    return FastJSONResponse(
+        status_code=503,
+        content={"status": "starting" if not app_state.ready else "database unavailable"}
+    )
+
+app_state.mark_imported(IMPORT_STARTED)
@@ -0,0 +1,47 @@
+"""
+Explicit schema management step, run once per deploy before the server starts
+    python -m app.migrate
+Waits for the database, then upgrades it to the latest alembic revision.
+A database created earlier by Base.metadata.create_all (tables present, no
+alembic_version) has the schema of CREATE_ALL_REVISION, so it is stamped
+there and upgraded from it
+"""
+import time
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from .database import engine, DATABASE_URL
+from .lifecycle import wait_for_database_sync
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+# Schema that create_all produced before the app moved to migrations
+CREATE_ALL_REVISION = "539905540c48"
+
+
+def alembic_config():
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    config.set_main_option("sqlalchemy.url", DATABASE_URL.replace("%", "%%"))
+    return config
+
+
+def migrate():
+    start = time.perf_counter()
+    wait_for_database_sync()
+
+    config = alembic_config()
+    tables = set(inspect(engine).get_table_names())
+    if "alembic_version" not in tables and "branches" in tables:
+        print(f"📊 Schema was created without migrations - stamping it at {CREATE_ALL_REVISION}")
+        command.stamp(config, CREATE_ALL_REVISION)
+
+    print("📊 Applying database migrations...")
+    command.upgrade(config, "head")
+
+    print(f"✅ Database schema is up to date ({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -2,7 +2,7 @@
 Updated Database models for the Future of Work Readiness platform
 With proper 3-level hierarchy: Sectors → Branches → Specializations
 """
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -74,7 +74,7 @@ class Quiz(Base):
     
     # Relationships
     specialization = relationship("Specialization", back_populates="quizzes")
-    questions = relationship("Question", back_populates="quiz")
+    questions = relationship("Question", back_populates="quiz", order_by="Question.order_index")
     attempts = relationship("QuizAttempt", back_populates="quiz")
 
 
@@ -95,7 +95,7 @@ class Question(Base):
     
     # Relationships
     quiz = relationship("Quiz", back_populates="questions")
-    options = relationship("QuestionOption", back_populates="question")
+    options = relationship("QuestionOption", back_populates="question", order_by="QuestionOption.order_index")
 
 
 class QuestionOption(Base):
@@ -123,6 +123,8 @@ class User(Base):
     name = Column(String(100), nullable=False)
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
+    # Bumped to revoke every session token issued to the user (app/sessions.py)
+    session_version = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Profile information
     preferred_specialization_id = Column(Integer, ForeignKey("specializations.id"), nullable=True)
@@ -162,3 +164,17 @@ class QuizAttempt(Base):
     # Relationships
     user = relationship("User", back_populates="quiz_attempts")
     quiz = relationship("Quiz", back_populates="attempts")
+    
+    __table_args__ = (
+        # Keyset pagination of a user's history (newest first)
+        Index("ix_quiz_attempts_user_completed", "user_id", "completed_at", "id"),
+    )
+
+
+class AppMetadata(Base):
+    """Key/value bookkeeping for the application (e.g. hash of the last content sync)"""
+    __tablename__ = "app_metadata"
+    
+    key = Column(String(100), primary_key=True)
+    value = Column(Text, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
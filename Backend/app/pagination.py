@@ -0,0 +1,97 @@
+"""
+Keyset (cursor) pagination for list endpoints
+A cursor is an opaque token holding the sort key of the last row served;
+the next page filters past that key instead of using OFFSET, so deep pages
+cost the same as the first one
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+from fastapi import Query, Response
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Response header carrying the cursor for the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor we did not issue"""
+
+
+class PageParams:
+    """FastAPI dependency for ?cursor=&limit= query parameters"""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+
+
+def encode_cursor(values):
+    """Encode a row's sort key as an opaque URL-safe token"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, columns):
+    """Decode a cursor back into sort key values typed like the given columns"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match sort key")
+        return [
+            datetime.fromisoformat(value) if column.type.python_type is datetime else value
+            for value, column in zip(values, columns)
+        ]
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_window(query, order_by, cursor: Optional[str] = None,
+                  limit: int = DEFAULT_PAGE_SIZE, descending: bool = False):
+    """
+    Restrict a Query or select() to the page after cursor, fetching one extra row
+    order_by must be unique together (end with the primary key)
+    """
+    if cursor:
+        values = decode_cursor(cursor, order_by)
+        if len(order_by) == 1:
+            left, right = order_by[0], values[0]
+        else:
+            left, right = tuple_(*order_by), tuple_(*values)
+        query = query.filter(left < right if descending else left > right)
+
+    return query.order_by(
+        *[column.desc() if descending else column for column in order_by]
+    ).limit(limit + 1)
+
+
+def split_page(rows, key, limit: int = DEFAULT_PAGE_SIZE):
+    """Trim the extra row fetched by keyset_window and build the next cursor from key(row)"""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(key(rows[-1]))
+    return rows, next_cursor
+
+
+def paginate(query, order_by, key, cursor: Optional[str] = None,
+             limit: int = DEFAULT_PAGE_SIZE, descending: bool = False):
+    """Return one keyset page of a Query as (rows, next_cursor)"""
+    rows = keyset_window(query, order_by, cursor, limit, descending).all()
+    return split_page(rows, key, limit)
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    """Expose the next page's cursor to the client"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
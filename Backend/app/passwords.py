@@ -0,0 +1,182 @@
+"""
+Password hashing with scrypt on a bounded worker pool
+hashlib.scrypt is memory-hard and releases the GIL, so hashes run on a small
+dedicated thread pool: the event loop and the request threadpool keep serving
+other requests while a hash is computed. Work beyond the pool and a bounded
+queue is rejected (HashingOverloaded -> 503) instead of piling up
+
+Stored format: scrypt$<n>$<r>$<p>$<salt b64>$<hash b64>
+Rows from before hashing hold the plaintext password; they verify once and are
+rehashed on that login, as are hashes made with older scrypt parameters
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SCRYPT_N = int(os.getenv("PASSWORD_SCRYPT_N", str(2 ** 14)))   # CPU/memory cost: 128 * n * r bytes
+SCRYPT_R = int(os.getenv("PASSWORD_SCRYPT_R", "8"))
+SCRYPT_P = int(os.getenv("PASSWORD_SCRYPT_P", "1"))
+SCRYPT_DKLEN = 32
+SALT_BYTES = 16
+
+# Hashes computed at once, and hashes allowed to wait for a worker
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))
+
+PREFIX = "scrypt"
+
+
+class HashingOverloaded(RuntimeError):
+    """Raised when the hashing pool and its queue are full"""
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _unb64(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r + 1024 * 1024, dklen=SCRYPT_DKLEN)
+
+
+def hash_password_blocking(password: str) -> str:
+    """Hash a password with the current parameters (runs on the calling thread)"""
+    salt = secrets.token_bytes(SALT_BYTES)
+    digest = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return f"{PREFIX}${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(digest)}"
+
+
+def verify_password_blocking(password: str, stored: str):
+    """
+    Check a password against a stored value (runs on the calling thread)
+    Returns (matches, replacement) where replacement is a fresh hash when the
+    stored value is plaintext or uses outdated parameters, else None
+    """
+    if not stored.startswith(PREFIX + "$"):
+        # Legacy plaintext row
+        matches = hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+        return matches, hash_password_blocking(password) if matches else None
+
+    try:
+        _, n, r, p, salt, digest = stored.split("$")
+        n, r, p = int(n), int(r), int(p)
+        expected = _unb64(digest)
+        actual = _scrypt(password, _unb64(salt), n, r, p)
+    except ValueError:
+        return False, None
+
+    matches = hmac.compare_digest(actual, expected)
+    outdated = (n, r, p) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return matches, hash_password_blocking(password) if matches and outdated else None
+
+
+# Verified against when the email is unknown, so both paths cost one hash
+_DUMMY_HASH = None
+
+
+def _dummy_hash():
+    global _DUMMY_HASH
+    if _DUMMY_HASH is None:
+        _DUMMY_HASH = hash_password_blocking(secrets.token_urlsafe(16))
+    return _DUMMY_HASH
+
+
+class PasswordHasher:
+    """Runs hashing jobs on a fixed thread pool with a bounded queue"""
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_queue: int = PASSWORD_HASH_MAX_QUEUE):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._pending = 0      # queued + running
+        self._running = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_time = 0.0
+
+    def _admit(self):
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HashingOverloaded("Too many password operations in progress")
+            self._pending += 1
+            self.max_queue_depth = max(self.max_queue_depth, self._pending - self._running)
+
+    def _job(self, fn, args):
+        with self._lock:
+            self._running += 1
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._pending -= 1
+                self.completed += 1
+                self.total_time += time.perf_counter() - start
+
+    def submit(self, fn, *args):
+        """Queue fn(*args) on the pool; raises HashingOverloaded when full"""
+        self._admit()
+        try:
+            return self._executor.submit(self._job, fn, args)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+    async def run(self, fn, *args):
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def run_sync(self, fn, *args):
+        return self.submit(fn, *args).result()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "running": self._running,
+                "queue_depth": self._pending - self._running,
+                "max_queue": self.max_queue,
+                "max_queue_depth": self.max_queue_depth,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_hash_ms": self.total_time / self.completed * 1000 if self.completed else 0.0,
+            }
+
+
+hasher = PasswordHasher()
+
+
+async def hash_password(password: str) -> str:
+    return await hasher.run(hash_password_blocking, password)
+
+
+def hash_password_sync(password: str) -> str:
+    """For sync code paths; blocks the calling thread, not the event loop"""
+    return hasher.run_sync(hash_password_blocking, password)
+
+
+def _verify_unknown_user(password: str):
+    # Runs on the hashing pool: the first call also builds the dummy hash there
+    return verify_password_blocking(password, _dummy_hash())
+
+
+async def verify_password(password: str, stored):
+    """(matches, replacement_hash_or_None); stored=None still spends one hash"""
+    if stored is None:
+        await hasher.run(_verify_unknown_user, password)
+        return False, None
+    return await hasher.run(verify_password_blocking, password, stored)
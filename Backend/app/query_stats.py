@@ -0,0 +1,196 @@
+"""
+Per-request SQL statement counting, timing and N+1 detection
+Engine events record every statement executed while a request is in flight.
+Statements are grouped by fingerprint (the SQL with literals and IN-lists
+collapsed), so a loop that runs the same query once per row shows up as one
+fingerprint repeated many times
+"""
+import logging
+import os
+import re
+import threading
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# headers: add X-DB-* response headers (development)
+# log: log flagged requests and aggregate per-route metrics only (production)
+# off: no engine hooks
+QUERY_STATS_MODE = os.getenv("QUERY_STATS_MODE", "log").lower()
+
+# A request running one statement shape more than this many times is flagged as N+1
+QUERY_STATS_REPEAT_THRESHOLD = int(os.getenv("QUERY_STATS_REPEAT_THRESHOLD", "5"))
+
+# Response headers added in headers mode
+QUERY_STATS_HEADERS = ["X-DB-Statements", "X-DB-Time-Ms", "X-DB-Max-Repeat", "X-DB-N-Plus-One"]
+
+_current = ContextVar("query_stats", default=None)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|:\w+|\?")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a SQL statement so repeats with different parameters compare equal"""
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _PLACEHOLDER.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    statement = _PLACEHOLDER_LIST.sub("(?)", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+class RequestQueryStats:
+    """Statements executed while handling one request"""
+    __slots__ = ("count", "db_time", "fingerprints")
+
+    def __init__(self):
+        self.count = 0
+        self.db_time = 0.0
+        self.fingerprints = {}
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.db_time += elapsed
+        key = fingerprint(statement)
+        self.fingerprints[key] = self.fingerprints.get(key, 0) + 1
+
+    def most_repeated(self):
+        """(fingerprint, count) of the most repeated statement shape, or (None, 0)"""
+        if not self.fingerprints:
+            return None, 0
+        key = max(self.fingerprints, key=self.fingerprints.get)
+        return key, self.fingerprints[key]
+
+    def repeated(self, threshold: int = QUERY_STATS_REPEAT_THRESHOLD):
+        """Statement shapes executed more than threshold times, most repeated first"""
+        return sorted(
+            ((key, count) for key, count in self.fingerprints.items() if count > threshold),
+            key=lambda item: item[1], reverse=True
+        )
+
+
+class RouteQueryMetrics:
+    """Per-route totals across requests, for the metrics endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route: str, stats: RequestQueryStats, flagged: bool):
+        with self._lock:
+            totals = self._routes.get(route)
+            if totals is None:
+                totals = {"requests": 0, "statements": 0, "db_time": 0.0,
+                          "max_statements": 0, "n_plus_one": 0}
+                self._routes[route] = totals
+            totals["requests"] += 1
+            totals["statements"] += stats.count
+            totals["db_time"] += stats.db_time
+            totals["max_statements"] = max(totals["max_statements"], stats.count)
+            if flagged:
+                totals["n_plus_one"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                route: {
+                    "requests": totals["requests"],
+                    "avg_statements": totals["statements"] / totals["requests"],
+                    "max_statements": totals["max_statements"],
+                    "avg_db_ms": totals["db_time"] / totals["requests"] * 1000,
+                    "n_plus_one_requests": totals["n_plus_one"],
+                } for route, totals in sorted(self._routes.items())
+            }
+
+
+route_metrics = RouteQueryMetrics()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None and conn.info.get("query_start_time"):
+        stats.record(statement, time.perf_counter() - conn.info["query_start_time"].pop())
+
+
+def instrument(*engines):
+    """Hook statement timing into the given sync engines (use async_engine.sync_engine)"""
+    if QUERY_STATS_MODE == "off":
+        return
+    for bound_engine in engines:
+        event.listen(bound_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(bound_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware collecting RequestQueryStats for each HTTP request
+    Written as plain ASGI (not BaseHTTPMiddleware) so the context variable set
+    here is visible to the endpoint, including sync endpoints in the threadpool
+    """
+
+    def __init__(self, app, mode: str = QUERY_STATS_MODE,
+                 threshold: int = QUERY_STATS_REPEAT_THRESHOLD):
+        self.app = app
+        self.mode = mode
+        self.threshold = threshold
+        self._route_paths = None
+
+    def _route_label(self, scope):
+        """METHOD /route/{template} for the matched endpoint"""
+        endpoint = scope.get("endpoint")
+        if self._route_paths is None and "app" in scope:
+            self._route_paths = {
+                getattr(route, "endpoint", None): route.path for route in scope["app"].routes
+            }
+        path = (self._route_paths or {}).get(endpoint, "unmatched")
+        return f"{scope['method']} {path}"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.mode == "off":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and self.mode == "headers":
+                _, max_repeat = stats.most_repeated()
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-statements", str(stats.count).encode()))
+                headers.append((b"x-db-time-ms", f"{stats.db_time * 1000:.2f}".encode()))
+                headers.append((b"x-db-max-repeat", str(max_repeat).encode()))
+                repeated = stats.repeated(self.threshold)
+                if repeated:
+                    key, count = repeated[0]
+                    value = f"{count}x {key[:200]}".encode("latin-1", "replace")
+                    headers.append((b"x-db-n-plus-one", value))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current.reset(token)
+            self._report(scope, stats)
+
+    def _report(self, scope, stats: RequestQueryStats):
+        repeated = stats.repeated(self.threshold)
+        route = self._route_label(scope)
+        route_metrics.record(route, stats, bool(repeated))
+        if repeated:
+            key, count = repeated[0]
+            logger.warning(
+                "N+1 suspected on %s: %d statements, %.1f ms in DB; %dx %s",
+                route, stats.count, stats.db_time * 1000, count, key[:500]
+            )
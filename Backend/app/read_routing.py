@@ -0,0 +1,183 @@
+"""
+Request-level read routing between the primary and read replicas
+GET/HEAD requests read from a replica (see get_db in app.database); every
+other method stays on the primary. After a request commits on the primary,
+its writer reads from the primary for READ_YOUR_WRITES_SECONDS, long enough
+for any replica still in rotation (lag <= DB_REPLICA_MAX_LAG when last
+checked) to have caught up. Requests that commit nothing (a rejected login, a
+failed validation) do not count as writes.
+
+The writer is recognised by the user id in its bearer token, or the one a
+handler passes to note_writer (a registration, whose client has no token
+yet), in an in-process map; a last-write cookie carries the same window to
+other workers for browsers. Client IPs are not used: behind a proxy or NAT
+they would pin unrelated users to the primary
+
+Writes that invalidate in-process caches (admin edits, quiz content changes)
+also hold this worker's reads on the primary for the window, so a cache
+emptied by the write is not refilled from a replica that has not seen it
+"""
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from sqlalchemy import event
+from .cache import on_quiz_content_changed
+from .database import request_routing, REPLICA_MAX_LAG, REPLICA_CHECK_INTERVAL
+from .sessions import read_token
+
+READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS",
+                                           str(REPLICA_MAX_LAG + REPLICA_CHECK_INTERVAL)))
+RECENT_WRITERS_MAX_KEYS = int(os.getenv("DB_RECENT_WRITERS_MAX_KEYS", "100000"))
+LAST_WRITE_COOKIE = "fw_last_write"
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class RecentWriters:
+    """Writer key -> time its primary-only window ends, LRU-bounded"""
+
+    def __init__(self, max_keys: int = RECENT_WRITERS_MAX_KEYS):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._until = OrderedDict()
+        self._held_until = 0.0   # whole worker, after cache-invalidating writes
+        self.sticky_requests = 0
+
+    def record(self, keys, now: float):
+        with self._lock:
+            for key in keys:
+                self._until[key] = now + READ_YOUR_WRITES_SECONDS
+                self._until.move_to_end(key)
+                if len(self._until) > self.max_keys:
+                    self._until.popitem(last=False)
+
+    def hold(self, now: float):
+        self._held_until = now + READ_YOUR_WRITES_SECONDS
+
+    def is_sticky(self, keys, now: float) -> bool:
+        return now < self._held_until or any(now < self._until.get(key, 0.0) for key in keys)
+
+    def count_sticky(self):
+        with self._lock:
+            self.sticky_requests += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "read_your_writes_seconds": READ_YOUR_WRITES_SECONDS,
+                "tracked_writers": len(self._until),
+                "worker_held": time.time() < self._held_until,
+                "sticky_requests": self.sticky_requests,
+            }
+
+
+recent_writers = RecentWriters()
+
+
+def hold_primary():
+    """Send this worker's reads to the primary until replicas have seen the current write"""
+    recent_writers.hold(time.time())
+
+
+@on_quiz_content_changed
+def _hold_after_quiz_change(quiz_id=None):
+    hold_primary()
+
+
+class RequestWrites:
+    """Whether the current request committed on the primary, and users it wrote for"""
+    __slots__ = ("committed", "user_ids")
+
+    def __init__(self):
+        self.committed = False
+        self.user_ids = set()
+
+
+_request_writes = ContextVar("request_writes", default=None)
+
+
+def _on_commit(conn):
+    writes = _request_writes.get()
+    if writes is not None:
+        writes.committed = True
+
+
+def track_commits(*engines):
+    """Count commits on the given primary sync engines (use async_engine.sync_engine) as request writes"""
+    for bound_engine in engines:
+        event.listen(bound_engine, "commit", _on_commit)
+
+
+def note_writer(user_id: int):
+    """Keep user_id's reads on the primary after this request, for writes made before it holds a token"""
+    writes = _request_writes.get()
+    if writes is not None:
+        writes.user_ids.add(user_id)
+
+
+def _writer_keys(headers):
+    keys = []
+    authorization = headers.get(b"authorization", b"").decode("latin-1")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer":
+        claims = read_token(token.strip())
+        if claims is not None:
+            keys.append(f"user:{claims[0]}")
+    return keys
+
+
+def _cookie_wrote_recently(headers, now: float) -> bool:
+    for part in headers.get(b"cookie", b"").decode("latin-1").split(";"):
+        name, _, value = part.strip().partition("=")
+        if name == LAST_WRITE_COOKIE:
+            try:
+                return now - float(value) < READ_YOUR_WRITES_SECONDS
+            except ValueError:
+                return False
+    return False
+
+
+class ReadRoutingMiddleware:
+    """
+    ASGI middleware that sets app.database.request_routing for each request
+    Plain ASGI for the same reason as QueryStatsMiddleware: the context
+    variable has to be visible to dependencies and threadpool endpoints
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        now = time.time()
+        headers = dict(scope["headers"])
+        keys = _writer_keys(headers)
+        safe = scope["method"] in SAFE_METHODS
+        sticky = recent_writers.is_sticky(keys, now) or _cookie_wrote_recently(headers, now)
+        if sticky:
+            recent_writers.count_sticky()
+        token = request_routing.set((safe, sticky))
+        writes = RequestWrites()
+        writes_token = _request_writes.set(writes)
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and writes.committed:
+                # Recorded when the response starts, so the commit has happened
+                written_at = time.time()
+                recent_writers.record([*keys, *(f"user:{user_id}" for user_id in writes.user_ids)], written_at)
+                cookie = (f"{LAST_WRITE_COOKIE}={written_at:.3f}; Max-Age={math.ceil(READ_YOUR_WRITES_SECONDS)}; "
+                          f"Path=/; HttpOnly; SameSite=Lax")
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _request_writes.reset(writes_token)
+            request_routing.reset(token)
@@ -0,0 +1,26 @@
+"""
+Fast JSON responses for all routers
+orjson encodes dicts, lists, datetimes and UUIDs natively, several times faster
+than jsonable_encoder followed by the stdlib json module
+"""
+import orjson
+from fastapi.responses import ORJSONResponse
+
+# Datetimes in UTC end in "Z", the way pydantic serializes them
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def dumps(content) -> bytes:
+    """Encode a payload to JSON bytes"""
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    Default response class of the app
+    Handlers that already build their exact output shape can return one directly
+    to skip response_model validation and jsonable_encoder
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -157,6 +157,7 @@ class SpecializationsResponse(BaseModel):
 
 class QuizzesResponse(BaseModel):
     quizzes: List[QuizSummary]
+    next_cursor: Optional[str] = None
 
 class QuizStartResponse(BaseModel):
     attempt_id: int
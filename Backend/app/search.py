@@ -0,0 +1,116 @@
+"""
+Full-text search over quizzes, questions and specializations
+Postgres matches against tsvector expressions backed by GIN indexes; SQLite
+(local runs) matches against FTS5 tables kept in sync by triggers. Both are
+created by the c4d8e2f6a913 migration and follow every insert, update and
+delete, so admin edits are searchable as soon as they commit.
+
+Results from the three sources are merged by rank and paged with a keyset
+cursor over (-rank, type, id). Ranks are ts_rank on Postgres and bm25 on
+SQLite, so they compare within one database only
+"""
+import re
+from typing import Optional
+from sqlalchemy import Float, Integer, String, column, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from .pagination import decode_cursor, split_page, DEFAULT_PAGE_SIZE
+
+SEARCH_TYPES = ("quiz", "question", "specialization")
+
+# Sort key of a result row; the cursor holds its values
+SORT_KEY = [column("score", Float), column("type", String), column("id", Integer)]
+
+# Postgres: must stay identical to the GIN index expressions in the migration,
+# constants inlined, or the planner cannot use the indexes
+QUIZ_VECTOR = ("setweight(to_tsvector('english', quizzes.title), 'A') || "
+               "setweight(to_tsvector('english', coalesce(quizzes.description, '')), 'B')")
+QUESTION_VECTOR = "to_tsvector('english', questions.question_text)"
+SPECIALIZATION_VECTOR = ("setweight(to_tsvector('english', specializations.name), 'A') || "
+                         "setweight(to_tsvector('english', coalesce(specializations.description, '')), 'B')")
+
+POSTGRES_SOURCES = {
+    "quiz": f"""
+        SELECT 'quiz' AS type, quizzes.id AS id, quizzes.title AS title,
+               quizzes.description AS description, quizzes.id AS quiz_id,
+               quizzes.specialization_id AS specialization_id,
+               -CAST(ts_rank({QUIZ_VECTOR}, query) AS DOUBLE PRECISION) AS score
+        FROM quizzes, websearch_to_tsquery('english', :q) AS query
+        WHERE {QUIZ_VECTOR} @@ query AND quizzes.is_active IS NOT false""",
+    "question": f"""
+        SELECT 'question' AS type, questions.id AS id, questions.question_text AS title,
+               NULL AS description, quizzes.id AS quiz_id,
+               quizzes.specialization_id AS specialization_id,
+               -CAST(ts_rank({QUESTION_VECTOR}, query) AS DOUBLE PRECISION) AS score
+        FROM questions JOIN quizzes ON quizzes.id = questions.quiz_id,
+             websearch_to_tsquery('english', :q) AS query
+        WHERE {QUESTION_VECTOR} @@ query
+          AND questions.is_active IS NOT false AND quizzes.is_active IS NOT false""",
+    "specialization": f"""
+        SELECT 'specialization' AS type, specializations.id AS id, specializations.name AS title,
+               specializations.description AS description, NULL AS quiz_id,
+               specializations.id AS specialization_id,
+               -CAST(ts_rank({SPECIALIZATION_VECTOR}, query) AS DOUBLE PRECISION) AS score
+        FROM specializations, websearch_to_tsquery('english', :q) AS query
+        WHERE {SPECIALIZATION_VECTOR} @@ query AND specializations.is_active IS NOT false""",
+}
+
+# SQLite: bm25() is lower-is-better already; column weights favour titles/names
+SQLITE_SOURCES = {
+    "quiz": """
+        SELECT 'quiz' AS type, quizzes.id AS id, quizzes.title AS title,
+               quizzes.description AS description, quizzes.id AS quiz_id,
+               quizzes.specialization_id AS specialization_id,
+               bm25(quizzes_fts, 4.0, 1.0) AS score
+        FROM quizzes_fts JOIN quizzes ON quizzes.id = quizzes_fts.rowid
+        WHERE quizzes_fts MATCH :q AND quizzes.is_active IS NOT 0""",
+    "question": """
+        SELECT 'question' AS type, questions.id AS id, questions.question_text AS title,
+               NULL AS description, quizzes.id AS quiz_id,
+               quizzes.specialization_id AS specialization_id,
+               bm25(questions_fts) AS score
+        FROM questions_fts JOIN questions ON questions.id = questions_fts.rowid
+             JOIN quizzes ON quizzes.id = questions.quiz_id
+        WHERE questions_fts MATCH :q
+          AND questions.is_active IS NOT 0 AND quizzes.is_active IS NOT 0""",
+    "specialization": """
+        SELECT 'specialization' AS type, specializations.id AS id, specializations.name AS title,
+               specializations.description AS description, NULL AS quiz_id,
+               specializations.id AS specialization_id,
+               bm25(specializations_fts, 4.0, 1.0) AS score
+        FROM specializations_fts JOIN specializations ON specializations.id = specializations_fts.rowid
+        WHERE specializations_fts MATCH :q AND specializations.is_active IS NOT 0""",
+}
+
+
+def fts5_query(q: str) -> str:
+    """Every word of q as a quoted FTS5 term (implicit AND), so user input is never FTS5 syntax"""
+    return " ".join(f'"{word}"' for word in re.findall(r"\w+", q))
+
+
+async def search(db: AsyncSession, q: str, types=SEARCH_TYPES,
+                 cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE):
+    """One page of ranked matches for q as (rows, next_cursor)"""
+    dialect = db.bind.dialect.name
+    if dialect == "sqlite":
+        sources, q = SQLITE_SOURCES, fts5_query(q)
+        if not q:
+            return [], None
+    else:
+        sources = POSTGRES_SOURCES
+
+    params = {"q": q, "limit": limit + 1}
+    after = ""
+    if cursor:
+        params["after_score"], params["after_type"], params["after_id"] = decode_cursor(cursor, SORT_KEY)
+        after = ("WHERE (score, type, id) > (CAST(:after_score AS DOUBLE PRECISION), "
+                 "CAST(:after_type AS VARCHAR), CAST(:after_id AS INTEGER))")
+
+    union = " UNION ALL ".join(sources[source_type] for source_type in SEARCH_TYPES if source_type in types)
+    statement = text(f"""
+        SELECT type, id, title, description, quiz_id, specialization_id, score
+        FROM ({union}) AS results
+        {after}
+        ORDER BY score, type, id
+        LIMIT :limit""")
+    rows = (await db.execute(statement, params)).all()
+    return split_page(rows, key=lambda row: (row.score, row.type, row.id), limit=limit)
@@ -0,0 +1,134 @@
+"""
+Signed session tokens and the dependency that resolves them to a principal
+Tokens are <user_id>.<session_version>.<expires_at>.<signature>, signed with
+HMAC-SHA256 over SECRET_KEY, so checking one needs no database access.
+Resolved principals are cached per user for SESSION_CACHE_TTL seconds; bumping
+users.session_version (logout, deactivation) revokes every token issued before
+it: at once on the worker that made the change, within SESSION_CACHE_TTL on
+the others
+
+SECRET_KEY must be set when APP_ENV=production. Elsewhere an unset key is
+generated per process, so tokens stop working on restart and are only
+accepted by the worker that issued them
+"""
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import time
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import models_hierarchical as models
+from .cache import LRUCache
+from .database import get_async_db
+
+APP_ENV = os.getenv("APP_ENV", "development")
+SECRET_KEY = os.getenv("SECRET_KEY", "")
+if not SECRET_KEY or SECRET_KEY == "dev-secret-key-change-in-production":
+    if APP_ENV == "production":
+        raise RuntimeError("SECRET_KEY must be set to a private value when APP_ENV=production")
+    SECRET_KEY = secrets.token_urlsafe(32)
+SESSION_TTL = int(os.getenv("SESSION_TTL", str(24 * 3600)))             # token lifetime, seconds
+SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", "30"))         # revocation bound, seconds
+SESSION_CACHE_MAX_ENTRIES = int(os.getenv("SESSION_CACHE_MAX_ENTRIES", "10000"))
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+class Principal:
+    """The authenticated user, as cached between requests"""
+    __slots__ = ("id", "email", "name", "session_version")
+
+    def __init__(self, id: int, email: str, name: str, session_version: int):
+        self.id = id
+        self.email = email
+        self.name = name
+        self.session_version = session_version
+
+
+def _sign(payload: str) -> str:
+    digest = hmac.new(SECRET_KEY.encode("utf-8"), payload.encode("ascii"), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).decode("ascii").rstrip("=")
+
+
+def issue_token(user_id: int, session_version: int, ttl: int = SESSION_TTL) -> str:
+    payload = f"{user_id}.{session_version}.{int(time.time()) + ttl}"
+    return f"{payload}.{_sign(payload)}"
+
+
+def read_token(token: str):
+    """(user_id, session_version) for a well-signed, unexpired token, else None"""
+    payload, _, signature = token.rpartition(".")
+    if not hmac.compare_digest(signature, _sign(payload)):
+        return None
+    try:
+        user_id, session_version, expires_at = (int(part) for part in payload.split("."))
+    except ValueError:
+        return None
+    if expires_at < time.time():
+        return None
+    return user_id, session_version
+
+
+# user_id -> (loaded_at, Principal)
+principal_cache = LRUCache(maxsize=SESSION_CACHE_MAX_ENTRIES)
+
+
+async def load_principal(db: AsyncSession, user_id: int):
+    """Cached principal for an active user, or None"""
+    entry = principal_cache.get(user_id)
+    if entry is not None and time.monotonic() - entry[0] < SESSION_CACHE_TTL:
+        return entry[1]
+
+    generation = principal_cache.generation
+    result = await db.execute(
+        select(models.User.id, models.User.email, models.User.name, models.User.session_version)
+        .where(models.User.id == user_id, models.User.is_active.isnot(False))
+    )
+    row = result.first()
+    if row is None:
+        principal_cache.pop(user_id)
+        return None
+    principal = Principal(*row)
+    # Skipped if a revocation on this worker raced the load
+    principal_cache.put(user_id, (time.monotonic(), principal), generation)
+    return principal
+
+
+def _unauthorized(detail: str):
+    return HTTPException(status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+
+
+async def current_user(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+                       db: AsyncSession = Depends(get_async_db)) -> Principal:
+    """Dependency: the user behind the request's bearer token, or 401"""
+    if credentials is None:
+        raise _unauthorized("Not authenticated")
+    claims = read_token(credentials.credentials)
+    if claims is None:
+        raise _unauthorized("Invalid or expired token")
+
+    user_id, session_version = claims
+    principal = await load_principal(db, user_id)
+    if principal is None or principal.session_version != session_version:
+        raise _unauthorized("Session has been revoked")
+    return principal
+
+
+def forget_principal(user_id: int):
+    """Drop a cached principal after its user changed on this worker"""
+    principal_cache.pop(user_id)
+
+
+async def revoke_sessions(db: AsyncSession, user_id: int):
+    """Invalidate every token issued to a user so far"""
+    await db.execute(
+        update(models.User).where(models.User.id == user_id)
+        .values(session_version=models.User.session_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    forget_principal(user_id)
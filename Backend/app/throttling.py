@@ -0,0 +1,163 @@
+"""
+Sliding-window login throttling per client IP and per email
+Each key keeps the attempt counts of the current and previous fixed window;
+the sliding count is the current count plus the previous one weighted by how
+much of it still overlaps the sliding window. That is two integers per key,
+so the in-process store stays small and is bounded by LOGIN_THROTTLE_MAX_KEYS
+(least recently used keys are evicted)
+
+The in-process store limits each worker on its own. With several workers or
+hosts, set LOGIN_THROTTLE_REDIS_URL to share counts through Redis (needs the
+redis package); the in-process store is the local stand-in for it. In Redis the
+check and the increment run as one Lua script, so concurrent attempts cannot
+all pass the check before any of them is counted, through redis.asyncio so a
+slow Redis delays logins without blocking the worker's event loop
+
+The per-IP key is the client address uvicorn reports; behind a proxy it is
+only the real caller when the proxy is trusted (FORWARDED_ALLOW_IPS, see
+app/gunicorn_conf.py)
+
+Rejected attempts are not counted, so a client retrying in a loop still gets
+its full allowance once the window slides
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+LOGIN_LIMIT_PER_IP = int(os.getenv("LOGIN_LIMIT_PER_IP", "20"))
+LOGIN_LIMIT_PER_EMAIL = int(os.getenv("LOGIN_LIMIT_PER_EMAIL", "5"))
+LOGIN_WINDOW = float(os.getenv("LOGIN_WINDOW", "60"))   # seconds
+LOGIN_THROTTLE_MAX_KEYS = int(os.getenv("LOGIN_THROTTLE_MAX_KEYS", "100000"))
+LOGIN_THROTTLE_REDIS_URL = os.getenv("LOGIN_THROTTLE_REDIS_URL")
+
+
+def _sliding_count(previous: int, current: int, elapsed: float, window: float) -> float:
+    return previous * (1 - elapsed / window) + current
+
+
+# KEYS: previous window, current window; ARGV: elapsed, window, limit, expiry.
+# Returns 1 and counts the attempt if the sliding count is under the limit, else 0
+REDIS_HIT_SCRIPT = """
+local previous = tonumber(redis.call('GET', KEYS[1]) or '0')
+local current = tonumber(redis.call('GET', KEYS[2]) or '0')
+local elapsed, window = tonumber(ARGV[1]), tonumber(ARGV[2])
+if previous * (1 - elapsed / window) + current >= tonumber(ARGV[3]) then
+    return 0
+end
+redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+return 1
+"""
+
+
+class MemoryWindowStore:
+    """Per-key window counts in an LRU-bounded dict, for one process"""
+
+    def __init__(self, max_keys: int = LOGIN_THROTTLE_MAX_KEYS):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._windows = OrderedDict()   # key -> [window_start, previous, current]
+        self.evictions = 0
+
+    async def hit(self, key: str, limit: int, window: float, now: float):
+        """Count an attempt if under limit; returns (allowed, retry_after_seconds)"""
+        window_start = now - now % window
+        with self._lock:
+            entry = self._windows.get(key)
+            if entry is None:
+                entry = [window_start, 0, 0]
+                self._windows[key] = entry
+                if len(self._windows) > self.max_keys:
+                    self._windows.popitem(last=False)
+                    self.evictions += 1
+            else:
+                self._windows.move_to_end(key)
+                if entry[0] != window_start:
+                    # Roll forward; anything older than the previous window is dropped
+                    entry[1] = entry[2] if window_start - entry[0] == window else 0
+                    entry[2] = 0
+                    entry[0] = window_start
+
+            if _sliding_count(entry[1], entry[2], now - window_start, window) >= limit:
+                return False, window_start + window - now
+            entry[2] += 1
+            return True, 0.0
+
+    def __len__(self):
+        return len(self._windows)
+
+
+class RedisWindowStore:
+    """The same counts kept in Redis, shared by every worker and host"""
+
+    def __init__(self, url: str, prefix: str = "login-throttle:"):
+        import redis.asyncio   # optional dependency, only needed for the shared backend
+        self._redis = redis.asyncio.Redis.from_url(url)
+        self._hit = self._redis.register_script(REDIS_HIT_SCRIPT)
+        self.prefix = prefix
+        self.evictions = 0   # Redis expires keys itself
+
+    async def hit(self, key: str, limit: int, window: float, now: float):
+        window_start = now - now % window
+        # The hash tag keeps both windows of a key in one slot on Redis Cluster
+        current_key = f"{self.prefix}{{{key}}}:{int(window_start)}"
+        previous_key = f"{self.prefix}{{{key}}}:{int(window_start - window)}"
+        allowed = await self._hit(keys=[previous_key, current_key],
+                            args=[now - window_start, window, limit, int(window * 2) + 1])
+        if not allowed:
+            return False, window_start + window - now
+        return True, 0.0
+
+    def __len__(self):
+        return 0
+
+
+class LoginThrottle:
+    """Checks a login attempt against the per-IP and per-email limits"""
+
+    def __init__(self, store, ip_limit: int = LOGIN_LIMIT_PER_IP,
+                 email_limit: int = LOGIN_LIMIT_PER_EMAIL, window: float = LOGIN_WINDOW):
+        self.store = store
+        self.ip_limit = ip_limit
+        self.email_limit = email_limit
+        self.window = window
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.rejected = {"ip": 0, "email": 0}
+
+    async def check(self, ip: str, email: str):
+        """None if the attempt may proceed, else seconds until it may be retried"""
+        now = time.time()
+        with self._lock:
+            self.checked += 1
+        for scope, key, limit in (("ip", f"ip:{ip}", self.ip_limit),
+                                  ("email", f"email:{email.strip().lower()}", self.email_limit)):
+            allowed, retry_after = await self.store.hit(key, limit, self.window, now)
+            if not allowed:
+                with self._lock:
+                    self.rejected[scope] += 1
+                return retry_after
+        return None
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "window_seconds": self.window,
+                "ip_limit": self.ip_limit,
+                "email_limit": self.email_limit,
+                "checked": self.checked,
+                "rejected_ip": self.rejected["ip"],
+                "rejected_email": self.rejected["email"],
+                "tracked_keys": len(self.store),
+                "evictions": self.store.evictions,
+            }
+
+
+def _default_store():
+    if LOGIN_THROTTLE_REDIS_URL:
+        return RedisWindowStore(LOGIN_THROTTLE_REDIS_URL)
+    return MemoryWindowStore()
+
+
+login_throttle = LoginThrottle(_default_store())
@@ -0,0 +1,152 @@
+"""
+In-memory typeahead index for the specialization picker
+Built from the cached Sector -> Branch -> Specialization tree and stored in
+the catalog cache, so admin writes invalidate it like every other catalog
+entry and the next lookup rebuilds it. Lookups are dictionary reads plus a
+small sort: no database access once the index is built.
+
+Matching: every query word must be a prefix of a word in the specialization
+name (weighted higher) or in its branch or sector name. When no entry matches
+that way, trigram similarity on the name catches typos ("fronted" -> Frontend)
+"""
+import heapq
+import re
+import unicodedata
+from collections import Counter
+
+MAX_PREFIX = 12         # longer query words are checked with startswith
+NAME_WEIGHT = 2
+PATH_WEIGHT = 1
+NAME_START_BONUS = 3    # whole query is a prefix of the name
+MIN_TRIGRAM_SIMILARITY = 0.4
+MAX_SUGGESTIONS = 50    # per-prefix rankings are kept this long
+
+
+def normalize(text: str) -> str:
+    """Lowercase with accents stripped, so "Génie" matches "genie" """
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def words(text: str):
+    return re.findall(r"\w+", normalize(text))
+
+
+def trigrams(text: str):
+    padded = f"  {' '.join(words(text))} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SpecializationIndex:
+    """Prefix and trigram maps over active specializations and their breadcrumb paths"""
+
+    def __init__(self, hierarchy):
+        self.entries = []       # response dicts, in index order
+        self._names = []        # normalized names, for the start-of-name bonus and tie-breaks
+        self._words = []        # all words of each entry, for long query words
+        self._prefixes = {}     # prefix -> {entry index: weight}
+        self._ranked = {}       # prefix -> best entry indexes for a one-word query
+        self._trigrams = {}     # trigram -> [entry index]
+        self._trigram_counts = []
+
+        for sector in hierarchy:
+            for branch in sector["branches"]:
+                for spec in branch["specializations"]:
+                    self._add(sector, branch, spec)
+
+        # One-word queries are the common case while typing: rank them up front
+        for prefix, matches in self._prefixes.items():
+            self._ranked[prefix] = heapq.nsmallest(
+                MAX_SUGGESTIONS, matches,
+                key=lambda index: self._sort_key(index, matches[index], prefix)
+            )
+
+    def _add(self, sector, branch, spec):
+        index = len(self.entries)
+        self.entries.append({
+            "id": spec["id"],
+            "name": spec["name"],
+            "branch_id": branch["id"],
+            "sector_id": sector["id"],
+            "path": [sector["name"], branch["name"], spec["name"]]
+        })
+        self._names.append(normalize(spec["name"]))
+
+        name_words = words(spec["name"])
+        path_words = words(branch["name"]) + words(sector["name"])
+        self._words.append(set(name_words) | set(path_words))
+        for weight, entry_words in ((PATH_WEIGHT, path_words), (NAME_WEIGHT, name_words)):
+            for word in entry_words:
+                for end in range(1, min(len(word), MAX_PREFIX) + 1):
+                    matches = self._prefixes.setdefault(word[:end], {})
+                    matches[index] = max(matches.get(index, 0), weight)
+
+        grams = trigrams(spec["name"])
+        self._trigram_counts.append(len(grams))
+        for gram in grams:
+            self._trigrams.setdefault(gram, []).append(index)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _sort_key(self, index, score, prefix):
+        if self._names[index].startswith(prefix):
+            score += NAME_START_BONUS
+        return (-score, len(self._names[index]), self._names[index])
+
+    def _prefix_scores(self, query_words):
+        word_matches = []
+        for word in query_words:
+            matches = self._prefixes.get(word[:MAX_PREFIX])
+            if not matches:
+                return {}
+            if len(word) > MAX_PREFIX:
+                matches = {index: weight for index, weight in matches.items()
+                           if any(candidate.startswith(word) for candidate in self._words[index])}
+            word_matches.append(matches)
+
+        # Intersect starting from the most selective word
+        word_matches.sort(key=len)
+        scores = dict(word_matches[0])
+        for matches in word_matches[1:]:
+            scores = {index: score + matches[index] for index, score in scores.items() if index in matches}
+            if not scores:
+                return {}
+        return scores
+
+    def _trigram_scores(self, query):
+        grams = trigrams(query)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._trigrams.get(gram, ()))
+        scores = {}
+        for index, count in shared.items():
+            # Dice coefficient of the two trigram sets
+            similarity = 2 * count / (len(grams) + self._trigram_counts[index])
+            if similarity >= MIN_TRIGRAM_SIMILARITY:
+                scores[index] = similarity
+        return scores
+
+    def suggest(self, query: str, limit: int = 8):
+        """Top `limit` entries for query, best first"""
+        query_words = words(query)
+        if not query_words:
+            return []
+
+        if len(query_words) == 1 and len(query_words[0]) <= MAX_PREFIX and limit <= MAX_SUGGESTIONS:
+            best = self._ranked.get(query_words[0], [])[:limit]
+            if best:
+                return [self.entries[index] for index in best]
+            scores = {}
+        else:
+            prefix = " ".join(query_words)
+            scores = self._prefix_scores(query_words)
+            best = heapq.nsmallest(limit, scores, key=lambda index: self._sort_key(index, scores[index], prefix))
+
+        if not scores and len(query.strip()) >= 3:
+            scores = self._trigram_scores(query)
+            best = heapq.nsmallest(
+                limit, scores,
+                key=lambda index: (-scores[index], len(self._names[index]), self._names[index])
+            )
+        return [self.entries[index] for index in best]
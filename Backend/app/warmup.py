@@ -0,0 +1,79 @@
+"""
+Startup warm-up, run before a worker accepts traffic
+Opens pooled connections on both engines and primes the catalog, answer key
+and quiz response caches, so the first requests after a deploy or a worker
+recycle do not pay for connection setup and cold caches
+"""
+import asyncio
+import os
+import time
+from contextlib import AsyncExitStack, ExitStack
+from sqlalchemy import select, text
+from . import crud_async, grading
+from . import models_hierarchical as models
+from .api.quizzes import quiz_detail
+from .api.sectors import _load_sectors, get_cached_hierarchy, get_specialization_index
+from .database import engine, async_engine, SessionLocal, AsyncSessionLocal, POOL_SIZE
+from .http_cache import prime_response, store_encoded, quiz_responses
+
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+WARMUP_CONNECTIONS = int(os.getenv("WARMUP_CONNECTIONS", str(min(POOL_SIZE, 5))))
+WARMUP_QUIZZES = int(os.getenv("WARMUP_QUIZZES", "50"))
+
+
+def warm_pool(connections: int = WARMUP_CONNECTIONS):
+    """Open connections at the same time so the pool keeps them idle afterwards"""
+    with ExitStack() as stack:
+        for _ in range(connections):
+            stack.enter_context(engine.connect()).execute(text("SELECT 1"))
+
+
+async def warm_async_pool(connections: int = WARMUP_CONNECTIONS):
+    """AsyncEngine variant of warm_pool"""
+    async with AsyncExitStack() as stack:
+        for _ in range(connections):
+            conn = await stack.enter_async_context(async_engine.connect())
+            await conn.execute(text("SELECT 1"))
+
+
+def warm_catalog():
+    """Encode the hierarchy and sector list bodies and build the typeahead index"""
+    db = SessionLocal()
+    try:
+        prime_response("hierarchy", lambda: get_cached_hierarchy(db))
+        prime_response("sectors", lambda: _load_sectors(db))
+        get_specialization_index(db)
+    finally:
+        db.close()
+
+
+async def warm_quizzes(limit: int = WARMUP_QUIZZES):
+    """Compile answer keys and encode detail bodies for the first `limit` quizzes"""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(models.Quiz.id).order_by(models.Quiz.id).limit(limit)
+        )
+        quiz_ids = result.scalars().all()
+        for quiz_id in quiz_ids:
+            await grading.get_answer_key_async(db, quiz_id)
+            quiz, questions = await crud_async.get_quiz_with_questions(db, quiz_id)
+            if quiz:
+                store_encoded(quiz_responses, quiz_id, quiz_detail(quiz, questions))
+    return len(quiz_ids)
+
+
+async def warm_up():
+    """Prime pools and caches; a failure is reported but does not stop the worker"""
+    start = time.perf_counter()
+    try:
+        await asyncio.to_thread(warm_pool)
+        await warm_async_pool()
+        await asyncio.to_thread(warm_catalog)
+        quiz_count = await warm_quizzes()
+    except Exception as e:
+        print(f"⚠️  Warm-up incomplete: {e}")
+        return
+
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"🔥 Warm-up done in {elapsed:.0f} ms: {WARMUP_CONNECTIONS} connections per engine, "
+          f"catalog, {quiz_count} quizzes")
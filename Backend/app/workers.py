@@ -0,0 +1,12 @@
+"""
+Uvicorn worker class for gunicorn
+"""
+from uvicorn.workers import UvicornWorker
+
+
+class ProductionUvicornWorker(UvicornWorker):
+    """
+    uvloop event loop and httptools parser; startup (warm-up) runs before accepting traffic
+    Client addresses come from X-Forwarded-For when the peer is in forwarded_allow_ips
+    """
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "lifespan": "on", "proxy_headers": True}
@@ -0,0 +1,246 @@
+"""
+Write-behind buffering for quiz attempt inserts
+With ATTEMPT_WRITE_BEHIND on, starting a quiz takes an id from a block reserved
+up front (one round trip per ATTEMPT_ID_BLOCK starts), queues the row in this
+worker's memory and returns. A background task inserts queued rows in one
+executemany INSERT per batch every ATTEMPT_FLUSH_INTERVAL_MS, or as soon as
+ATTEMPT_FLUSH_BATCH rows are waiting.
+
+Ids come from the quiz_attempts id sequence on Postgres, so they never collide
+with rows inserted the usual way. SQLite has no sequences: a high-water mark
+in app_metadata stands in for one, which only covers attempts created through
+crud_async.create_quiz_attempt while write-behind is on.
+
+Durability: a start is acknowledged before its row is committed. Rows are
+flushed on graceful shutdown, but a worker that crashes or is killed loses
+every start still queued, and a submit for a lost attempt gets 404. While
+flushes succeed that is about one interval's starts (up to
+ATTEMPT_BUFFER_MAX if the database falls behind). Once a flush fails,
+nothing more is queued until a retry succeeds, so an outage does not grow
+the backlog; only rows queued before the failure are at risk. Until its
+flush, an attempt is missing from history listings. Submitting a queued
+attempt on the worker that holds it flushes it first; a submit reaching
+another worker before the flush gets 404. Reserved ids that are never used
+leave gaps.
+
+Synchronous fallback: with write-behind off, on a database without a
+reservation query, after a failed flush until one succeeds, or while
+ATTEMPT_BUFFER_MAX rows are queued, starts are inserted and committed in the
+request as before (and fail there while the database is down)
+"""
+import asyncio
+import itertools
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from sqlalchemy import insert, text
+from sqlalchemy.exc import IntegrityError
+from .database import async_engine
+from . import models_hierarchical as models
+
+ATTEMPT_WRITE_BEHIND = os.getenv("ATTEMPT_WRITE_BEHIND", "false").lower() in ("1", "true", "yes")
+ATTEMPT_FLUSH_INTERVAL_MS = int(os.getenv("ATTEMPT_FLUSH_INTERVAL_MS", "50"))
+ATTEMPT_FLUSH_BATCH = int(os.getenv("ATTEMPT_FLUSH_BATCH", "500"))      # rows per INSERT
+ATTEMPT_ID_BLOCK = int(os.getenv("ATTEMPT_ID_BLOCK", "1000"))           # ids reserved per round trip
+ATTEMPT_BUFFER_MAX = int(os.getenv("ATTEMPT_BUFFER_MAX", "20000"))      # queued rows before falling back
+
+ID_WATERMARK_KEY = "quiz_attempts.next_id"
+
+# Statements returning a block of :n unused quiz_attempts ids
+RESERVE_IDS = {
+    "postgresql": [
+        "SELECT nextval(pg_get_serial_sequence('quiz_attempts', 'id')) FROM generate_series(1, :n)",
+    ],
+    # Returns the end of the block; one UPDATE, so concurrent reservations cannot overlap
+    "sqlite": [
+        "INSERT INTO app_metadata (key, value) VALUES (:key, '0') ON CONFLICT (key) DO NOTHING",
+        """UPDATE app_metadata
+           SET value = CAST(MAX(CAST(value AS INTEGER),
+                                (SELECT COALESCE(MAX(id), 0) + 1 FROM quiz_attempts)) + :n AS TEXT)
+           WHERE key = :key
+           RETURNING CAST(value AS INTEGER)""",
+    ],
+}
+
+
+def attempt_row(user_id: int, quiz_id: int):
+    """Column values of a newly started attempt"""
+    now = datetime.now(timezone.utc)
+    return {
+        "user_id": user_id,
+        "quiz_id": quiz_id,
+        "started_at": now,
+        "completed_at": now,  # Will be updated on submission
+        "score": 0.0,
+        "max_score": 0.0,
+        "percentage": 0.0,
+        "is_passed": False,
+    }
+
+
+class AttemptWriter:
+    """Reserved attempt ids and the queue of attempt rows waiting for a batched insert"""
+
+    def __init__(self, interval_ms: int = ATTEMPT_FLUSH_INTERVAL_MS, batch_size: int = ATTEMPT_FLUSH_BATCH,
+                 id_block: int = ATTEMPT_ID_BLOCK, max_pending: int = ATTEMPT_BUFFER_MAX):
+        self.interval = interval_ms / 1000
+        self.batch_size = batch_size
+        self.id_block = id_block
+        self.max_pending = max_pending
+        self.active = False
+        self.degraded = False   # last flush failed: starts are written synchronously
+        self._pending = {}      # attempt id -> row, in start order
+        self._ids = deque()
+        self._task = None
+        self._refilling = None
+        self.queued = 0
+        self.flushed = 0
+        self.batches = 0
+        self.fallbacks = 0
+        self.failures = 0
+        self.dropped = 0
+        self.last_flush_ms = 0.0
+
+    async def start(self, enabled: bool = ATTEMPT_WRITE_BEHIND):
+        """Start the flush task; call from the event loop that serves requests"""
+        if not enabled:
+            return
+        if async_engine.dialect.name not in RESERVE_IDS:
+            print(f"⚠️  ATTEMPT_WRITE_BEHIND is not supported on {async_engine.dialect.name}; "
+                  f"quiz starts are written synchronously")
+            return
+        self._reserve_lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self.active = True
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush task and write everything still queued"""
+        if not self.active:
+            return
+        # Not cancelled: a flush cancelled mid-commit could be written twice
+        self.active = False
+        self._wake.set()
+        await self._task
+        try:
+            while self._pending:
+                await self.flush()
+        except Exception as e:
+            print(f"❌ {len(self._pending)} queued quiz attempts were not written ({type(e).__name__})")
+        self._ids.clear()
+
+    async def reserve_id(self) -> int:
+        if not self._ids:
+            await self._refill()
+        elif len(self._ids) == self.id_block // 4 and not self._reserve_lock.locked():
+            # Fetch the next block before this one runs out, so starts rarely wait for it
+            self._refilling = asyncio.create_task(self._refill())
+        return self._ids.popleft()
+
+    async def _refill(self):
+        async with self._reserve_lock:
+            if len(self._ids) <= self.id_block // 4:
+                self._ids.extend(await self._reserve_block())
+
+    async def _reserve_block(self):
+        statements = RESERVE_IDS[async_engine.dialect.name]
+        params = {"n": self.id_block, "key": ID_WATERMARK_KEY}
+        async with async_engine.begin() as conn:
+            for statement in statements:
+                result = await conn.execute(text(statement), params)
+        if async_engine.dialect.name == "sqlite":
+            end = result.scalar_one()
+            return range(end - self.id_block, end)
+        return result.scalars().all()
+
+    def buffer(self, row) -> bool:
+        """Queue a row with a reserved id; False after a failed flush or when the queue is full"""
+        if self.degraded or len(self._pending) >= self.max_pending:
+            self.fallbacks += 1
+            return False
+        self._pending[row["id"]] = row
+        self.queued += 1
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+        return True
+
+    async def wait_written(self, attempt_id: int):
+        """Flush until attempt_id is committed, if it is queued on this worker"""
+        while attempt_id in self._pending:
+            # Shielded so a cancelled request cannot abandon a flush mid-commit
+            await asyncio.shield(self.flush())
+
+    async def flush(self) -> int:
+        """Insert up to one batch of queued rows; returns how many were written"""
+        async with self._flush_lock:
+            ids = list(itertools.islice(self._pending, self.batch_size))
+            if not ids:
+                return 0
+            rows = [self._pending[attempt_id] for attempt_id in ids]
+            started = time.perf_counter()
+            written = len(rows)
+            try:
+                async with async_engine.begin() as conn:
+                    await conn.execute(insert(models.QuizAttempt), rows)
+            except IntegrityError:
+                # One bad row must not block the rest of the batch
+                written = await self._insert_one_by_one(rows)
+            except Exception:
+                self.degraded = True
+                raise
+            self.degraded = False
+            for attempt_id in ids:
+                del self._pending[attempt_id]
+            self.last_flush_ms = (time.perf_counter() - started) * 1000
+            self.flushed += written
+            self.batches += 1
+            return len(rows)
+
+    async def _insert_one_by_one(self, rows):
+        written = 0
+        for row in rows:
+            try:
+                async with async_engine.begin() as conn:
+                    await conn.execute(insert(models.QuizAttempt).values(row))
+                written += 1
+            except IntegrityError as e:
+                self.dropped += 1
+                print(f"❌ Dropped quiz attempt {row['id']}: {type(e.orig).__name__}")
+        return written
+
+    async def _run(self):
+        while self.active:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                # Drain full batches back to back; a partial batch waits for the next tick
+                while await self.flush() >= self.batch_size:
+                    pass
+            except Exception as e:
+                # Rows stay queued and are retried on the next tick
+                self.failures += 1
+                print(f"⚠️  Quiz attempt flush failed ({type(e).__name__}); {len(self._pending)} rows queued")
+
+    def snapshot(self):
+        return {
+            "enabled": self.active,
+            "degraded": self.degraded,
+            "pending": len(self._pending),
+            "reserved_ids": len(self._ids),
+            "queued": self.queued,
+            "flushed": self.flushed,
+            "batches": self.batches,
+            "avg_batch": self.flushed / self.batches if self.batches else 0.0,
+            "last_flush_ms": self.last_flush_ms,
+            "fallbacks": self.fallbacks,
+            "failures": self.failures,
+            "dropped": self.dropped,
+        }
+
+
+attempt_writer = AttemptWriter()
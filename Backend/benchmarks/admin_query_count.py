@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Admin list endpoints - query count must not grow with row count
+Paged endpoints are measured on a full page of MAX_PAGE_SIZE rows
+Usage: python -m benchmarks.admin_query_count
+"""
+import json
+import sys
+import time
+from benchmarks.support import reset_database, seed, count_queries
+from app.database import SessionLocal
+from app.api import admin
+from app.pagination import PageParams, MAX_PAGE_SIZE
+
+
+def first_page():
+    return PageParams(cursor=None, limit=MAX_PAGE_SIZE)
+
+
+ENDPOINTS = {
+    "/api/admin/sectors": lambda db: admin.get_all_sectors(db=db),
+    "/api/admin/branches": lambda db: admin.get_all_branches(page=first_page(), db=db),
+    "/api/admin/specializations": lambda db: admin.get_all_specializations(page=first_page(), db=db),
+    "/api/admin/users": lambda db: admin.get_all_users(page=first_page(), db=db),
+}
+
+
+def row_count(result):
+    """Rows in an endpoint's return value, whether a list or an encoded response"""
+    if hasattr(result, "body"):
+        result = json.loads(result.body)
+    return len(result)
+
+SIZES = [
+    {"sectors": 2, "branches_per_sector": 2, "specs_per_branch": 2, "users": 10},
+    {"sectors": 10, "branches_per_sector": 10, "specs_per_branch": 10, "users": 1000},
+]
+
+
+def measure(size):
+    reset_database()
+    seed(quizzes_per_spec=1, questions_per_quiz=1, options_per_question=2, **size)
+    results = {}
+    db = SessionLocal()
+    try:
+        for path, endpoint in ENDPOINTS.items():
+            with count_queries() as counter:
+                start = time.perf_counter()
+                result = endpoint(db)
+                elapsed = time.perf_counter() - start
+            results[path] = (row_count(result), counter["count"], elapsed)
+    finally:
+        db.close()
+    return results
+
+
+def main():
+    runs = [measure(size) for size in SIZES]
+
+    print(f"{'endpoint':32} {'rows':>12} {'queries':>10} {'ms':>16}")
+    failed = False
+    for path in ENDPOINTS:
+        rows = " -> ".join(str(run[path][0]) for run in runs)
+        queries = " -> ".join(str(run[path][1]) for run in runs)
+        ms = " -> ".join(f"{run[path][2] * 1000:.1f}" for run in runs)
+        constant = len({run[path][1] for run in runs}) == 1
+        failed = failed or not constant
+        print(f"{path:32} {rows:>12} {queries:>10} {ms:>16} {'OK' if constant else 'GROWS'}")
+
+    if failed:
+        print("❌ Query count grows with row count")
+        sys.exit(1)
+    print("✅ Query count is constant for every endpoint")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Sync vs async database stack - sustained concurrency and tail latency
+Runs the quiz read path (quiz + questions + options, then a quiz list page)
+through crud.py on a 40-thread pool, the same size as Starlette's default
+threadpool, and through crud_async.py on the event loop.
+Each simulated client sends its next request as soon as the previous one\nreturns; latency includes time spent waiting for a worker or connection.
+
+Usage: python -m benchmarks.async_vs_sync [--requests 2000] [--concurrency 200]
+Set DATABASE_URL to point at a local Postgres instead of the SQLite stand-in.
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.support import reset_database, seed, latency_summary
+from app import crud, crud_async
+from app.database import SessionLocal, AsyncSessionLocal, async_engine
+
+THREADPOOL_SIZE = 40
+
+
+def sync_request(quiz_id):
+    db = SessionLocal()
+    try:
+        crud.get_quiz_by_id(db, quiz_id)
+        for question in crud.get_quiz_questions(db, quiz_id):
+            len(question.options)
+        crud.get_all_quizzes(db, limit=20)
+    finally:
+        db.close()
+
+
+async def async_request(quiz_id):
+    async with AsyncSessionLocal() as db:
+        await crud_async.get_quiz_by_id(db, quiz_id)
+        await crud_async.get_quiz_questions(db, quiz_id)
+        await crud_async.get_all_quizzes(db, limit=20)
+
+
+def run_sync(quiz_ids, concurrency):
+    """Each client thread hands its requests to the shared worker pool in turn"""
+    samples = []
+
+    with ThreadPoolExecutor(max_workers=THREADPOOL_SIZE) as workers:
+        def client(chunk):
+            for quiz_id in chunk:
+                sent_at = time.perf_counter()
+                workers.submit(sync_request, quiz_id).result()
+                samples.append(time.perf_counter() - sent_at)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as clients:
+            for i in range(concurrency):
+                clients.submit(client, quiz_ids[i::concurrency])
+        elapsed = time.perf_counter() - start
+
+    return latency_summary(samples, elapsed)
+
+
+async def run_async(quiz_ids, concurrency):
+    """Each client coroutine issues its requests in turn"""
+    samples = []
+
+    async def client(chunk):
+        for quiz_id in chunk:
+            sent_at = time.perf_counter()
+            await async_request(quiz_id)
+            samples.append(time.perf_counter() - sent_at)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(quiz_ids[i::concurrency]) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    await async_engine.dispose()
+    return latency_summary(samples, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    reset_database()
+    seed(sectors=3, branches_per_sector=3, specs_per_branch=3, quizzes_per_spec=2)
+    quiz_ids = [i % 50 + 1 for i in range(args.requests)]
+
+    results = {
+        "sync (threadpool)": run_sync(quiz_ids, args.concurrency),
+        "async (event loop)": asyncio.run(run_async(quiz_ids, args.concurrency)),
+    }
+
+    print(f"{args.requests} requests, {args.concurrency} concurrent clients")
+    print(f"{'stack':20} {'req/s':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}")
+    for name, r in results.items():
+        print(f"{name:20} {r['rps']:>10.1f} {r['p50']:>10.2f} {r['p95']:>10.2f} {r['p99']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
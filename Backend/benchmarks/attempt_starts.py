@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Quiz start throughput - one commit per start vs write-behind batching
+Creates attempts through crud_async.create_quiz_attempt from many concurrent
+clients, first with every start committed in its request, then with
+app.write_behind queueing them for batched inserts. Latency is what the client
+waits for; with write-behind, rows still queued at the end are flushed by
+stop() and that time is reported separately. Row counts are checked after
+each phase.
+
+Usage: python -m benchmarks.attempt_starts [--starts 5000] [--concurrency 200]
+Set DATABASE_URL to point at a local Postgres instead of the SQLite stand-in.
+"""
+import argparse
+import asyncio
+import time
+from sqlalchemy import func, select
+from benchmarks.support import reset_database, seed, latency_summary
+from app import crud_async
+from app.database import AsyncSessionLocal, async_engine
+from app.models_hierarchical import QuizAttempt
+from app.write_behind import attempt_writer
+
+
+async def run_starts(starts, concurrency):
+    samples = []
+
+    async def client(chunk):
+        for n in chunk:
+            sent_at = time.perf_counter()
+            async with AsyncSessionLocal() as db:
+                await crud_async.create_quiz_attempt(db, user_id=n % 50 + 1, quiz_id=n % 50 + 1)
+            samples.append(time.perf_counter() - sent_at)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(range(i, starts, concurrency)) for i in range(concurrency)))
+    return latency_summary(samples, time.perf_counter() - start)
+
+
+async def count_attempts():
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count()).select_from(QuizAttempt))
+
+
+async def run(starts, concurrency):
+    results = {"commit per start": await run_starts(starts, concurrency)}
+    written = await count_attempts()
+
+    await attempt_writer.start(enabled=True)
+    if not attempt_writer.active:
+        return results, written, None
+    results["write-behind"] = await run_starts(starts, concurrency)
+    drain_started = time.perf_counter()
+    await attempt_writer.stop()
+    drain_ms = (time.perf_counter() - drain_started) * 1000
+    results["write-behind"]["written"] = await count_attempts() - written
+    results["commit per start"]["written"] = written
+    await async_engine.dispose()
+    return results, drain_ms, attempt_writer.snapshot()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--starts", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    reset_database()
+    seed(sectors=3, branches_per_sector=3, specs_per_branch=3, quizzes_per_spec=2)
+    results, drain_ms, writer = asyncio.run(run(args.starts, args.concurrency))
+
+    print(f"{args.starts} starts, {args.concurrency} concurrent clients ({async_engine.dialect.name})")
+    print(f"{'mode':18} {'starts/s':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'rows':>8}")
+    for name, r in results.items():
+        print(f"{name:18} {r['rps']:>10.1f} {r['p50']:>10.2f} {r['p95']:>10.2f} {r['p99']:>10.2f} "
+              f"{r.get('written', '-'):>8}")
+    if writer is None:
+        print("Write-behind is not supported on this database")
+        return
+    print(f"Write-behind: {writer['batches']} batches (avg {writer['avg_batch']:.0f} rows), "
+          f"{writer['fallbacks']} synchronous fallbacks, final drain {drain_ms:.1f} ms")
+    for name, r in results.items():
+        if r["written"] != args.starts:
+            raise SystemExit(f"{name}: expected {args.starts} rows, found {r['written']}")
+
+
+if __name__ == "__main__":
+    main()
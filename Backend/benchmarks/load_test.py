@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Load test - throughput and p50/p95/p99 latency per endpoint
+Seeds a catalog of realistic size, then runs concurrent virtual users through
+the learner journey: browse the hierarchy and quiz list, open a quiz, start it,
+submit answers and view the profile. Each user logs in once (unrecorded) and
+sends its next request as soon as the previous one returns.
+
+By default the app runs in-process over ASGI against a throwaway SQLite
+database; --base-url drives a running server instead (seed it yourself).
+Results are compared with a stored baseline and the run fails (exit 1) when an
+endpoint errors, its p95/p99 exceed the baseline by more than --tolerance, or
+its throughput drops by more than the same factor.
+
+Usage: python -m benchmarks.load_test [--users 20] [--journeys 25]
+                                      [--base-url URL] [--update-baseline]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import httpx
+from benchmarks.support import reset_database, seed, latency_summary
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baselines", "load_test.json")
+
+# Seeded catalog: 100 specializations, 200 quizzes, 3000 questions, 12000 options
+CATALOG = dict(sectors=5, branches_per_sector=4, specs_per_branch=5, quizzes_per_spec=2,
+               questions_per_quiz=15, options_per_question=4, users=2000)
+QUIZ_COUNT = 200
+USER_COUNT = 2000
+PASSWORD = "x"   # seeded users' password
+
+
+class Recorder:
+    """Latency samples and error counts per endpoint label"""
+
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+        self.enabled = True
+
+    async def request(self, client, label, method, url, **kwargs):
+        sent_at = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        elapsed = time.perf_counter() - sent_at
+        if self.enabled:
+            self.samples.setdefault(label, []).append(elapsed)
+            if response.status_code >= 400:
+                self.errors[label] = self.errors.get(label, 0) + 1
+        return response
+
+
+async def log_in(client, rng):
+    """(user_id, auth headers) for a random seeded user"""
+    email = f"user{rng.randint(0, USER_COUNT - 1)}@example.com"
+    response = await client.post("/api/users/login", json={"email": email, "password": PASSWORD})
+    response.raise_for_status()
+    body = response.json()
+    return body["user"]["id"], {"Authorization": f"Bearer {body['access_token']}"}
+
+
+async def journey(client, recorder, rng, session):
+    """One learner session, as the frontend drives it"""
+    user_id, headers = session
+    quiz_id = rng.randint(1, QUIZ_COUNT)
+
+    await recorder.request(client, "GET /api/hierarchy", "GET", "/api/hierarchy")
+    await recorder.request(client, "GET /api/quizzes", "GET", "/api/quizzes", params={"limit": 20})
+    quiz = await recorder.request(client, "GET /api/quizzes/{id}", "GET", f"/api/quizzes/{quiz_id}")
+    start = await recorder.request(client, "POST /api/quizzes/{id}/start", "POST",
+                                   f"/api/quizzes/{quiz_id}/start", headers=headers)
+    if quiz.status_code == 200 and start.status_code == 200:
+        answers = [
+            {"question_id": question["id"], "selected_answer": rng.choice(question["options"])["text"]}
+            for question in quiz.json()["questions"]
+        ]
+        await recorder.request(client, "POST /api/attempts/{id}/submit", "POST",
+                               f"/api/attempts/{start.json()['attempt_id']}/submit",
+                               json={"answers": answers}, headers=headers)
+    await recorder.request(client, "GET /api/users/users/{id}", "GET", f"/api/users/users/{user_id}",
+                           headers=headers)
+
+
+async def run(client, users, journeys, warmup, seed_value):
+    recorder = Recorder()
+
+    async def virtual_user(index):
+        rng = random.Random(seed_value + index)
+        session = sessions[index]
+        for _ in range(journeys):
+            await journey(client, recorder, rng, session)
+
+    sessions = [await log_in(client, random.Random(seed_value + index)) for index in range(users)]
+
+    # Warm caches and pools without recording
+    recorder.enabled = False
+    for index in range(warmup):
+        await journey(client, recorder, random.Random(seed_value - index - 1), sessions[index % users])
+    recorder.enabled = True
+
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_user(index) for index in range(users)))
+    elapsed = time.perf_counter() - start
+
+    results = {label: latency_summary(samples, elapsed) for label, samples in recorder.samples.items()}
+    for label, result in results.items():
+        result["errors"] = recorder.errors.get(label, 0)
+    total = [sample for samples in recorder.samples.values() for sample in samples]
+    results["ALL"] = latency_summary(total, elapsed)
+    results["ALL"]["errors"] = sum(recorder.errors.values())
+    return results
+
+
+async def run_in_process(args):
+    from app.main import app
+
+    # Startup hooks (if any) run as they would under uvicorn
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await run(client, args.users, args.journeys, args.warmup, args.seed)
+
+
+async def run_against_server(args):
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as client:
+        return await run(client, args.users, args.journeys, args.warmup, args.seed)
+
+
+def compare(results, baseline, tolerance):
+    """Regression messages for endpoints that are slower than the baseline allows"""
+    failures = []
+    for label, result in results.items():
+        if result["errors"]:
+            failures.append(f"{label}: {result['errors']} error responses")
+        expected = baseline.get(label)
+        if not expected:
+            continue
+        for metric in ("p95", "p99"):
+            limit = expected[metric] * tolerance
+            if result[metric] > limit:
+                failures.append(f"{label}: {metric} {result[metric]:.2f} ms > {limit:.2f} ms")
+        floor = expected["rps"] / tolerance
+        if result["rps"] < floor:
+            failures.append(f"{label}: {result['rps']:.1f} req/s < {floor:.1f} req/s")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--journeys", type=int, default=25, help="journeys per virtual user")
+    parser.add_argument("--warmup", type=int, default=5, help="unrecorded journeys before the run")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for quiz/user choice")
+    parser.add_argument("--base-url", help="drive a running server instead of the in-process app")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=2.0,
+                        help="allowed slowdown factor against the baseline")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store this run as the new baseline instead of comparing")
+    args = parser.parse_args()
+
+    if args.base_url:
+        results = asyncio.run(run_against_server(args))
+    else:
+        reset_database()
+        seed(**CATALOG)
+        results = asyncio.run(run_in_process(args))
+
+    print(f"{args.users} users x {args.journeys} journeys")
+    print(f"{'endpoint':32} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for label, r in results.items():
+        print(f"{label:32} {r['requests']:>9} {r['errors']:>7} {r['rps']:>9.1f} "
+              f"{r['p50']:>9.2f} {r['p95']:>9.2f} {r['p99']:>9.2f}")
+
+    if args.update_baseline:
+        if results["ALL"]["errors"]:
+            print("Not storing a baseline from a run with error responses")
+            sys.exit(1)
+        baseline = {
+            label: {metric: round(r[metric], 2) for metric in ("rps", "p50", "p95", "p99")}
+            for label, r in results.items()
+        }
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({"users": args.users, "journeys": args.journeys, "endpoints": baseline}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return
+    with open(args.baseline) as f:
+        stored = json.load(f)
+    if (stored["users"], stored["journeys"]) != (args.users, args.journeys):
+        print(f"Baseline was recorded with {stored['users']} users x {stored['journeys']} journeys; "
+              f"comparing anyway")
+
+    failures = compare(results, stored["endpoints"], args.tolerance)
+    if failures:
+        print("\nREGRESSION")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print(f"\nWithin {args.tolerance}x of baseline")
+
+
+if __name__ == "__main__":
+    main()
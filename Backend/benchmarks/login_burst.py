@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Login burst benchmark - quiz endpoint latency while logins are hashing
+Runs concurrent quiz readers (quiz list and quiz detail) for a fixed time in
+three phases: readers alone, readers during a burst of concurrent logins with
+hashing on the bounded pool (app.passwords), and the same burst with scrypt
+run inline on the event loop, which is what the pool prevents.
+
+The run fails (exit 1) when quiz p95 during the pooled burst exceeds the idle
+p95 by more than --tolerance.
+
+Usage: python -m benchmarks.login_burst [--readers 10] [--logins 8] [--duration 5]
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+import httpx
+from benchmarks.support import reset_database, seed, latency_summary
+from app import passwords
+from app.database import SessionLocal
+from app.models_hierarchical import User
+
+CATALOG = dict(sectors=5, branches_per_sector=4, specs_per_branch=5, quizzes_per_spec=2,
+               questions_per_quiz=15, options_per_question=4, users=200)
+QUIZ_COUNT = 200
+PASSWORD = "correct horse battery staple"
+
+
+class InlineHasher:
+    """Runs hashing jobs on the calling thread, i.e. on the event loop"""
+
+    async def run(self, fn, *args):
+        return fn(*args)
+
+
+def set_passwords():
+    """Give every seeded user a current-parameter hash so each login costs one scrypt"""
+    stored = passwords.hash_password_blocking(PASSWORD)
+    db = SessionLocal()
+    try:
+        db.query(User).update({User.password_hash: stored})
+        db.commit()
+    finally:
+        db.close()
+
+
+async def reader(client, samples, stop, rng):
+    while not stop.is_set():
+        quiz_id = rng.randint(1, QUIZ_COUNT)
+        for url, params in (("/api/quizzes", {"limit": 20}), (f"/api/quizzes/{quiz_id}", None)):
+            sent_at = time.perf_counter()
+            response = await client.get(url, params=params)
+            samples.append(time.perf_counter() - sent_at)
+            if response.status_code != 200:
+                raise RuntimeError(f"{url} returned {response.status_code}")
+
+
+async def login_client(client, outcomes, stop, rng):
+    while not stop.is_set():
+        email = f"user{rng.randint(0, CATALOG['users'] - 1)}@example.com"
+        response = await client.post("/api/users/login", json={"email": email, "password": PASSWORD})
+        outcomes[response.status_code] = outcomes.get(response.status_code, 0) + 1
+
+
+async def phase(client, readers, logins, duration, seed_value):
+    samples, outcomes = [], {}
+    stop = asyncio.Event()
+    tasks = [asyncio.create_task(reader(client, samples, stop, random.Random(seed_value + i)))
+             for i in range(readers)]
+    tasks += [asyncio.create_task(login_client(client, outcomes, stop, random.Random(-seed_value - i)))
+              for i in range(logins)]
+    start = time.perf_counter()
+    await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    result = latency_summary(samples, elapsed)
+    result["logins"] = outcomes
+    return result
+
+
+async def run(args):
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await phase(client, args.readers, 0, 1, args.seed)   # warm caches
+            results = {"idle": await phase(client, args.readers, 0, args.duration, args.seed)}
+            results["pooled burst"] = await phase(client, args.readers, args.logins, args.duration, args.seed)
+
+            pooled = passwords.hasher
+            passwords.hasher = InlineHasher()
+            try:
+                results["inline burst"] = await phase(client, args.readers, args.logins, args.duration, args.seed)
+            finally:
+                passwords.hasher = pooled
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readers", type=int, default=10, help="concurrent quiz readers")
+    parser.add_argument("--logins", type=int, default=8, help="concurrent login clients during a burst")
+    parser.add_argument("--duration", type=float, default=5, help="seconds per phase")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--tolerance", type=float, default=2.0,
+                        help="allowed quiz p95 slowdown during the pooled burst")
+    args = parser.parse_args()
+
+    reset_database()
+    seed(**CATALOG)
+    set_passwords()
+    results = asyncio.run(run(args))
+
+    print(f"{args.readers} quiz readers, {args.logins} login clients, {args.duration:g}s per phase, "
+          f"{passwords.PASSWORD_HASH_WORKERS} hashing workers")
+    print(f"{'phase':14} {'quiz req':>9} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  logins")
+    for name, r in results.items():
+        logins = ", ".join(f"{status}: {count}" for status, count in sorted(r["logins"].items())) or "-"
+        print(f"{name:14} {r['requests']:>9} {r['rps']:>9.1f} {r['p50']:>9.2f} {r['p95']:>9.2f} "
+              f"{r['p99']:>9.2f}  {logins}")
+    print(f"\nHashing pool: {passwords.hasher.snapshot()}")
+
+    limit = max(results["idle"]["p95"], 1.0) * args.tolerance
+    if results["pooled burst"]["p95"] > limit:
+        print(f"\nREGRESSION: quiz p95 during the login burst {results['pooled burst']['p95']:.2f} ms "
+              f"> {limit:.2f} ms")
+        sys.exit(1)
+    print(f"\nQuiz p95 during the login burst is within {args.tolerance}x of idle")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Per-endpoint JSON serialization - before and after the orjson response path
+"before" is what FastAPI did with each payload: response_model validation where
+the route declared one, jsonable_encoder, then the stdlib-json JSONResponse.
+"after" is the current path: routes that build their exact shape are encoded by
+orjson directly, the rest go through jsonable_encoder and FastJSONResponse.
+Both bodies are checked to decode to the same document before timing.
+
+Usage: python -m benchmarks.serialization [--iterations 2000]
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import List
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from benchmarks.support import reset_database, seed, SessionLocal
+from app import crud_async, schemas
+from app.api import admin, quizzes, sectors
+from app.database import AsyncSessionLocal, async_engine
+from app.models_hierarchical import User
+from app.pagination import PageParams, MAX_PAGE_SIZE
+from app.responses import FastJSONResponse, dumps
+
+
+def before(payload, adapter=None):
+    if adapter is not None:
+        payload = adapter.dump_python(adapter.validate_python(payload), mode="json")
+    return JSONResponse(content=jsonable_encoder(payload)).body
+
+
+def after_direct(payload):
+    return dumps(payload)
+
+
+def after_default(payload):
+    return FastJSONResponse(content=jsonable_encoder(payload)).body
+
+
+async def quiz_payloads():
+    async with AsyncSessionLocal() as db:
+        rows, next_cursor = await crud_async.get_all_quizzes(db, limit=MAX_PAGE_SIZE)
+        quiz, questions = await crud_async.get_quiz_with_questions(db, rows[0][0].id)
+    await async_engine.dispose()
+    return (
+        {"quizzes": quizzes.quiz_summaries(rows), "next_cursor": next_cursor},
+        quizzes.quiz_detail(quiz, questions),
+    )
+
+
+def endpoint_payloads():
+    """(endpoint, payload, response_model before, encoder after)"""
+    quiz_list, quiz_detail = asyncio.run(quiz_payloads())
+    db = SessionLocal()
+    try:
+        page = PageParams(cursor=None, limit=MAX_PAGE_SIZE)
+        user = db.query(User).first()
+        profile = {
+            "email": user.email,
+            "name": user.name,
+            "id": user.id,
+            "specialization_id": user.preferred_specialization_id,
+            "readiness_score": user.readiness_score,
+            "technical_score": user.technical_score,
+            "soft_skills_score": user.soft_skills_score,
+            "created_at": user.created_at
+        }
+        return [
+            ("GET /api/hierarchy", sectors._load_hierarchy(db), List[dict], after_direct),
+            ("GET /api/sectors", sectors._load_sectors(db), List[dict], after_direct),
+            ("GET /api/sectors/1/branches", sectors.get_branches_by_sector(1, db), List[dict], after_default),
+            ("GET /api/quizzes", quiz_list, schemas.QuizzesResponse, after_direct),
+            ("GET /api/quizzes/{id}", quiz_detail, None, after_direct),
+            ("GET /api/users/{id}", profile, schemas.User, after_direct),
+            ("GET /api/admin/specializations",
+             json.loads(admin.get_all_specializations(page=page, db=db).body), None, after_direct),
+            ("GET /api/admin/users", json.loads(admin.get_all_users(page=page, db=db).body), None, after_direct),
+        ]
+    finally:
+        db.close()
+
+
+def time_per_call(encode, payload, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        encode(payload)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    reset_database()
+    seed(sectors=5, branches_per_sector=4, specs_per_branch=5, quizzes_per_spec=2,
+         questions_per_quiz=20, users=200)
+
+    print(f"{'endpoint':32} {'bytes':>8} {'before us':>10} {'after us':>10} {'speedup':>8}")
+    for name, payload, model, after in endpoint_payloads():
+        adapter = TypeAdapter(model) if model is not None else None
+        old_body = before(payload, adapter)
+        new_body = after(payload)
+        assert json.loads(old_body) == json.loads(new_body), f"{name}: encoded documents differ"
+
+        old_us = time_per_call(lambda p: before(p, adapter), payload, args.iterations)
+        new_us = time_per_call(after, payload, args.iterations)
+        print(f"{name:32} {len(new_body):>8} {old_us:>10.1f} {new_us:>10.1f} {old_us / new_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
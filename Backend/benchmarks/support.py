@@ -0,0 +1,100 @@
+"""
+Shared helpers for the benchmark scripts
+Points the app at a throwaway SQLite database, seeds it and counts SQL statements
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Must be set before anything imports app.database
+_DB_FILE = os.path.join(tempfile.mkdtemp(prefix="fw_bench_"), "bench.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_DB_FILE}")
+# Benchmark clients log in from one address far more often than a real user would
+os.environ.setdefault("LOGIN_LIMIT_PER_IP", "1000000")
+os.environ.setdefault("LOGIN_LIMIT_PER_EMAIL", "1000000")
+
+from sqlalchemy import event
+from app.database import SessionLocal, engine
+from app.models_hierarchical import (
+    Base, Sector, Branch, Specialization, Quiz, Question, QuestionOption, User
+)
+
+
+def reset_database():
+    """Drop and recreate every table"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    if engine.dialect.name == "sqlite":
+        # WAL lets readers run alongside the single writer, closer to Postgres under load
+        with engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+
+
+def seed(sectors=5, branches_per_sector=4, specs_per_branch=5,
+         quizzes_per_spec=2, questions_per_quiz=10, options_per_question=4, users=50):
+    """Insert a synthetic catalog of the requested size"""
+    db = SessionLocal()
+    try:
+        for s in range(sectors):
+            sector = Sector(name=f"Sector {s}", description=f"Sector {s} description")
+            for b in range(branches_per_sector):
+                branch = Branch(name=f"Branch {s}.{b}", description="Branch description", sector=sector)
+                for p in range(specs_per_branch):
+                    spec = Specialization(name=f"Specialization {s}.{b}.{p}",
+                                          description="Specialization description", branch=branch)
+                    for z in range(quizzes_per_spec):
+                        quiz = Quiz(title=f"Quiz {s}.{b}.{p}.{z}", description="Quiz description",
+                                    specialization=spec, difficulty_level=z % 4 + 1)
+                        for q in range(questions_per_quiz):
+                            question = Question(quiz=quiz, question_text=f"Question {q}",
+                                                question_type="multiple_choice", order_index=q + 1)
+                            for o in range(options_per_question):
+                                question.options.append(QuestionOption(
+                                    option_text=f"Option {o}", is_correct=o == 0, order_index=o + 1
+                                ))
+            db.add(sector)
+        db.flush()
+        spec_ids = [row[0] for row in db.query(Specialization.id).all()]
+        for u in range(users):
+            db.add(User(
+                email=f"user{u}@example.com", password_hash="x", name=f"User {u}",
+                preferred_specialization_id=spec_ids[u % len(spec_ids)] if spec_ids else None
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+@contextmanager
+def count_queries():
+    """Count SQL statements executed on the engine inside the block"""
+    counter = {"count": 0}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter["count"] += 1
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def latency_summary(samples, elapsed):
+    """Throughput and p50/p95/p99 in milliseconds for a run"""
+    return {
+        "requests": len(samples),
+        "rps": len(samples) / elapsed if elapsed else 0.0,
+        "p50": percentile(samples, 50) * 1000,
+        "p95": percentile(samples, 95) * 1000,
+        "p99": percentile(samples, 99) * 1000,
+    }
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Typeahead benchmark - index build time and lookup latency
+Builds the specialization index over a synthetic catalog and times
+suggest() for prefix, multi-word and misspelled queries. Runs without a
+database: the index is built from a hierarchy tree like the cached one.
+Names draw on a small shared vocabulary, so every word matches many entries,
+which is harder on the index than a real catalog.
+
+Usage: python -m benchmarks.typeahead [--sectors 10] [--branches 8] [--specs 10]
+"""
+import argparse
+import random
+import time
+from app.typeahead import SpecializationIndex
+from benchmarks.support import percentile
+
+WORDS = ["data", "software", "frontend", "backend", "cloud", "security", "machine", "learning",
+         "product", "design", "marketing", "finance", "health", "nursing", "teaching", "policy",
+         "analytics", "engineering", "research", "operations", "supply", "chain", "legal", "energy"]
+QUERIES = ["d", "da", "data", "soft", "front", "backend eng", "mach lear", "secu", "fronted",
+           "enginering", "supply ch", "policy research", "zzz"]
+
+
+def synthetic_hierarchy(sectors, branches, specs, rng):
+    spec_id = 0
+    tree = []
+    for s in range(sectors):
+        sector = {"id": s + 1, "name": f"{rng.choice(WORDS).title()} Sector {s}", "branches": []}
+        for b in range(branches):
+            branch = {"id": s * branches + b + 1, "name": f"{rng.choice(WORDS).title()} Branch {b}",
+                      "specializations": []}
+            for _ in range(specs):
+                spec_id += 1
+                name = " ".join(rng.sample(WORDS, rng.randint(1, 3))).title()
+                branch["specializations"].append({"id": spec_id, "name": f"{name} {spec_id}"})
+            sector["branches"].append(branch)
+        tree.append(sector)
+    return tree
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sectors", type=int, default=10)
+    parser.add_argument("--branches", type=int, default=8, help="branches per sector")
+    parser.add_argument("--specs", type=int, default=10, help="specializations per branch")
+    parser.add_argument("--iterations", type=int, default=2000, help="lookups per query")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    hierarchy = synthetic_hierarchy(args.sectors, args.branches, args.specs, random.Random(args.seed))
+    start = time.perf_counter()
+    index = SpecializationIndex(hierarchy)
+    print(f"Built index of {len(index)} specializations in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    print(f"{'query':18} {'results':>8} {'p50 us':>9} {'p99 us':>9}")
+    for query in QUERIES:
+        samples = []
+        for _ in range(args.iterations):
+            sent_at = time.perf_counter()
+            results = index.suggest(query, 8)
+            samples.append(time.perf_counter() - sent_at)
+        print(f"{query:18} {len(results):>8} {percentile(samples, 50) * 1e6:>9.1f} "
+              f"{percentile(samples, 99) * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import { getSectors, getBranches, getSpecializations } from '../utils/api';
+import { getSectors, getBranches, getSpecializations, fetchAllPages } from '../utils/api';
 
 const API_BASE = 'http://localhost:8000/api';
 
@@ -37,17 +37,11 @@ function AdminPage() {
         const data = await response.json();
         setSectors(data);
       } else if (activeTab === 'branches') {
-        const response = await fetch(`${API_BASE}/admin/branches`);
-        const data = await response.json();
-        setBranches(data);
+        setBranches(await fetchAllPages(`${API_BASE}/admin/branches`));
       } else if (activeTab === 'specializations') {
-        const response = await fetch(`${API_BASE}/admin/specializations`);
-        const data = await response.json();
-        setSpecializations(data);
+        setSpecializations(await fetchAllPages(`${API_BASE}/admin/specializations`));
       } else if (activeTab === 'users') {
-        const response = await fetch(`${API_BASE}/admin/users`);
-        const data = await response.json();
-        setUsers(data);
+        setUsers(await fetchAllPages(`${API_BASE}/admin/users`));
       }
     } catch (error) {
       showMessage('Error loading data: ' + error.message, 'error');
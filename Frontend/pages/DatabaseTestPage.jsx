@@ -1,4 +1,5 @@
 import React, { useState, useEffect } from 'react';
+import { quizAPI } from '../utils/api';
 
 const DatabaseTestPage = () => {
   const [sectors, setSectors] = useState([]);
@@ -32,11 +33,8 @@ const DatabaseTestPage = () => {
       }
       
       // Fetch quizzes
-      const quizzesResponse = await fetch(`${API_BASE}/quizzes`);
-      if (quizzesResponse.ok) {
-        const quizzesData = await quizzesResponse.json();
-        setQuizzes(quizzesData.quizzes);
-      }
+      const quizzesData = await quizAPI.getAllQuizzes();
+      setQuizzes(quizzesData.quizzes);
       
     } catch (err) {
       setError(`Database connection failed: ${err.message}`);
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { getSectorsHierarchical } from '../utils/hierarchicalApi';
+import { getSectorsHierarchical, suggestSpecializations } from '../utils/hierarchicalApi';
 
 export default function HierarchicalOnboardingPage() {
   const navigate = useNavigate();
@@ -20,10 +20,35 @@ export default function HierarchicalOnboardingPage() {
   const [availableBranches, setAvailableBranches] = useState([]);
   const [availableSpecializations, setAvailableSpecializations] = useState([]);
 
+  // Typeahead: jump straight to a specialization instead of drilling down
+  const [searchQuery, setSearchQuery] = useState('');
+  const [suggestions, setSuggestions] = useState([]);
+
   useEffect(() => {
     loadSectors();
   }, []);
 
+  useEffect(() => {
+    const query = searchQuery.trim();
+    if (!query) {
+      setSuggestions([]);
+      return;
+    }
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const results = await suggestSpecializations(query);
+        if (!cancelled) setSuggestions(results);
+      } catch (error) {
+        if (!cancelled) setSuggestions([]);
+      }
+    }, 100);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchQuery]);
+
   const loadSectors = async () => {
     try {
       setLoading(true);
@@ -62,6 +87,21 @@ export default function HierarchicalOnboardingPage() {
     }
   };
 
+  const handleSuggestionSelection = (suggestion) => {
+    const sector = sectors.find(s => s.id === suggestion.sector_id);
+    const branch = sector?.branches.find(b => b.id === suggestion.branch_id);
+    if (!sector || !branch) return;
+
+    setSelectedSector(sector.id.toString());
+    setAvailableBranches(sector.branches);
+    setSelectedBranch(branch.id.toString());
+    setAvailableSpecializations(branch.specializations);
+    setSelectedSpecialization(suggestion.id.toString());
+    setSearchQuery('');
+    setSuggestions([]);
+    setCurrentStep(3);
+  };
+
   const handleNext = () => {
     if (currentStep === 1 && selectedSector) {
       setCurrentStep(2);
@@ -243,6 +283,54 @@ export default function HierarchicalOnboardingPage() {
             }}>
               Which industry excites you most? This will be the foundation of your career journey.
             </p>
+
+            <div style={{ position: 'relative', marginBottom: '1.5rem' }}>
+              <input
+                type="text"
+                value={searchQuery}
+                onChange={(e) => setSearchQuery(e.target.value)}
+                placeholder="Already know what you want? Search specializations..."
+                style={{
+                  width: '100%',
+                  padding: '0.75rem 1rem',
+                  border: '2px solid #e5e7eb',
+                  borderRadius: '8px',
+                  fontSize: '1rem',
+                  boxSizing: 'border-box'
+                }}
+              />
+              {suggestions.length > 0 && (
+                <div style={{
+                  position: 'absolute',
+                  top: '100%',
+                  left: 0,
+                  right: 0,
+                  backgroundColor: 'white',
+                  border: '1px solid #e5e7eb',
+                  borderRadius: '8px',
+                  boxShadow: '0 4px 6px rgba(0, 0, 0, 0.1)',
+                  zIndex: 10,
+                  marginTop: '0.25rem'
+                }}>
+                  {suggestions.map((suggestion) => (
+                    <div
+                      key={suggestion.id}
+                      onClick={() => handleSuggestionSelection(suggestion)}
+                      style={{
+                        padding: '0.75rem 1rem',
+                        cursor: 'pointer',
+                        borderBottom: '1px solid #f3f4f6'
+                      }}
+                    >
+                      <div style={{ fontWeight: '500', color: '#1f2937' }}>{suggestion.name}</div>
+                      <div style={{ fontSize: '0.875rem', color: '#6b7280' }}>
+                        {suggestion.path.slice(0, 2).join(' → ')}
+                      </div>
+                    </div>
+                  ))}
+                </div>
+              )}
+            </div>
             
             <div style={{ display: 'flex', flexDirection: 'column', gap: '1rem' }}>
               {sectors.map((sector) => (
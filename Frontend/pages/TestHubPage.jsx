@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { BookOpen, Clock, User, Filter, Search, ChevronRight, X, ArrowLeft } from 'lucide-react';
 import { getCurrentUser } from '../utils/auth';
+import { quizAPI } from '../utils/api';
 import { getAvailableTests, getTestCategories, getDifficultyLevels } from '../utils/testSystem';
 
 const API_BASE = 'http://localhost:8000/api';
@@ -42,10 +43,7 @@ const TestHubPage = () => {
     try {
       setLoading(true);
       // Fetch quizzes from database API
-      const response = await fetch('http://localhost:8000/api/quizzes');
-      if (!response.ok) throw new Error('Failed to fetch quizzes');
-      
-      const data = await response.json();
+      const data = await quizAPI.getAllQuizzes();
       // Transform database format to frontend format
       const transformedTests = (data.quizzes || []).map(quiz => ({
         id: quiz.id.toString(),
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate, useLocation } from 'react-router-dom';
 import { Clock, ArrowLeft, ArrowRight, CheckCircle, AlertCircle, X } from 'lucide-react';
-import { getCurrentUser } from '../utils/auth';
+import { getCurrentUser, authHeaders } from '../utils/auth';
 import { getTestById, calculateTestScore, saveTestResult } from '../utils/testSystem';
 
 const TestTakingPage = () => {
@@ -140,10 +140,10 @@ const TestTakingPage = () => {
       let correctCount = 0;
       
       try {
-        // Start quiz attempt - backend expects user_id as query parameter
-        const startResponse = await fetch(`http://localhost:8000/api/quizzes/${quizId}/start?user_id=${user.id}`, {
+        // Start quiz attempt - backend identifies the user from the session token
+        const startResponse = await fetch(`http://localhost:8000/api/quizzes/${quizId}/start`, {
           method: 'POST',
-          headers: { 'Content-Type': 'application/json' }
+          headers: { 'Content-Type': 'application/json', ...authHeaders() }
         });
         
         if (startResponse.ok) {
@@ -163,7 +163,7 @@ const TestTakingPage = () => {
           // Submit quiz answers - backend endpoint: /api/attempts/{attempt_id}/submit
           const submitResponse = await fetch(`http://localhost:8000/api/attempts/${attemptId}/submit`, {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
+            headers: { 'Content-Type': 'application/json', ...authHeaders() },
             body: JSON.stringify({ answers: submissionAnswers })
           });
           
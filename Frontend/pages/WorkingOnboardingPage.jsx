@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { getSectors, getBranches, getSpecializations, updateUserSpecialization } from '../utils/api';
-import { getCurrentUser } from '../utils/auth';
+import { getCurrentUser, getToken } from '../utils/auth';
 
 export default function WorkingOnboardingPage() {
     const [currentStep, setCurrentStep] = useState(1);
@@ -124,7 +124,7 @@ export default function WorkingOnboardingPage() {
             const currentUser = getCurrentUser();
             if (currentUser && currentUser.id) {
                 try {
-                    const result = await updateUserSpecialization(currentUser.id, parseInt(selectedSpecialization));
+                    const result = await updateUserSpecialization(currentUser.id, parseInt(selectedSpecialization), getToken());
                     if (result && result.success) {
                         // Backend returns updated user object
                         const userData = result.user || result;
@@ -1,4 +1,5 @@
 import React from 'react';
+import { quizAPI } from '../utils/api';
 
 function FullApp() {
   const [currentPage, setCurrentPage] = React.useState('landing');
@@ -53,11 +54,8 @@ function FullApp() {
 
   const fetchQuizzes = async () => {
     try {
-      const response = await fetch('http://localhost:8000/api/quizzes');
-      if (response.ok) {
-        const data = await response.json();
-        setQuizzes(data);
-      }
+      const data = await quizAPI.getAllQuizzes();
+      setQuizzes(data.quizzes);
     } catch (err) {
       console.error('Failed to fetch quizzes:', err);
     }
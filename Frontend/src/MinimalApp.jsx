@@ -1,4 +1,5 @@
 import React from 'react';
+import { quizAPI } from '../utils/api';
 import { BrowserRouter, Routes, Route } from 'react-router-dom';
 
 // Simple working components
@@ -212,11 +213,8 @@ function WorkingDashboard() {
 
   const fetchQuizzes = async () => {
     try {
-      const response = await fetch('http://localhost:8000/api/quizzes');
-      if (response.ok) {
-        const data = await response.json();
-        setQuizzes(data);
-      }
+      const data = await quizAPI.getAllQuizzes();
+      setQuizzes(data.quizzes);
       setLoading(false);
     } catch (err) {
       console.error('Failed to fetch quizzes:', err);
@@ -1,4 +1,5 @@
 import React, { useState, useEffect } from 'react';
+import { quizAPI } from '../utils/api';
 
 function SimpleWorkingApp() {
   const [currentPage, setCurrentPage] = useState('landing');
@@ -55,14 +56,9 @@ function SimpleWorkingApp() {
   const fetchQuizzes = async () => {
     try {
       console.log('Fetching quizzes...');
-      const response = await fetch(`${API_BASE}/quizzes`);
-      if (response.ok) {
-        const data = await response.json();
-        console.log('Quizzes received:', data);
-        setQuizzes(data);
-      } else {
-        console.error('Failed to fetch quizzes:', response.status);
-      }
+      const data = await quizAPI.getAllQuizzes();
+      console.log('Quizzes received:', data.quizzes.length);
+      setQuizzes(data.quizzes);
     } catch (err) {
       console.error('Error fetching quizzes:', err);
     }
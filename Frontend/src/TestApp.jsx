@@ -1,4 +1,5 @@
 import React from 'react';
+import { quizAPI } from '../utils/api';
 
 function TestApp() {
   const [currentPage, setCurrentPage] = React.useState('login');
@@ -37,11 +38,8 @@ function TestApp() {
 
   const fetchQuizzes = async () => {
     try {
-      const response = await fetch('http://localhost:8000/api/quizzes');
-      if (response.ok) {
-        const data = await response.json();
-        setQuizzes(data);
-      }
+      const data = await quizAPI.getAllQuizzes();
+      setQuizzes(data.quizzes);
     } catch (err) {
       console.error('Failed to fetch quizzes:', err);
     }
@@ -2,6 +2,9 @@
 
 export const API_BASE_URL = 'http://localhost:8000/api';
 
+// Largest page the backend serves on paged list endpoints
+export const MAX_PAGE_SIZE = 200;
+
 // Helper function to handle API responses
 const handleResponse = async (response) => {
   if (!response.ok) {
@@ -23,11 +26,11 @@ const handleResponse = async (response) => {
 const apiRequest = async (endpoint, options = {}) => {
   const url = `${API_BASE_URL}${endpoint}`;
   const config = {
+    ...options,
     headers: {
       'Content-Type': 'application/json',
       ...options.headers,
     },
-    ...options,
   };
 
   if (config.body && typeof config.body === 'object') {
@@ -59,9 +62,19 @@ export const authAPI = {
     });
   },
 
-  getProfile: async (userId) => {
+  logout: async (token) => {
+    return apiRequest('/users/logout', {
+      method: 'POST',
+      headers: { Authorization: `Bearer ${token}` },
+    });
+  },
+
+  // Only the user's own profile; the token must belong to userId
+  getProfile: async (userId, token) => {
     // Use correct endpoint: /api/users/users/{id}
-    return apiRequest(`/users/users/${userId}`);
+    return apiRequest(`/users/users/${userId}`, {
+      headers: { Authorization: `Bearer ${token}` },
+    });
   },
 
   updateIndustry: async (userId, industryData) => {
@@ -72,6 +85,21 @@ export const authAPI = {
   },
 };
 
+// List endpoints return one page at a time and name the next in X-Next-Cursor.
+// Follows the cursor until it runs out; pick extracts the rows from a page body
+export const fetchAllPages = async (url, pick = (body) => body) => {
+  const rows = [];
+  let cursor = null;
+  do {
+    const params = new URLSearchParams({ limit: String(MAX_PAGE_SIZE) });
+    if (cursor) params.set('cursor', cursor);
+    const response = await fetch(`${url}${url.includes('?') ? '&' : '?'}${params}`);
+    rows.push(...pick(await handleResponse(response)));
+    cursor = response.headers.get('X-Next-Cursor');
+  } while (cursor);
+  return rows;
+};
+
 // Hierarchical API calls for Sectors → Branches → Specializations
 export const getSectors = async () => {
   return apiRequest('/sectors');
@@ -90,32 +118,51 @@ export const getSpecializations = async (branchId) => {
 };
 
 // Save user's selections to database
-export const updateUserSpecialization = async (userId, specializationId) => {
+export const updateUserSpecialization = async (userId, specializationId, token) => {
   return apiRequest(`/users/users/${userId}/specialization`, {
     method: 'PATCH',
+    headers: { Authorization: `Bearer ${token}` },
     body: { specialization_id: specializationId },
   });
 };
 
+// Full-text search over quizzes, questions and specializations.
+// Returns ranked results; pass the cursor from the previous page for more
+export const searchCatalog = async (query, { type, cursor, limit } = {}) => {
+  const params = new URLSearchParams({ q: query });
+  if (type) params.set('type', type);
+  if (cursor) params.set('cursor', cursor);
+  if (limit) params.set('limit', String(limit));
+  const response = await fetch(`${API_BASE_URL}/search?${params}`);
+  const results = await handleResponse(response);
+  return { results, nextCursor: response.headers.get('X-Next-Cursor') };
+};
+
 // Quiz API calls
 export const quizAPI = {
+  // Every quiz, across all pages
   getAllQuizzes: async () => {
-    return apiRequest('/quizzes');
+    const quizzes = await fetchAllPages(`${API_BASE_URL}/quizzes`, (body) => body.quizzes);
+    return { quizzes };
   },
 
   getQuiz: async (quizId) => {
     return apiRequest(`/quizzes/${quizId}`);
   },
 
-  startQuiz: async (quizId, userId) => {
-    return apiRequest(`/quizzes/${quizId}/start?user_id=${userId}`, {
+  // The backend takes the user from the session token issued at login
+  startQuiz: async (quizId, token) => {
+    return apiRequest(`/quizzes/${quizId}/start`, {
       method: 'POST',
+      headers: { Authorization: `Bearer ${token}` },
     });
   },
 
-  submitQuizAttempt: async (attemptId, answers) => {
+  // Only the user who started the attempt can submit it
+  submitQuizAttempt: async (attemptId, answers, token) => {
     return apiRequest(`/attempts/${attemptId}/submit`, {
       method: 'POST',
+      headers: { Authorization: `Bearer ${token}` },
       body: { answers },
     });
   },
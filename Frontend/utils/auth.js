@@ -39,8 +39,9 @@ export const registerUser = async (name, email, password) => {
     
     if (response.success && response.user) {
       const user = createUser(response.user);
-      // Set current user in localStorage for session management
+      // Set current user and session token in localStorage for session management
       setCurrentUser(user);
+      setToken(response.access_token);
       console.log('User registered successfully:', user);
       return { success: true, user };
     } else {
@@ -72,8 +73,9 @@ export const loginUser = async (email, password) => {
     
     if (response.success && response.user) {
       const user = createUser(response.user);
-      // Set current user in localStorage for session management
+      // Set current user and session token in localStorage for session management
       setCurrentUser(user);
+      setToken(response.access_token);
       console.log('User logged in successfully:', user);
       return { success: true, user };
     } else {
@@ -90,9 +92,29 @@ export const loginUser = async (email, password) => {
   }
 };
 
-// Logout user
+// Logout user (revokes the session token on the backend)
 export const logoutUser = () => {
+  const token = getToken();
+  if (token) {
+    authAPI.logout(token).catch(() => {});
+  }
   localStorage.removeItem('currentUser');
+  localStorage.removeItem('token');
+};
+
+// Session token issued by /users/login and /users/register
+export const getToken = () => localStorage.getItem('token');
+
+export const setToken = (token) => {
+  if (token) {
+    localStorage.setItem('token', token);
+  }
+};
+
+// Authorization header for endpoints that need a logged-in user
+export const authHeaders = () => {
+  const token = getToken();
+  return token ? { Authorization: `Bearer ${token}` } : {};
 };
 
 // Get current user
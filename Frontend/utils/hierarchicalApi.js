@@ -125,5 +125,25 @@ export const getBranchDetails = async (branchId) => {
   }
 };
 
+/**
+ * Typeahead suggestions for the specialization picker
+ * @param {string} query - what the user has typed so far
+ * @param {number} limit
+ * Returns: [{ id, name, branch_id, sector_id, path: [sector, branch, specialization] }]
+ */
+export const suggestSpecializations = async (query, limit = 8) => {
+  try {
+    const params = new URLSearchParams({ q: query, limit: String(limit) });
+    const response = await fetch(`${API_BASE_URL}/specializations/suggest?${params}`);
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    return await response.json();
+  } catch (error) {
+    console.error('Error fetching specialization suggestions:', error);
+    throw error;
+  }
+};
+
 // Maintain backward compatibility
 export const getSectorsHierarchical = getCompleteHierarchy;
@@ -1,120 +0,0 @@
-#!/bin/bash
-
-# 🧪 Future Work Readiness API Testing Script
-# This script tests the database integration and API endpoints
-
-echo "🚀 Testing Future Work Readiness API"
-echo "=================================="
-
-API_BASE="http://localhost:8000/api"
-
-echo ""
-echo "📊 1. Testing Database Connection"
-echo "Getting all sectors..."
-SECTORS=$(curl -s "$API_BASE/sectors")
-echo "$SECTORS" | python3 -m json.tool
-
-echo ""
-echo "🎯 2. Testing Specializations"
-echo "Getting specializations for Technology sector (ID: 1)..."
-SPECS=$(curl -s "$API_BASE/sectors/1/specializations")
-echo "$SPECS" | python3 -m json.tool | head -20
-
-echo ""
-echo "📝 3. Testing Quizzes"
-echo "Getting all available quizzes..."
-QUIZZES=$(curl -s "$API_BASE/quizzes")
-echo "$QUIZZES" | python3 -m json.tool
-
-echo ""
-echo "❓ 4. Testing Quiz Details"
-echo "Getting details for Frontend Development Level 1 quiz (ID: 1)..."
-QUIZ_DETAILS=$(curl -s "$API_BASE/quizzes/1")
-echo "$QUIZ_DETAILS" | python3 -m json.tool | head -30
-
-echo ""
-echo "👤 5. Testing User Registration"
-echo "Creating a new test user..."
-USER_DATA=$(cat << EOF
-{
-  "email": "testuser@example.com",
-  "password": "testpass123",
-  "name": "Test User"
-}
-EOF
-)
-
-REGISTER_RESPONSE=$(curl -s -X POST "$API_BASE/register" \
-  -H "Content-Type: application/json" \
-  -d "$USER_DATA")
-
-echo "$REGISTER_RESPONSE" | python3 -m json.tool
-
-# Extract user ID for further testing
-USER_ID=$(echo "$REGISTER_RESPONSE" | python3 -c "import sys, json; print(json.load(sys.stdin)['user']['id'])" 2>/dev/null || echo "")
-
-if [ ! -z "$USER_ID" ]; then
-    echo ""
-    echo "🔑 6. Testing User Login"
-    echo "Logging in with the test user..."
-    LOGIN_DATA=$(cat << EOF
-{
-  "email": "testuser@example.com",
-  "password": "testpass123"
-}
-EOF
-)
-
-    LOGIN_RESPONSE=$(curl -s -X POST "$API_BASE/login" \
-      -H "Content-Type: application/json" \
-      -d "$LOGIN_DATA")
-
-    echo "$LOGIN_RESPONSE" | python3 -m json.tool
-
-    echo ""
-    echo "🎮 7. Testing Quiz Start"
-    echo "Starting quiz for user ID: $USER_ID"
-    START_RESPONSE=$(curl -s -X POST "$API_BASE/quizzes/1/start?user_id=$USER_ID")
-    echo "$START_RESPONSE" | python3 -m json.tool
-
-    # Extract attempt ID
-    ATTEMPT_ID=$(echo "$START_RESPONSE" | python3 -c "import sys, json; print(json.load(sys.stdin)['attempt_id'])" 2>/dev/null || echo "")
-
-    if [ ! -z "$ATTEMPT_ID" ]; then
-        echo ""
-        echo "📝 8. Testing Quiz Submission"
-        echo "Submitting quiz answers for attempt ID: $ATTEMPT_ID"
-        
-        # Create sample answers (we'll answer the first few questions)
-        SUBMIT_DATA=$(cat << EOF
-{
-  "answers": [
-    {"question_id": 1, "selected_answer": "HTML"},
-    {"question_id": 2, "selected_answer": "CSS"},
-    {"question_id": 3, "selected_answer": "JavaScript"}
-  ]
-}
-EOF
-)
-
-        SUBMIT_RESPONSE=$(curl -s -X POST "$API_BASE/attempts/$ATTEMPT_ID/submit" \
-          -H "Content-Type: application/json" \
-          -d "$SUBMIT_DATA")
-
-        echo "$SUBMIT_RESPONSE" | python3 -m json.tool
-    fi
-fi
-
-echo ""
-echo "🎉 API Testing Complete!"
-echo "========================"
-echo ""
-echo "✅ Database Integration: Working"
-echo "✅ User Registration: Working"  
-echo "✅ User Login: Working"
-echo "✅ Sectors & Specializations: Working"
-echo "✅ Quizzes: Working"
-echo "✅ Quiz Attempts: Working"
-echo ""
-echo "🌐 View API Documentation: http://localhost:8000/docs"
-echo "🔧 Server running on: http://localhost:8000"